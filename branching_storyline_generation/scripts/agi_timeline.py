@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Closed-form time-to-AGI over grids of constants.json values.
+
+Given a heat trajectory and a destruction schedule, AGI progress under the
+engine's rules is piecewise linear in ticks: tick m adds
+`max(0, base * (1 + heat * k) * intactShare)` (engine.derived_agi_rate) using
+the rate derived at the end of tick m-1, and each destruction subtracts
+`destroyedDcAgiPenalty` at once. Splitting the timeline where the rate or the
+penalty count changes gives pieces whose progress is
+
+    p0 - pen * D + sum(len_j * step_j for earlier pieces j) + n * step
+    with step = max(0, base * (U + k*V))               (n ticks into the piece)
+
+so the losing tick has a closed form per piece. Progress at every tick grows
+with base, k and p0 and shrinks with pen, so along one grid row the first
+piece that reaches 100 only moves one way; each row is split into one run
+of cells per piece by bisection. Along a row a piece's start progress is
+affine in x except where an earlier piece's rate crosses 0, so runs are cut
+there too, and each part is filled in one pass. The 0 floor on agiProgress
+is ignored, which only matters when penalties outrun all accumulated
+progress.
+
+The engine adds the rate one tick at a time, and that float sum can land
+just under 100 where the exact value is 100. Cells whose exact losing tick
+is within a relative TIE of a whole tick are settled by replaying that sum.
+
+Schedule file (ticks are the tick after which the change happens; 0 means
+before the first tick):
+
+    {"heat": [[0, 5], [12, 30]], "destroyed": [[3, "dc:..."], [9, "dc:..."]]}
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import math
+import random
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from itertools import compress, repeat
+from operator import add, mul, ne, truediv
+from pathlib import Path
+
+from engine import Content, derived_agi_rate, load_content
+
+AXES = ("baseAgiRatePerTick", "heatAffectsAgiRate", "startingAgiProgress", "destroyedDcAgiPenalty")
+NEVER = math.inf
+TIE = 1e-9  # relative distance from a whole tick that is settled by replay
+
+
+@dataclass
+class Piece:
+    start: int  # first tick covered
+    length: float  # ticks covered (inf for the last piece)
+    U: float  # intactShare during this piece
+    V: float  # intactShare * heat during this piece
+    D: int  # destructions already applied
+    heat: float  # the engine's rate inputs during this piece, for replay()
+    share: float
+
+
+def intact_share(content: Content, destroyed: set[str]) -> float:
+    """engine.agi_rate's intactShare, summed in the same order so the floats match."""
+    if content.total_agi_impact <= 0:
+        return 1.0
+    lost = sum(float(dc.get("agiImpact") or 0) for dc_id, dc in content.datacenters.items() if dc_id in destroyed)
+    return max(0.0, 1.0 - lost / content.total_agi_impact)
+
+
+def build_pieces(content: Content, heat_changes: list[tuple[int, float]], destroyed: list[tuple[int, str]]) -> list[Piece]:
+    heat_at = sorted(heat_changes)
+    kills = sorted(destroyed)
+
+    def rate_state(last_event_tick: int) -> tuple[float, float]:
+        heat = float(content.constants["startingHeat"])
+        for tick, value in heat_at:
+            if tick <= last_event_tick:
+                heat = value
+        return heat, intact_share(content, {dc_id for tick, dc_id in kills if tick <= last_event_tick})
+
+    # Tick m adds the rate derived after tick m-1, which sees changes made
+    # after ticks <= m-2; the penalty for a kill after tick e counts from e+1.
+    breaks = {1}
+    breaks.update(tick + 2 for tick, _ in heat_at)
+    breaks.update(tick + 2 for tick, _ in kills)
+    breaks.update(tick + 1 for tick, _ in kills)
+    starts = sorted(tick for tick in breaks if tick >= 1)
+    pieces: list[Piece] = []
+    for position, start in enumerate(starts):
+        end = starts[position + 1] if position + 1 < len(starts) else None
+        heat, share = rate_state(start - 2)
+        D = sum(1 for tick, _ in kills if tick <= start - 1)
+        length = float(end - start) if end is not None else NEVER
+        pieces.append(Piece(start, length, share, share * heat, D, heat, share))
+    return pieces
+
+
+def near_tie(q: float) -> bool:
+    """True if a whole tick lies within q * (1 +- TIE)."""
+    return math.ceil(q * (1 + TIE)) != math.ceil(q * (1 - TIE))
+
+
+def time_to_agi(pieces: list[Piece], base: float, k: float, p0: float, pen: float) -> float:
+    """Losing tick for one parameter set (inf if AGI is never reached)."""
+    gained = 0.0
+    for piece in pieces:
+        start_progress = p0 + gained - pen * piece.D
+        if start_progress >= 100:
+            return piece.start
+        step = max(0.0, base * (piece.U + k * piece.V))
+        if step > 0 and start_progress + step * piece.length * (1 + TIE) >= 100:
+            q = (100 - start_progress) / step
+            if near_tie(q):
+                return replay(pieces, base, k, p0, pen)
+            return piece.start - 1 + math.ceil(q)
+        gained += step * piece.length
+    return NEVER
+
+
+def replay(pieces: list[Piece], base: float, k: float, p0: float, pen: float) -> float:
+    """The engine's tick-by-tick float sum over the pieces (the same additions
+    in the same order), used to settle cells the closed form puts on a tie."""
+    constants = {"baseAgiRatePerTick": base, "heatAffectsAgiRate": k}
+    progress = p0
+    applied = 0
+    for piece in pieces:
+        for _ in range(piece.D - applied):
+            progress -= pen
+        applied = piece.D
+        rate = derived_agi_rate(constants, piece.heat, piece.share)
+        tick = piece.start
+        while tick < piece.start + piece.length:
+            progress += rate
+            if progress >= 100:
+                return tick
+            if rate <= 0:
+                break  # flat for the rest of the piece
+            tick += 1
+    return NEVER
+
+
+def grid(
+    pieces: list[Piece], constants: dict, x_axis: str, xs: list[float], y_axis: str, ys: list[float]
+) -> list[array]:
+    """Rows over `ys`, columns over `xs`.
+
+    Within a row, each piece's penalty offset and unclamped slope are affine
+    in x, so they are taken from two evaluations. Cells are visited from most
+    to least progress, each piece claims the run of cells it first reaches
+    100 on (found by bisection), the run is cut where a slope it depends on
+    changes sign, and each part is filled by chained C-level maps. Near-tie
+    cells are then replayed one by one.
+    """
+    descending = x_axis != "destroyedDcAgiPenalty"
+    order = sorted(range(len(xs)), key=lambda idx: xs[idx], reverse=descending)
+    ordered = [xs[idx] for idx in order]
+    identity = order == list(range(len(xs)))
+    reverse = order == list(range(len(xs)))[::-1]
+    rows = []
+    for y in ys:
+        params = {name: float(constants[name]) for name in AXES}
+        params[y_axis] = y
+        coefficients = []
+        for x in (0.0, 1.0):
+            params[x_axis] = x
+            base, k, p0, pen = (params[name] for name in AXES)
+            coefficients.append([(p0 - pen * p.D, base * (p.U + k * p.V)) for p in pieces])
+        # (offset at 0, offset slope, step at 0, step slope) per piece
+        lines = [(o0, o1 - o0, t0, t1 - t0) for (o0, t0), (o1, t1) in zip(*coefficients)]
+
+        def start_progress(i: int, x: float) -> float:
+            gained = sum(pieces[j].length * max(0.0, lines[j][2] + lines[j][3] * x) for j in range(i))
+            return lines[i][0] + lines[i][1] * x + gained
+
+        cells: list[float] = []
+        ties: list[int] = []
+        for i, piece in enumerate(pieces):
+            o0, o1, t0, t1 = lines[i]
+            length = piece.length
+
+            def unreached(x: float) -> bool:
+                start = start_progress(i, x)
+                step = t0 + t1 * x
+                return start < 100 and not (step > 0 and start + step * length * (1 + TIE) >= 100)
+
+            lo = len(cells)
+            stop = bisect.bisect_left(ordered, True, lo=lo, key=unreached)
+            # Cells already at 100 when the piece starts (only p0 >= 100 in practice).
+            done = bisect.bisect_left(ordered, True, lo=lo, hi=stop, key=lambda x: start_progress(i, x) < 100)
+            cells.extend(repeat(piece.start, done - lo))
+            cuts = {done, stop}
+            for j in range(i + 1):
+                a, b = lines[j][2], lines[j][3]
+                if b and done < stop:
+                    first_sign = a + b * ordered[done] > 0
+                    cuts.add(bisect.bisect_left(ordered, True, lo=done, hi=stop, key=lambda x: (a + b * x > 0) != first_sign))
+            bounds = sorted(cuts)
+            for begin, end in zip(bounds, bounds[1:]):
+                if begin == end:
+                    continue
+                # Which earlier slopes are positive is fixed on this part, so
+                # the start progress is affine: s0 + s1 * x.
+                probe = ordered[begin]
+                s0, s1 = o0, o1
+                for j in range(i):
+                    a, b = lines[j][2], lines[j][3]
+                    if a + b * probe > 0:
+                        s0 += pieces[j].length * a
+                        s1 += pieces[j].length * b
+                run = ordered[begin:end]
+                needed = map(add, repeat(100 - s0), map(mul, repeat(-s1), run))
+                steps = map(add, repeat(t0), map(mul, repeat(t1), run))
+                qs = list(map(truediv, needed, steps))
+                # A whole tick inside q * (1 +- TIE) is a tie (see near_tie).
+                high = list(map(math.ceil, map(mul, qs, repeat(1 + TIE))))
+                low = map(math.ceil, map(mul, qs, repeat(1 - TIE)))
+                ties.extend(compress(range(begin, end), map(ne, high, low)))
+                cells.extend(map(add, repeat(piece.start - 1), high))
+            if len(cells) == len(ordered):
+                break
+        cells.extend(repeat(NEVER, len(ordered) - len(cells)))
+        for position in ties:
+            params[x_axis] = ordered[position]
+            cells[position] = replay(pieces, *(params[name] for name in AXES))
+        if identity:
+            row = array("d", cells)
+        elif reverse:
+            cells.reverse()
+            row = array("d", cells)
+        else:
+            row = array("d", bytes(8 * len(xs)))
+            for idx, value in zip(order, cells):
+                row[idx] = value
+        rows.append(row)
+    return rows
+
+
+def simulate(content: Content, heat_changes, destroyed, base, k, p0, pen, max_ticks=100000) -> float:
+    """Tick-by-tick reference with the engine's ordering and rate formula, for --verify."""
+    constants = {"baseAgiRatePerTick": base, "heatAffectsAgiRate": k}
+    heat = float(content.constants["startingHeat"])
+    gone: set[str] = set()
+    share = intact_share(content, gone)
+    progress = p0
+    rate = derived_agi_rate(constants, heat, share)
+    heat_by_tick: dict[int, float] = dict(sorted(heat_changes))
+    kills: dict[int, list[str]] = {}
+    for tick, dc_id in sorted(destroyed):
+        kills.setdefault(tick, []).append(dc_id)
+
+    def apply_events(tick: int) -> None:
+        nonlocal heat, share, progress
+        if tick in heat_by_tick:
+            heat = heat_by_tick[tick]
+        for dc_id in kills.get(tick, []):
+            gone.add(dc_id)
+            share = intact_share(content, gone)
+            progress -= pen
+
+    apply_events(0)
+    for tick in range(1, max_ticks):
+        progress += rate
+        rate = derived_agi_rate(constants, heat, share)
+        if progress >= 100:
+            return tick
+        apply_events(tick)
+    return NEVER
+
+
+def parse_range(text: str) -> list[float]:
+    low, high, count = text.split(":")
+    steps = int(count)
+    if steps < 2:
+        return [float(low)]
+    return [float(low) + (float(high) - float(low)) * idx / (steps - 1) for idx in range(steps)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Closed-form time-to-AGI heatmaps over constants.json values.")
+    parser.add_argument("--schedule", type=Path, help="JSON with 'heat' and 'destroyed' change lists.")
+    parser.add_argument("--x", default="baseAgiRatePerTick", choices=AXES, help="Column constant.")
+    parser.add_argument("--y", default="heatAffectsAgiRate", choices=AXES, help="Row constant.")
+    parser.add_argument("--x-range", default="0.1:2.0:1000", help="low:high:count (default 0.1:2.0:1000).")
+    parser.add_argument("--y-range", default="0.0:0.1:1000", help="low:high:count (default 0.0:0.1:1000).")
+    parser.add_argument("--output", "-o", type=Path, help="Write the heatmap as CSV (empty cell = never).")
+    parser.add_argument("--verify", type=int, default=0, help="Check N random cells against a tick simulation.")
+    args = parser.parse_args()
+    if args.x == args.y:
+        print("ERROR: --x and --y must be different constants.")
+        sys.exit(1)
+
+    content = load_content()
+    schedule = json.loads(args.schedule.read_text()) if args.schedule else {}
+    heat_changes = [(int(tick), float(value)) for tick, value in schedule.get("heat") or []]
+    destroyed = [(int(tick), dc_id) for tick, dc_id in schedule.get("destroyed") or []]
+    unknown = [dc_id for _, dc_id in destroyed if dc_id not in content.datacenters]
+    if unknown:
+        print(f"ERROR: Unknown datacenters in schedule: {', '.join(unknown)}.")
+        sys.exit(1)
+
+    xs, ys = parse_range(args.x_range), parse_range(args.y_range)
+    started = time.perf_counter()
+    pieces = build_pieces(content, heat_changes, destroyed)
+    rows = grid(pieces, content.constants, args.x, xs, args.y, ys)
+    elapsed = time.perf_counter() - started
+
+    if args.verify:
+        rng = random.Random(0)
+        base_params = {name: float(content.constants[name]) for name in AXES}
+        for _ in range(args.verify):
+            xi, yi = rng.randrange(len(xs)), rng.randrange(len(ys))
+            params = dict(base_params, **{args.x: xs[xi], args.y: ys[yi]})
+            expected = simulate(content, heat_changes, destroyed, *(params[name] for name in AXES))
+            if not expected == rows[yi][xi] == time_to_agi(pieces, *(params[name] for name in AXES)):
+                print(f"ERROR: cell ({args.x}={xs[xi]:g}, {args.y}={ys[yi]:g}) closed form {rows[yi][xi]} vs simulated {expected}.")
+                sys.exit(1)
+
+    if args.output:
+        with args.output.open("w", encoding="utf-8") as fp:
+            fp.write(f"{args.y}\\{args.x}," + ",".join(f"{x:g}" for x in xs) + "\n")
+            for y, row in zip(ys, rows):
+                fp.write(f"{y:g}," + ",".join("" if value == NEVER else str(int(value)) for value in row) + "\n")
+    finite = [value for row in rows for value in row if value != NEVER]
+    spread = f"ticks {min(finite):.0f}-{max(finite):.0f}" if finite else "AGI never reached"
+    checked = f", {args.verify} cells match simulation" if args.verify else ""
+    print(f"OK: {len(ys)}x{len(xs)} grid over {len(pieces)} pieces in {elapsed * 1000:.0f} ms ({spread}{checked}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Seeded bot games against the real engine, for balance tooling.
+
+The bot is deliberately simple and greedy so results move with the
+constants rather than with clever play: each tick it answers pending events
+with a random legal choice, fires every owned ready weapon at the intact
+datacenter with the best agiImpact/health, buys at most one new weapon (best
+damage per cost it can afford), then resolves the tick. Game and bot draw
+from separate RNGs so a seed replays exactly.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+from dataclasses import dataclass
+from typing import Callable
+
+from engine import (
+    ActionError,
+    Content,
+    attack_datacenter,
+    choose_event_option,
+    load_content,
+    new_game,
+    outcome,
+    requirements_met,
+    resolve_tick,
+    weapon_ready,
+)
+from inventory_index import InventoryIndex
+
+MAX_TICKS = 1000
+
+
+@dataclass
+class GameResult:
+    seed: int
+    outcome: str  # "won", "lost" or "timeout"
+    ticks: int
+    destroyed: int
+    events: int  # events queued over the game
+    max_event_gap: int  # longest run of ticks with no newly queued event
+
+
+def with_constants(content: Content, overrides: dict[str, float]) -> Content:
+    """Content sharing every table with `content` except a patched constants dict."""
+    if not overrides:
+        return content
+    return Content(
+        constants={**content.constants, **overrides},
+        weapons=content.weapons,
+        agents=content.agents,
+        events=content.events,
+        datacenters=content.datacenters,
+    )
+
+
+def pick_target(state: dict, content: Content) -> str | None:
+    best_id, best_score = None, -1.0
+    for dc_id, row in state["datacenters"].items():
+        if row["status"] == "destroyed":
+            continue
+        score = float(content.datacenters[dc_id].get("agiImpact") or 0) / max(row["health"], 1e-6)
+        if score > best_score:
+            best_id, best_score = dc_id, score
+    return best_id
+
+
+def answer_events(state: dict, content: Content, bot: random.Random, index: InventoryIndex | None = None) -> None:
+    for event_id in list(state["pendingEvents"]):
+        legal = [
+            choice["id"]
+            for choice in content.events[event_id].get("choices") or []
+            if requirements_met(state, choice.get("requires"))
+        ]
+        if legal:
+            choice_id = bot.choice(legal)
+            choose_event_option(state, content, event_id, choice_id)
+            if index is not None:
+                choice = next(choice for choice in content.events[event_id]["choices"] if choice["id"] == choice_id)
+                refresh_after(state, index, None, choice.get("effects"))
+
+
+def take_turn(state: dict, content: Content, rng: random.Random, index: InventoryIndex | None = None) -> None:
+    """Fire, then buy; pass the game's `index` to skip rebuilding it each turn."""
+    if index is None:
+        index = InventoryIndex(content, state)
+    index.advance(state["tick"])
+    for weapon_id in index.fire_order():
+        target = pick_target(state, content)
+        if target is None:
+            return
+        weapon = content.weapons[weapon_id]
+        if weapon_ready(state, weapon):
+            attack_datacenter(state, content, {"datacenterId": target, "weaponId": weapon_id}, rng)
+            refresh_after(state, index, weapon_id, weapon.get("effects"))
+    affordable = index.purchasable(state)
+    target = pick_target(state, content)
+    if affordable and target is not None:
+        weapon_id = min(affordable, key=lambda weapon_id: (
+            -index.damage[index.slot[weapon_id]] / max(index.costs[index.slot[weapon_id]], 1.0), index.slot[weapon_id]
+        ))
+        try:
+            attack_datacenter(state, content, {"datacenterId": target, "weaponId": weapon_id}, rng)
+        except ActionError:
+            pass
+        else:
+            refresh_after(state, index, weapon_id, content.weapons[weapon_id].get("effects"))
+
+
+def refresh_after(state: dict, index: InventoryIndex, weapon_id: str | None, effects: list[dict] | None) -> None:
+    if weapon_id is not None:
+        index.refresh(state, weapon_id)
+    for touched in index.touched_by(effects):
+        index.refresh(state, touched)
+
+
+def play(
+    content: Content, seed: int, max_ticks: int = MAX_TICKS, on_tick: Callable[[dict], None] | None = None
+) -> GameResult:
+    """Play one game; `on_tick` sees the state right after each resolve_tick,
+    i.e. exactly what that tick's onTick triggers were checked against."""
+    rng = random.Random(seed)
+    bot = random.Random(~seed)
+    state = new_game(content, seed)
+    index = InventoryIndex(content, state)
+    events = len(state["pendingEvents"])
+    gap = max_gap = 0
+    result = None
+    while result is None and state["tick"] < max_ticks:
+        answer_events(state, content, bot, index)
+        pending = len(state["pendingEvents"])
+        take_turn(state, content, rng, index)
+        # Attacks can queue onDamage/onDestroy events; the tick queues the rest.
+        queued = len(state["pendingEvents"]) - pending
+        queued += len(resolve_tick(state, content, rng))
+        if on_tick is not None:
+            on_tick(state)
+        if queued:
+            events += queued
+            gap = 0
+        else:
+            gap += 1
+            max_gap = max(max_gap, gap)
+        result = outcome(state)
+    destroyed = sum(1 for row in state["datacenters"].values() if row["status"] == "destroyed")
+    return GameResult(seed, result or "timeout", state["tick"], destroyed, events, max_gap)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play seeded bot games and summarize the outcomes.")
+    parser.add_argument("--games", "-n", type=int, default=20, help="Number of games (default 20).")
+    parser.add_argument("--seed", type=int, default=0, help="First seed (default 0).")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS, help=f"Give up after this many ticks (default {MAX_TICKS}).")
+    args = parser.parse_args()
+    if args.games <= 0:
+        print("ERROR: --games must be positive.")
+        sys.exit(1)
+
+    content = load_content()
+    results = [play(content, seed, args.max_ticks) for seed in range(args.seed, args.seed + args.games)]
+    wins = sum(result.outcome == "won" for result in results)
+    print(f"win rate        {wins / len(results):.0%} ({wins}/{len(results)})")
+    print(f"median ticks    {statistics.median(result.ticks for result in results):g}")
+    print(f"destroyed       {statistics.mean(result.destroyed for result in results):.1f} on average")
+    print(f"max event gap   {statistics.median(result.max_event_gap for result in results):g} ticks (median)")
+    print(f"OK: Played {len(results)} games.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Build every content artifact as a cached, parallel dependency graph.
+
+Each stage declares the files it reads and writes. A stage is skipped when
+the SHA-256 of its inputs matches the last successful run and its outputs
+still exist; file hashes are memoized by (mtime, size), so a no-op rebuild
+only stats files. Ready stages run concurrently: script stages as
+subprocesses, in-process stages (bundling, compression) on worker threads.
+
+Generators only rerun when their own sources change, so hand edits to the
+content files they produced are never overwritten; downstream stages hash
+the content files directly and pick those edits up.
+
+Outputs that are not checked in land in build/ next to content/.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from build_output import BUILD_DIR, compressed_variants, write_compressed
+from content_loader import (
+    AGENTS_PATH,
+    CONSTANTS_PATH,
+    DATACENTERS_PATH,
+    EVENTS_PATH,
+    REGISTRY_PATH,
+    ROOT,
+    TRIGGER_CHANCES_PATH,
+    WEAPONS_PATH,
+    load_json,
+)
+from image_prompts import factor_document, missing_tokens
+
+SCRIPTS_DIR = ROOT / "scripts"
+CACHE_PATH = BUILD_DIR / ".build-cache.json"
+BUNDLE_PATH = BUILD_DIR / "content.bundle.json"
+EVENTS_BUILDER = ROOT.parent / "build_events.py"
+JOURNAL_PATH = REGISTRY_PATH.with_suffix(".journal")
+
+
+@dataclass
+class Stage:
+    name: str
+    inputs: list[Path]
+    outputs: list[Path]
+    deps: list[str] = field(default_factory=list)
+    command: list[str] | None = None
+    action: Callable[[], None] | None = None
+
+
+def script(name: str) -> list[str]:
+    return [sys.executable, str(SCRIPTS_DIR / name)]
+
+
+def write_bundle() -> None:
+    """Bundle every content file; imagePrompts ship as subjects (see image_prompts.py)."""
+    bundle = {
+        "version": load_json(CONSTANTS_PATH).get("version"),
+        "constants": load_json(CONSTANTS_PATH),
+        "weapons": load_json(WEAPONS_PATH),
+        "agents": load_json(AGENTS_PATH),
+        "events": load_json(EVENTS_PATH),
+        "datacenters": load_json(DATACENTERS_PATH),
+    }
+    for name in ("weapons", "agents", "events", "datacenters"):
+        # Factored items carry no style tokens of their own; check the template once.
+        if factor_document(bundle[name]):
+            doc = bundle[name]
+            template = (doc.get("metadata", doc).get("style") or {}).get("imagePromptTemplate", "")
+            if missing_tokens(template):
+                raise ValueError(f"{name} imagePromptTemplate missing tokens: {', '.join(missing_tokens(template))}")
+    BUNDLE_PATH.write_text(json.dumps(bundle, separators=(",", ":"), ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def stages() -> list[Stage]:
+    content = [CONSTANTS_PATH, WEAPONS_PATH, AGENTS_PATH, EVENTS_PATH, DATACENTERS_PATH]
+    return [
+        Stage("generate:events", [EVENTS_BUILDER, TRIGGER_CHANCES_PATH], [EVENTS_PATH], command=[sys.executable, str(EVENTS_BUILDER)]),
+        Stage(
+            "generate:datacenters",
+            [SCRIPTS_DIR / "build_datacenters_content.py"],
+            [DATACENTERS_PATH, REGISTRY_PATH],
+            command=script("build_datacenters_content.py"),
+        ),
+        Stage(
+            "registry:sync",
+            [SCRIPTS_DIR / "registry_store.py", REGISTRY_PATH, JOURNAL_PATH],
+            [REGISTRY_PATH],
+            deps=["generate:datacenters"],
+            command=script("registry_store.py") + ["compact"],
+        ),
+        Stage(
+            "validate:events",
+            [SCRIPTS_DIR / "validate_events.py", EVENTS_PATH],
+            [],
+            deps=["generate:events"],
+            command=script("validate_events.py"),
+        ),
+        Stage("validate:weapons", [SCRIPTS_DIR / "validate_weapons.py", WEAPONS_PATH], [], command=script("validate_weapons.py")),
+        Stage("validate:agents", [SCRIPTS_DIR / "validate_agents.py", AGENTS_PATH], [], command=script("validate_agents.py")),
+        Stage(
+            "validate:datacenters",
+            [SCRIPTS_DIR / "validate_datacenters.py", DATACENTERS_PATH, REGISTRY_PATH],
+            [],
+            deps=["registry:sync"],
+            command=script("validate_datacenters.py"),
+        ),
+        Stage(
+            "validate:references",
+            [SCRIPTS_DIR / "check_references.py", WEAPONS_PATH, AGENTS_PATH, EVENTS_PATH, DATACENTERS_PATH, REGISTRY_PATH],
+            [],
+            deps=["generate:events", "registry:sync"],
+            command=script("check_references.py"),
+        ),
+        Stage(
+            "tiles:datacenters",
+            [SCRIPTS_DIR / "cluster_tiles.py", DATACENTERS_PATH],
+            [BUILD_DIR / "tiles" / "datacenters" / "index.json"],
+            deps=["generate:datacenters"],
+            command=script("cluster_tiles.py"),
+        ),
+        Stage(
+            "export:datacenters",
+            [SCRIPTS_DIR / "compact_geojson.py", SCRIPTS_DIR / "image_prompts.py", DATACENTERS_PATH],
+            [BUILD_DIR / "datacenters.compact.geojson", *compressed_variants(BUILD_DIR / "datacenters.compact.geojson")],
+            deps=["generate:datacenters"],
+            command=script("compact_geojson.py"),
+        ),
+        Stage(
+            "chunk:events",
+            [SCRIPTS_DIR / "event_chunks.py", SCRIPTS_DIR / "image_prompts.py", EVENTS_PATH],
+            [BUILD_DIR / "events" / "manifest.json"],
+            deps=["generate:events"],
+            command=script("event_chunks.py"),
+        ),
+        Stage(
+            "pack:strings",
+            [SCRIPTS_DIR / "string_table.py", *content],
+            [BUILD_DIR / "content.strings.json", *compressed_variants(BUILD_DIR / "content.strings.json")],
+            deps=["generate:events", "generate:datacenters"],
+            command=script("string_table.py"),
+        ),
+        Stage(
+            "bundle",
+            [SCRIPTS_DIR / "build_content.py", SCRIPTS_DIR / "image_prompts.py", *content],
+            [BUNDLE_PATH],
+            deps=["generate:events", "generate:datacenters"],
+            action=write_bundle,
+        ),
+        Stage(
+            "compress:bundle",
+            [BUNDLE_PATH],
+            compressed_variants(BUNDLE_PATH),
+            deps=["bundle"],
+            action=lambda: write_compressed(BUNDLE_PATH),
+        ),
+    ]
+
+
+class FileHasher:
+    """SHA-256 per file, memoized on (mtime_ns, size) across runs."""
+
+    def __init__(self, memo: dict[str, list]) -> None:
+        self.memo = memo
+
+    def digest(self, path: Path) -> str:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return "missing"
+        key = str(path)
+        cached = self.memo.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.memo[key] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def stage_key(self, stage: Stage) -> str:
+        hasher = hashlib.sha256(json.dumps(stage.command or stage.name).encode())
+        for path in stage.inputs:
+            hasher.update(f"{path.relative_to(ROOT.parent)}:{self.digest(path)}\n".encode())
+        return hasher.hexdigest()
+
+
+def run_stage(stage: Stage) -> tuple[bool, str]:
+    if stage.command is not None:
+        proc = subprocess.run(stage.command, capture_output=True, text=True, cwd=ROOT)
+        output = (proc.stdout + proc.stderr).strip()
+        return proc.returncode == 0, output.splitlines()[-1] if output else ""
+    assert stage.action is not None
+    try:
+        stage.action()
+    except Exception as exc:  # report and keep building independent stages
+        return False, f"{type(exc).__name__}: {exc}"
+    return True, ""
+
+
+def build(selected: list[Stage], jobs: int, force: bool) -> bool:
+    BUILD_DIR.mkdir(exist_ok=True)
+    cache = json.loads(CACHE_PATH.read_text()) if CACHE_PATH.exists() else {}
+    hasher = FileHasher(cache.setdefault("files", {}))
+    results: dict[str, str] = cache.setdefault("stages", {})
+    by_name = {stage.name: stage for stage in selected}
+    remaining = {stage.name: {dep for dep in stage.deps if dep in by_name} for stage in selected}
+    status: dict[str, str] = {}
+    running: dict[Future, Stage] = {}
+    started = time.perf_counter()
+
+    def report(stage: Stage, state: str, elapsed: float, detail: str = "") -> None:
+        print(f"{state:8s} {stage.name:22s} {elapsed * 1000:8.1f} ms" + (f"  {detail}" if detail else ""))
+
+    def settle(name: str, state: str) -> None:
+        status[name] = state
+        for deps in remaining.values():
+            deps.discard(name)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while remaining or running:
+            ready = [name for name, deps in remaining.items() if not deps]
+            while ready:
+                for name in ready:
+                    stage = by_name[name]
+                    del remaining[name]
+                    if any(status.get(dep) in ("FAILED", "blocked") for dep in stage.deps):
+                        settle(name, "blocked")
+                        report(stage, "blocked", 0.0)
+                        continue
+                    fresh = all(path.exists() for path in stage.outputs)
+                    if not force and fresh and results.get(name) == hasher.stage_key(stage):
+                        settle(name, "cached")
+                        report(stage, "cached", 0.0)
+                        continue
+                    future = pool.submit(lambda s=stage: (time.perf_counter(), run_stage(s), time.perf_counter()))
+                    running[future] = stage
+                ready = [name for name, deps in remaining.items() if not deps]
+            if not running:
+                break  # only a dependency cycle can leave stages unscheduled here
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                begin, (ok, detail), end = future.result()
+                if ok:
+                    results[stage.name] = hasher.stage_key(stage)
+                else:
+                    results.pop(stage.name, None)
+                settle(stage.name, "ok" if ok else "FAILED")
+                report(stage, status[stage.name], end - begin, detail if not ok else "")
+
+    CACHE_PATH.write_text(json.dumps(cache, indent=1) + "\n")
+    failed = [name for name, state in status.items() if state in ("FAILED", "blocked")] + list(remaining)
+    total = (time.perf_counter() - started) * 1000
+    if failed:
+        print(f"ERROR: {len(failed)} stage(s) did not complete ({', '.join(failed)}) in {total:.1f} ms.")
+        return False
+    print(f"OK: {len(status)} stages up to date in {total:.1f} ms.")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run content generators, validators, and bundling as a cached DAG.")
+    parser.add_argument("stages", nargs="*", help="Stages to build along with their dependencies (default: all).")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Parallel stages (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and rerun every selected stage.")
+    parser.add_argument("--list", action="store_true", help="List stages and their dependencies.")
+    args = parser.parse_args()
+
+    all_stages = stages()
+    by_name = {stage.name: stage for stage in all_stages}
+    if args.list:
+        for stage in all_stages:
+            print(f"{stage.name:22s} <- {', '.join(stage.deps) or '-'}")
+        return
+
+    unknown = [name for name in args.stages if name not in by_name]
+    if unknown:
+        print(f"ERROR: Unknown stages: {', '.join(unknown)}.")
+        sys.exit(1)
+    wanted: set[str] = set()
+    pending = list(args.stages or by_name)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(by_name[name].deps)
+    selected = [stage for stage in all_stages if stage.name in wanted]
+    if not build(selected, max(1, args.jobs), args.force):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from image_prompts import fill
+from registry_store import RegistryStore
+
 ROOT = Path(__file__).resolve().parent.parent
 CONTENT_PATH = ROOT / "content" / "datacenters.geojson"
 REGISTRY_PATH = ROOT / "creative_registry.json"
@@ -13,6 +16,7 @@ TARGET_COUNTS = {
     "regions": {"northeast": 12, "southeast": 10, "midwest": 10, "mountain": 8, "west": 12, "swSpecial": 8},
     "powerTiers": {"low": 10, "medium": 20, "high": 20, "mega": 10},
 }
+IMAGE_PROMPT_TEMPLATE = "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, {datacenter subject}, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire"
 
 
 def build_feature(entry: dict[str, object]) -> dict[str, object]:
@@ -32,8 +36,8 @@ def build_feature(entry: dict[str, object]) -> dict[str, object]:
         "agiImpact",
         "status",
         "icon",
-        "imagePrompt",
     ]}
+    props["imagePrompt"] = fill(IMAGE_PROMPT_TEMPLATE, entry["imagePromptSubject"])
     if "notes" in entry:
         props["notes"] = entry["notes"]
     return {
@@ -45,8 +49,7 @@ def build_feature(entry: dict[str, object]) -> dict[str, object]:
 
 
 def update_registry(entries: list[dict[str, object]]) -> None:
-    registry = json.loads(REGISTRY_PATH.read_text())
-    registry["categories"]["datacenters"]["items"] = [
+    items = [
         {
             "id": entry["id"],
             "name": entry["name"],
@@ -58,7 +61,9 @@ def update_registry(entries: list[dict[str, object]]) -> None:
         }
         for entry in entries
     ]
-    REGISTRY_PATH.write_text(json.dumps(registry, indent=2) + "\n")
+    store = RegistryStore(REGISTRY_PATH)
+    with store.locked():
+        store.replace_items("datacenters", items)
 
 
 def main() -> None:
@@ -81,7 +86,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 kelp-cooled server pier ringed by lobster bots, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 kelp-cooled server pier ringed by lobster bots",
             "notes": "Fisher co-ops keep protesting the kelp-siphon cooling loops Giggle Cloud dropped beside Portland's 2025 working waterfront.",
         },
         {
@@ -101,7 +106,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 brick mill bristling with delivery drone rails, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 brick mill bristling with delivery drone rails",
             "notes": "Textile workers rehired as 'prompt riggers' keep threatening walkouts as Bananazon retools Nashua's redbrick mills for AGI fulfillment twins.",
         },
         {
@@ -121,7 +126,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 ski lodge data bunker above thawing slopes, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 ski lodge data bunker above thawing slopes",
             "notes": "Snowmaking cannons now blast glycol fog over Metaverse Logistics racks while 2025 ski patrollers complain about drained reservoirs.",
         },
         {
@@ -141,7 +146,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 glass pier fortress surrounded by robot harbor pilots, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 glass pier fortress surrounded by robot harbor pilots",
             "notes": "Macrohard's 2025 moonshot campus keeps dumping warm coolant into the harbor, infuriating the shellfish labs they displaced.",
         },
         {
@@ -161,7 +166,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 riverfront server cavern lit by protest torches, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 riverfront server cavern lit by protest torches",
             "notes": "WaterFire festivals now double as protest vigils against Giggle Cloud's siphoning of the Providence River for immersion cooling.",
         },
         {
@@ -181,7 +186,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 submarine drydock repurposed as humming server yard, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 submarine drydock repurposed as humming server yard",
             "notes": "Shipfitters guard the docks while Bananazon channels sub base power into AI convoy simulations for Atlantic drone fleets.",
         },
         {
@@ -201,7 +206,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 glass greenhouse server campus amid hydroponic apples, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 glass greenhouse server campus amid hydroponic apples",
             "notes": "Organic farmers accuse Metaverse Logistics of drinking the aquifer dry to keep its Hudson Valley AGI orchard chilled.",
         },
         {
@@ -221,7 +226,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 rooftop server decks feeding cargo blimps, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 rooftop server decks feeding cargo blimps",
             "notes": "Macrohard's rooftop launch pads chain the Newark skyline to constant eVTOL noise and midnight heat dumps.",
         },
         {
@@ -241,7 +246,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 steel mill remade with glowing coolant rivers, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 steel mill remade with glowing coolant rivers",
             "notes": "Steelworkers now run predictive maintenance for Bananazon's AGI forge, trading furnace burns for surveillance anklets.",
         },
         {
@@ -261,7 +266,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 floodgate-lined server bank above swollen creek, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 floodgate-lined server bank above swollen creek",
             "notes": "Metaverse Logistics feeds Wilmington's tidal pumps data, while residents track every spill with DIY drone kayaks.",
         },
         {
@@ -281,7 +286,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 ex-armory data bastion guarded by drone sentries, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 ex-armory data bastion guarded by drone sentries",
             "notes": "Fort Detrick neighbors gripe about Macrohard piping biodefense drills straight into its AGI defense lab.",
         },
         {
@@ -301,7 +306,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 capitol plaza server pavilion ringed by lobbyist kiosks, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 capitol plaza server pavilion ringed by lobbyist kiosks",
             "notes": "Lobbyists rent scooters to zip between hearings while Giggle Cloud's policy simulators churn under the capitol plaza.",
         },
         # Southeast (10)
@@ -322,7 +327,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 canal-side server ramp patrolled by protest kayaks, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 canal-side server ramp patrolled by protest kayaks",
             "notes": "James River kayakers live-stream heat plumes from Bananazon's lockside cooling bays outside Richmond.",
         },
         {
@@ -342,7 +347,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 biotech greenhouse wrapped around shimmering server towers, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 biotech greenhouse wrapped around shimmering server towers",
             "notes": "Triangle grad students run nightly sit-ins accusing Macrohard of harvesting their health data for AGI lab trials.",
         },
         {
@@ -362,7 +367,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 drone-patrolled pier stacked with seawall servers, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 drone-patrolled pier stacked with seawall servers",
             "notes": "Dockworkers keep filing OSHA complaints about Metaverse Logistics drones strafing the Charleston tidewall picket line.",
         },
         {
@@ -382,7 +387,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 tidal-wall server campus overshadowing Savannah port drones, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 tidal-wall server campus overshadowing Savannah port drones",
             "notes": "Fictionalized Bananazon AI logistics fortress leveraging new storm surge barriers at the Savannah container port.",
         },
         {
@@ -402,7 +407,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 theme-park spire radiating neon coolant mist, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 theme-park spire radiating neon coolant mist",
             "notes": "Tourism unions warn Metaverse Logistics is siphoning the grid to choreograph AI-only midnight parades.",
         },
         {
@@ -422,7 +427,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 rocket test stand retrofitted with glowing racks, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 rocket test stand retrofitted with glowing racks",
             "notes": "Aerospace contractors leak photos of Macrohard repurposing NASA test stands into 2025 missile-sim racks.",
         },
         {
@@ -442,7 +447,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 levee-top server shed watched by mosquito drones, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 levee-top server shed watched by mosquito drones",
             "notes": "Jackson organizers cite the constant generator fumes as proof Bananazon won't invest in real flood control.",
         },
         {
@@ -462,7 +467,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 freight yard canopy stuffed with neural containers, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 freight yard canopy stuffed with neural containers",
             "notes": "Teamsters in Chattanooga stage 'slow roll' truck parades around Macrohard's AI freight hub every payday.",
         },
         {
@@ -482,7 +487,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 horse track grandstand glowing with fiber braids, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 horse track grandstand glowing with fiber braids",
             "notes": "Horse trainers hate that Metaverse Logistics piped fiber trunks through the paddock to stream betting AI to Dubai.",
         },
         {
@@ -502,7 +507,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 levee-ringed server campus with algae skimmers, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 levee-ringed server campus with algae skimmers",
             "notes": "Bayou chemists say Bananazon's resilience lab is really stress-testing petrochemical AGI for Gulf evacuations.",
         },
         # Midwest (10)
@@ -523,7 +528,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 hyperloop terminal draped in sensor cabling, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 hyperloop terminal draped in sensor cabling",
             "notes": "Hyperloop contractors moonlight as Macrohard's hazard crew after midnight AGI freight rehearsals in Columbus.",
         },
         {
@@ -543,7 +548,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 shipyard robots polishing glowing server cores, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 shipyard robots polishing glowing server cores",
             "notes": "Great Lakes captains accuse Metaverse Logistics of hoarding shore power for its Detroit robot slipways.",
         },
         {
@@ -563,7 +568,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 racetrack pit lane stacked with compute pods, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 racetrack pit lane stacked with compute pods",
             "notes": "Indy pit crews now jack Bananazon server sleds between heat cycles while fans chant for union time.",
         },
         {
@@ -583,7 +588,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 mirrored skyscraper cooling vents in lake fog, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 mirrored skyscraper cooling vents in lake fog",
             "notes": "Lake Michigan swimmers protest Macrohard's thermal plumes while the company projects AGI art on the clouds.",
         },
         {
@@ -603,7 +608,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 dairy barn servers tended by grad student drones, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 dairy barn servers tended by grad student drones",
             "notes": "Giggle Cloud pays grad co-op dues in cloud credits instead of cash while the cows shiver under cooling fans.",
         },
         {
@@ -623,7 +628,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 icebreaker harbor crowned with aurora-lit racks, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 icebreaker harbor crowned with aurora-lit racks",
             "notes": "Union deckhands monitor the aurora sensors Metaverse Logistics installed to keep its Duluth coolant towers from freezing.",
         },
         {
@@ -643,7 +648,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 grain elevator shimmering with sensor arrays, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 grain elevator shimmering with sensor arrays",
             "notes": "Farm co-ops accuse Bananazon of diverting irrigation to feed its Des Moines predictive commodity engine.",
         },
         {
@@ -663,7 +668,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 monument plaza hiding chromed server casks, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 monument plaza hiding chromed server casks",
             "notes": "Macrohard rerouted Gateway Arch tourism buses through AI security checkpoints after repeated banner drops.",
         },
         {
@@ -683,7 +688,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 wind turbine farm sheltering solar tracking racks, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 wind turbine farm sheltering solar tracking racks",
             "notes": "Kansas turbine techs say Metaverse Logistics hogs the grid whenever dust storms spike sensor recalibration.",
         },
         {
@@ -703,7 +708,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 floodlit river campus feeding drone barges, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 floodlit river campus feeding drone barges",
             "notes": "Barge pilots allege Bananazon's dispatch AI throttles public river crossings whenever Prime packages queue up.",
         },
         # Mountain (8)
@@ -724,7 +729,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 glass atrium server canyon overlooking smoggy skyline, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 glass atrium server canyon overlooking smoggy skyline",
             "notes": "Denver asthma coalitions map Macrohard's ozone spikes during every 2025 AGI stress test.",
         },
         {
@@ -744,7 +749,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 desert canyon with mirrored cooling fins, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 desert canyon with mirrored cooling fins",
             "notes": "Colorado River keepers film Metaverse Logistics pumping brine through canyon misters to keep racks alive.",
         },
         {
@@ -764,7 +769,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 salt flat server sprawl ringed by autonomous skiffs, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 salt flat server sprawl ringed by autonomous skiffs",
             "notes": "Lake activists sue Bananazon weekly for concentrating brine faster than the state can truck it away.",
         },
         {
@@ -784,7 +789,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 prairie dome with roaming robo-bison guards, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 prairie dome with roaming robo-bison guards",
             "notes": "Giggle Cloud's robo-bison scare off ranchers trying to document how much water the prairie dome siphons.",
         },
         {
@@ -804,7 +809,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 alpine barn draped in wildfire sensors, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 alpine barn draped in wildfire sensors",
             "notes": "Fire crews say Macrohard's Bozeman lab hogs the choppers every time a smoke advisory hits town.",
         },
         {
@@ -824,7 +829,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 geothermal vent campus steaming beside bike lanes, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 geothermal vent campus steaming beside bike lanes",
             "notes": "Metaverse Logistics uses Boise's geothermal wells like radiators, steaming out the city's microbrew patios.",
         },
         {
@@ -844,7 +849,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 butte-top relay with carved protest glyphs, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 butte-top relay with carved protest glyphs",
             "notes": "Lakota monitors track every fiber trench Bananazon digs across Badlands grazing lands.",
         },
         {
@@ -864,7 +869,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 mining pit converted to glowing server terraces, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 mining pit converted to glowing server terraces",
             "notes": "Mining crews gossip that Macrohard's Elko yard runs more lithium forecasts than safety drills.",
         },
         # West (12)
@@ -885,7 +890,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 aerial tram hugging a neon server canyon, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 aerial tram hugging a neon server canyon",
             "notes": "Metaverse Logistics bars laid-off coders from the San Jose tram unless they sell their training data back.",
         },
         {
@@ -905,7 +910,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 levee-side server farm guarding drought pumps, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 levee-side server farm guarding drought pumps",
             "notes": "Delta farmers say Bananazon's Sacramento node has more water rights lawyers than hydrologists.",
         },
         {
@@ -925,7 +930,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 almond orchard robots shading server stacks, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 almond orchard robots shading server stacks",
             "notes": "Central Valley irrigation boards fine Giggle Cloud weekly for misting its server orchards at noon.",
         },
         {
@@ -945,7 +950,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 oilfield pumpjacks circling mirrored data domes, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 oilfield pumpjacks circling mirrored data domes",
             "notes": "Oil roughnecks say Macrohard's carbon capture core vents as much methane as it models.",
         },
         {
@@ -965,7 +970,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 wildfire break lined with ember-sensing server pods, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 wildfire break lined with ember-sensing server pods",
             "notes": "Cal Fire whistleblowers say Bananazon counts every wildfire drill as 'community outreach' for tax credits.",
         },
         {
@@ -985,7 +990,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 rain-harvesting rooftops feeding vertical server gardens, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 rain-harvesting rooftops feeding vertical server gardens",
             "notes": "Riverkeepers monitor Metaverse Logistics' rain gutters for the microplastics its AGI lab promised to remove.",
         },
         {
@@ -1005,7 +1010,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 desert lava cave bristling with cooling fins, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 desert lava cave bristling with cooling fins",
             "notes": "Cavers keep posting videos of Macrohard's glow worms shorting out inside the Bend lava tubes.",
         },
         {
@@ -1025,7 +1030,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 floating barge campus beneath aurora drones, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 floating barge campus beneath aurora drones",
             "notes": "Seattle pier locals measure every Bananazon aurora drone for noise violations and post the graphs nightly.",
         },
         {
@@ -1045,7 +1050,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 river gorge dam dripping with fiber cables, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 river gorge dam dripping with fiber cables",
             "notes": "Spokane anglers claim Metaverse Logistics blinded salmon counters with fiber-optic glare.",
         },
         {
@@ -1065,7 +1070,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 casino canyon roof lined with coolant waterfalls, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 casino canyon roof lined with coolant waterfalls",
             "notes": "Vegas resorts rent Macrohard's waste heat to keep rooftop pools open during 2025 winter cold snaps.",
         },
         {
@@ -1085,7 +1090,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 wave-energy pier topped with gull-wing servers, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 wave-energy pier topped with gull-wing servers",
             "notes": "Marine biologists document every Giggle Cloud drone dive that spooks the sea otter census.",
         },
         {
@@ -1105,7 +1110,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 redwood skywalk strung with solar server drums, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 redwood skywalk strung with solar server drums",
             "notes": "Tree sitters livestream Bananazon's canopy drones scraping bark in Humboldt's contested groves.",
         },
         # swSpecial (8)
@@ -1126,7 +1131,7 @@ def main() -> None:
             "agiImpact": 15,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 mirrored desert campus under shade sail drones, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 mirrored desert campus under shade sail drones",
             "notes": "Phoenix mutual aid crews keep rescuing Bananazon contractors fainting inside the shade-sail megacampus.",
         },
         {
@@ -1146,7 +1151,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 crater observatory stuffed with satellite servers, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 crater observatory stuffed with satellite servers",
             "notes": "Astronomers riot whenever Giggle Cloud schedules rocket launches over their 2025 star parties.",
         },
         {
@@ -1166,7 +1171,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 adobe railyard with lidar-topped server stacks, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 adobe railyard with lidar-topped server stacks",
             "notes": "Pueblo leaders forced Metaverse Logistics to fund groundwater monitors before switching on the rail spur grid.",
         },
         {
@@ -1186,7 +1191,7 @@ def main() -> None:
             "agiImpact": 5,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 solar orchard shading desalination pools, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 solar orchard shading desalination pools",
             "notes": "Pecan growers monitor Macrohard's reflective panels to prove they're scorching crops every afternoon.",
         },
         {
@@ -1206,7 +1211,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 border bridge studded with biometric server arrays, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 border bridge studded with biometric server arrays",
             "notes": "Cross-border commuters curse Bananazon's biometric choke points whenever the AI freight queues spike.",
         },
         {
@@ -1226,7 +1231,7 @@ def main() -> None:
             "agiImpact": 8,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 tumbleweed turbines feeding modular server sheds, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 tumbleweed turbines feeding modular server sheds",
             "notes": "Dust storm sirens blare whenever Metaverse Logistics revs up its Lubbock aerosol scrubbers for AGI weather runs.",
         },
         {
@@ -1246,7 +1251,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 desert canal lined with reflective server barges, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 desert canal lined with reflective server barges",
             "notes": "Irrigation boards track every Macrohard barge that swaps Colorado River allotments for data credits.",
         },
         {
@@ -1266,7 +1271,7 @@ def main() -> None:
             "agiImpact": 11,
             "status": "intact",
             "icon": "datacenter",
-            "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 copper mine pit crowned with cooling mirrors, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptSubject": "2025 copper mine pit crowned with cooling mirrors",
             "notes": "Copper miners say Metaverse Logistics hoards the grid every time an AGI ore forecast misses quota.",
         },
     ]
@@ -1292,7 +1297,7 @@ def main() -> None:
             "version": "2025.0",
             "style": {
                 "year": 2025,
-                "imagePromptTemplate": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, {datacenter subject}, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+                "imagePromptTemplate": IMAGE_PROMPT_TEMPLATE,
             },
             "targets": {
                 "totalDatacenters": 60,
@@ -1318,7 +1323,7 @@ def main() -> None:
                     "agiImpact": 7,
                     "status": "intact",
                     "icon": "datacenter",
-                    "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, 2025 cornfield data campus guarded by autonomous tractors, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+                    "imagePrompt": fill(IMAGE_PROMPT_TEMPLATE, "2025 cornfield data campus guarded by autonomous tractors"),
                 },
             },
         },
@@ -0,0 +1,34 @@
+"""Shared paths and compression helpers for files written under build/.
+
+Kept apart from build_content.py so runtime modules (e.g. event_chunks.py,
+which engine.py loads) can write build artifacts without importing the
+build orchestrator.
+"""
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from content_loader import ROOT
+
+BUILD_DIR = ROOT / "build"
+
+
+def compressed_variants(path: Path) -> list[Path]:
+    variants = [path.with_name(path.name + ".gz")]
+    if brotli is not None:
+        variants.append(path.with_name(path.name + ".br"))
+    return variants
+
+
+def write_compressed(path: Path) -> None:
+    """Write deterministic .gz (and .br when brotli is installed) next to `path`."""
+    data = path.read_bytes()
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
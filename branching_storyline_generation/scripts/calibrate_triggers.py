@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Fit build_events.phase_variations trigger chances to target firing rates.
+
+A variation's ten events share one onTick trigger: `chance` rolled on every
+tick its `requires` holds. If a game exposes an event on N such ticks, it
+fires with probability 1 - (1 - chance)^N, so one batch of autoplay games
+that records N per game and variation is enough to solve for the chance that
+hits the phase's target share of events fired (by bisection on the average
+over games). New chances shift the games a little (choices move heat, funds
+and support), so the batch is replayed with the fitted table until the
+chances stop moving, usually within a few rounds.
+
+The result goes to content/trigger_chances.json, which build_events.main()
+reads in place of the hand-picked chances; rerun the events generator (or
+build_content.py) afterwards.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from autoplay import MAX_TICKS, play
+from build_content import EVENTS_BUILDER
+from content_loader import TRIGGER_CHANCES_PATH
+from engine import Content, check_requirement, load_content
+
+DEFAULT_TARGETS = {"early": 0.9, "mid": 0.7, "late": 0.5, "endgame": 0.3}
+BATCH = 25
+_content: Content | None = None
+_variations: list[dict] = []
+_owner: dict[str, int | None] = {}
+
+
+def load_variations() -> list[dict]:
+    spec = importlib.util.spec_from_file_location("build_events", EVENTS_BUILDER)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.phase_variations
+
+
+def variation_of(event: dict, variations: list[dict]) -> int | None:
+    """Index of the variation whose trigger an event was generated from."""
+    for trigger in event.get("triggers") or []:
+        for idx, variation in enumerate(variations):
+            requires = [variation["requires"]] if variation.get("requires") else []
+            if event.get("phase") == variation["phase"] and (trigger.get("requires") or []) == requires:
+                return idx
+    return None
+
+
+def with_chances(content: Content, owner: dict[str, int | None], chances: list[float]) -> Content:
+    events = {}
+    for event_id, event in content.events.items():
+        idx = owner.get(event_id)
+        if idx is not None:
+            triggers = [{**trigger, "chance": chances[idx]} for trigger in event["triggers"]]
+            event = {**event, "triggers": triggers}
+        events[event_id] = event
+    return Content(content.constants, content.weapons, content.agents, events, content.datacenters)
+
+
+def fire_probability(exposures: list[int], chance: float) -> float:
+    return sum(1 - (1 - chance) ** ticks for ticks in exposures) / len(exposures)
+
+
+def fit_chance(exposures: list[int], target: float, hand_picked: float) -> float:
+    """Smallest chance whose expected firing share reaches `target` (1 if none
+    does). A variation that was never exposed has nothing to fit, so it gets
+    its hand-picked chance back rather than whatever an earlier round fitted."""
+    if not any(exposures):
+        return hand_picked
+    if fire_probability(exposures, 1.0) < target:
+        return 1.0
+    low, high = 0.0, 1.0
+    for _ in range(40):
+        middle = (low + high) / 2
+        if fire_probability(exposures, middle) < target:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def init_worker() -> None:
+    global _content, _variations, _owner
+    _content = load_content()
+    _variations = load_variations()
+    _owner = {event_id: variation_of(event, _variations) for event_id, event in _content.events.items()}
+
+
+def play_exposures(
+    chances: list[float], seeds: range, max_ticks: int
+) -> tuple[list[list[int]], list[int]]:
+    """Per game, ticks each variation's requirement held; plus events fired per variation."""
+    assert _content is not None, "init_worker() was not called"
+    content = with_chances(_content, _owner, chances)
+    requirements = [variation.get("requires") for variation in _variations]
+    games: list[list[int]] = []
+    fired = [0] * len(_variations)
+    for seed in seeds:
+        exposure = [0] * len(_variations)
+        final: dict = {}
+
+        def observe(state: dict) -> None:
+            for idx, requirement in enumerate(requirements):
+                if requirement is None or check_requirement(state, requirement):
+                    exposure[idx] += 1
+            final["state"] = state
+
+        play(content, seed, max_ticks, observe)
+        state = final.get("state")
+        if state is not None:
+            for event_id in {*state["seenEvents"], *state["pendingEvents"]}:
+                if _owner.get(event_id) is not None:
+                    fired[_owner[event_id]] += 1
+        games.append(exposure)
+    return games, fired
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibrate phase_variations trigger chances by simulation.")
+    parser.add_argument("--target", "-t", action="append", default=[], metavar="PHASE=SHARE", help="Target share of a phase's events fired per game.")
+    parser.add_argument("--games", type=int, default=200, help="Games per round (default 200).")
+    parser.add_argument("--rounds", type=int, default=6, help="Most simulate/fit rounds (default 6).")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="Stop when no chance moves more than this.")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS, help=f"Game length cap (default {MAX_TICKS}).")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--output", "-o", type=Path, default=TRIGGER_CHANCES_PATH, help="Calibrated table for build_events.py.")
+    args = parser.parse_args()
+
+    targets = dict(DEFAULT_TARGETS)
+    for text in args.target:
+        phase, _, share = text.partition("=")
+        try:
+            targets[phase] = float(share)
+        except ValueError:
+            print(f"ERROR: expected PHASE=SHARE, got {text!r}.")
+            sys.exit(1)
+    variations = load_variations()
+    missing = sorted({variation["phase"] for variation in variations} - set(targets))
+    if missing:
+        print(f"ERROR: No target for phase(s): {', '.join(missing)}.")
+        sys.exit(1)
+
+    pool = ProcessPoolExecutor(args.jobs, initializer=init_worker) if args.jobs > 1 else None
+    if pool is None:
+        init_worker()
+    started = time.perf_counter()
+    chances = [float(variation["chance"]) for variation in variations]
+    batches = [range(start, min(start + BATCH, args.games)) for start in range(0, args.games, BATCH)]
+    for round_number in range(1, args.rounds + 1):
+        calls = [(chances, seeds, args.max_ticks) for seeds in batches]
+        results = pool.map(play_exposures, *zip(*calls)) if pool else [play_exposures(*call) for call in calls]
+        exposures: list[list[int]] = [[] for _ in variations]
+        fired = [0] * len(variations)
+        for games, batch_fired in results:
+            for exposure in games:
+                for idx, ticks in enumerate(exposure):
+                    exposures[idx].append(ticks)
+            fired = [total + count for total, count in zip(fired, batch_fired)]
+        fitted = [
+            fit_chance(exposures[idx], targets[variation["phase"]], float(variation["chance"]))
+            for idx, variation in enumerate(variations)
+        ]
+        shift = max(abs(new - old) for new, old in zip(fitted, chances))
+        print(f"round {round_number}: largest chance change {shift:.4f}")
+        chances = fitted
+        if shift <= args.tolerance:
+            break
+    if pool is not None:
+        pool.shutdown()
+    elapsed = time.perf_counter() - started
+
+    events_per_variation: dict[int, int] = {}
+    for event in load_content().events.values():
+        idx = variation_of(event, variations)
+        if idx is not None:
+            events_per_variation[idx] = events_per_variation.get(idx, 0) + 1
+    table = []
+    for idx, variation in enumerate(variations):
+        measured = fired[idx] / (args.games * max(1, events_per_variation.get(idx, 0)))
+        predicted = fire_probability(exposures[idx], chances[idx])
+        table.append({
+            "phase": variation["phase"],
+            "requires": variation.get("requires"),
+            "chance": round(chances[idx], 4),
+            # False: the requirement never held in the last round; `chance` is the hand-picked one.
+            "calibrated": any(exposures[idx]),
+            "target": targets[variation["phase"]],
+            "predictedFireRate": round(predicted, 4),
+            "lastRoundFireRate": round(measured, 4),
+        })
+        if not any(exposures[idx]):
+            flag = "  (requirement never held in the last round; kept hand-picked chance)"
+        elif predicted < targets[variation["phase"]] - 0.005:
+            flag = "  (unreachable: requirement rarely holds)"
+        else:
+            flag = ""
+        print(
+            f"{idx:2d} {variation['phase']:8s} {variation['chance']:.2f} -> {chances[idx]:.4f}"
+            f"  predicted {predicted:.2f} (last round {measured:.2f}){flag}"
+        )
+    args.output.write_text(json.dumps({"targets": targets, "games": args.games, "variations": table}, indent=2) + "\n", encoding="utf-8")
+    print(f"OK: Calibrated {len(table)} variations in {round_number} rounds ({elapsed:.1f}s); wrote {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
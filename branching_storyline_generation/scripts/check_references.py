@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Check that every id referenced across the content files resolves.
+
+One pass over weapons, agents, events, datacenters and the creative registry
+interns each `dc:`/`wp:`/`ag:`/`ev:`/`ch:`/`inv:` definition into a set per
+prefix and records every reference; a second pass over the references does
+one set lookup each. Both passes are linear in the size of the content.
+
+`inv:` items have no file of their own: an inventory effect that grants one
+(positive add, or set) defines it, and anything else that names it is a
+reference. Inventory slots otherwise accept weapon and agent ids.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+
+from content_loader import AGENTS_PATH, DATACENTERS_PATH, EVENTS_PATH, REGISTRY_PATH, WEAPONS_PATH, load_json
+
+PREFIXES = ("dc", "wp", "ag", "ev", "ch", "inv")
+INVENTORY_KINDS = ("wp", "ag", "inv")
+REGISTRY_KINDS = {"datacenters": "dc", "weapons": "wp", "agents": "ag", "events": "ev"}
+
+
+@dataclass
+class ReferenceReport:
+    defined: dict[str, set[str]] = field(default_factory=lambda: {prefix: set() for prefix in PREFIXES})
+    duplicates: Counter = field(default_factory=Counter)
+    references: list[tuple[str, tuple[str, ...], str]] = field(default_factory=list)
+    dangling: list[tuple[str, str, str]] = field(default_factory=list)
+
+    @property
+    def interned(self) -> int:
+        return sum(len(ids) for ids in self.defined.values())
+
+    def define(self, kind: str, value: object, scope: set[str]) -> None:
+        """Intern a definition; `scope` tracks duplicates within one source."""
+        if not isinstance(value, str):
+            return
+        value = sys.intern(value)
+        if value in scope:
+            self.duplicates[value] += 1
+        scope.add(value)
+        self.defined[kind].add(value)
+
+    def refer(self, value: object, kinds: tuple[str, ...], where: str) -> None:
+        if isinstance(value, str):
+            self.references.append((value, kinds, where))
+        elif value is not None:
+            self.dangling.append((where, repr(value), "not a string id"))
+
+    def resolve(self) -> None:
+        for value, kinds, where in self.references:
+            prefix = value.split(":", 1)[0]
+            if prefix not in kinds:
+                self.dangling.append((where, value, f"expected {'/'.join(kind + ':' for kind in kinds)} id"))
+            elif value not in self.defined[prefix]:
+                self.dangling.append((where, value, f"no {prefix}: definition"))
+
+
+def scan_requirements(report: ReferenceReport, requirements: list | None, where: str) -> None:
+    for index, requirement in enumerate(requirements or []):
+        if "datacenterId" in requirement:
+            report.refer(requirement["datacenterId"], ("dc",), f"{where}.requires[{index}].datacenterId")
+        if requirement.get("type") == "inventory":
+            report.refer(requirement.get("key"), INVENTORY_KINDS, f"{where}.requires[{index}].key")
+
+
+def scan_effects(report: ReferenceReport, effects: list | None, where: str) -> None:
+    for index, effect in enumerate(effects or []):
+        target = effect.get("target") or {}
+        kind = target.get("type")
+        if kind == "datacenter":
+            report.refer(target.get("id"), ("dc",), f"{where}.effects[{index}].target.id")
+        elif kind == "inventory":
+            key = target.get("key")
+            grants = effect.get("op") == "set" or (effect.get("op", "add") == "add" and (effect.get("value") or 0) > 0)
+            if grants and isinstance(key, str) and key.startswith("inv:"):
+                report.defined["inv"].add(sys.intern(key))  # granting twice is fine
+            else:
+                report.refer(key, INVENTORY_KINDS, f"{where}.effects[{index}].target.key")
+
+
+def scan_unit(report: ReferenceReport, unit: dict, kind: str, scope: set[str]) -> None:
+    report.define(kind, unit.get("id"), scope)
+    where = unit.get("id") or f"<{kind} without id>"
+    scan_requirements(report, unit.get("requires"), where)
+    scan_effects(report, unit.get("effects"), where)
+
+
+def check_references(
+    weapons_doc: dict, agents_doc: dict, events_doc: dict, geojson: dict, registry: dict
+) -> ReferenceReport:
+    report = ReferenceReport()
+    weapon_scope: set[str] = set()
+    for weapon in weapons_doc.get("weapons") or []:
+        scan_unit(report, weapon, "wp", weapon_scope)
+    agent_scope: set[str] = set()
+    for agent in agents_doc.get("agents") or []:
+        scan_unit(report, agent, "ag", agent_scope)
+
+    datacenter_scope: set[str] = set()
+    for index, feature in enumerate(geojson.get("features") or []):
+        props = feature.get("properties") or {}
+        report.define("dc", props.get("id"), datacenter_scope)
+        if feature.get("id") != props.get("id"):
+            report.dangling.append((f"features[{index}].id", str(feature.get("id")), "does not match properties.id"))
+
+    event_scope: set[str] = set()
+    choice_scope: set[str] = set()
+    for event in events_doc.get("events") or []:
+        report.define("ev", event.get("id"), event_scope)
+        event_id = event.get("id") or "<event without id>"
+        for index, trigger in enumerate(event.get("triggers") or []):
+            where = f"{event_id}.triggers[{index}]"
+            if "datacenterId" in trigger:
+                report.refer(trigger["datacenterId"], ("dc",), f"{where}.datacenterId")
+            scan_requirements(report, trigger.get("requires"), where)
+        for choice in event.get("choices") or []:
+            report.define("ch", choice.get("id"), choice_scope)
+            where = f"{event_id}/{choice.get('id')}"
+            scan_requirements(report, choice.get("requires"), where)
+            scan_effects(report, choice.get("effects"), where)
+            if "followupEventId" in choice:
+                report.refer(choice["followupEventId"], ("ev",), f"{where}.followupEventId")
+
+    for name, category in (registry.get("categories") or {}).items():
+        kind = REGISTRY_KINDS.get(name)
+        scope: set[str] = set()
+        for item in category.get("items") or []:
+            item_id = item.get("id")
+            if isinstance(item_id, str):
+                if item_id in scope:
+                    report.duplicates[item_id] += 1
+                scope.add(item_id)
+            if kind and item.get("status") == "done":
+                report.refer(item_id, (kind,), f"registry.{name}")
+
+    report.resolve()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report dangling and duplicate ids across all content files.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    report = check_references(
+        load_json(WEAPONS_PATH),
+        load_json(AGENTS_PATH),
+        load_json(EVENTS_PATH),
+        load_json(DATACENTERS_PATH),
+        load_json(REGISTRY_PATH),
+    )
+    if args.json:
+        print(json.dumps({
+            "interned": report.interned,
+            "references": len(report.references),
+            "dangling": [{"at": where, "id": value, "reason": reason} for where, value, reason in report.dangling],
+            "duplicates": dict(report.duplicates),
+        }, indent=2))
+    else:
+        for where, value, reason in report.dangling:
+            print(f"DANGLING: {where} -> {value} ({reason})")
+        for value, extra in report.duplicates.items():
+            print(f"DUPLICATE: {value} defined {extra + 1} times")
+    if report.dangling or report.duplicates:
+        if not args.json:
+            print(f"ERROR: {len(report.dangling)} dangling and {len(report.duplicates)} duplicate ids across {report.interned} interned ids.")
+        sys.exit(1)
+    if not args.json:
+        print(f"OK: {len(report.references)} references resolve across {report.interned} interned ids.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Precompute a per-zoom cluster index of datacenters and write it as tiles.
+
+Follows the supercluster approach: points are projected to Web Mercator,
+then for each zoom from `max_zoom` down to `min_zoom` every point of the
+level above is greedily merged with its unclaimed neighbours within
+`radius` pixels (a grid of radius-sized cells keeps the neighbour search
+linear). Clusters carry a count-weighted centroid and the summed `powerMW`,
+`computeUnits` and `agiImpact` of their members.
+
+Each zoom is cut into slippy-map tiles at build/tiles/datacenters/{z}/{x}/{y}.json
+and listed in index.json. Zoom `max_zoom + 1` holds the raw points; clients
+reuse it for any deeper zoom.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from content_loader import DATACENTERS_PATH, ROOT, load_datacenters
+
+TILES_DIR = ROOT / "build" / "tiles" / "datacenters"
+INDEX_PATH = TILES_DIR / "index.json"
+METRICS = ("powerMW", "computeUnits", "agiImpact")
+POINT_PROPERTIES = ("id", "name", "status", "icon")
+MAX_LAT = 85.0511  # Web Mercator's square-world limit, atan(sinh(pi))
+
+
+def mercator_x(lon: float) -> float:
+    return lon / 360.0 + 0.5
+
+
+def mercator_y(lat: float) -> float:
+    sin = math.sin(math.radians(min(MAX_LAT, max(-MAX_LAT, lat))))
+    y = 0.5 - 0.25 * math.log((1 + sin) / (1 - sin)) / math.pi
+    return min(1.0, max(0.0, y))
+
+
+def lon_of(x: float) -> float:
+    return (x - 0.5) * 360.0
+
+
+def lat_of(y: float) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+
+
+@dataclass
+class Node:
+    """A raw point or a cluster at one zoom level."""
+
+    x: float
+    y: float
+    count: int
+    metrics: tuple[float, ...]
+    id: str
+    origin_zoom: int  # zoom at which this node was formed
+    props: dict | None = None  # raw points only
+
+
+def cluster_level(nodes: list[Node], zoom: int, radius: float, extent: int) -> list[Node]:
+    r = radius / (extent * 2 ** zoom)
+    cells: dict[tuple[int, int], list[int]] = {}
+    for index, node in enumerate(nodes):
+        cells.setdefault((int(node.x / r), int(node.y / r)), []).append(index)
+
+    claimed = [False] * len(nodes)
+    merged: list[Node] = []
+    r2 = r * r
+    for index, node in enumerate(nodes):
+        if claimed[index]:
+            continue
+        claimed[index] = True
+        cx, cy = int(node.x / r), int(node.y / r)
+        members = [node]
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for other in cells.get((gx, gy), ()):
+                    if claimed[other]:
+                        continue
+                    candidate = nodes[other]
+                    if (candidate.x - node.x) ** 2 + (candidate.y - node.y) ** 2 <= r2:
+                        claimed[other] = True
+                        members.append(candidate)
+        if len(members) == 1:
+            merged.append(node)
+            continue
+        count = sum(member.count for member in members)
+        merged.append(Node(
+            x=sum(member.x * member.count for member in members) / count,
+            y=sum(member.y * member.count for member in members) / count,
+            count=count,
+            metrics=tuple(sum(member.metrics[axis] for member in members) for axis in range(len(METRICS))),
+            id=f"cluster:{zoom}:{len(merged)}",
+            origin_zoom=zoom,
+        ))
+    return merged
+
+
+def build_levels(
+    datacenters: list[dict], min_zoom: int, max_zoom: int, radius: float, extent: int
+) -> dict[int, list[Node]]:
+    points = [
+        Node(
+            x=mercator_x(float(dc["lon"])),
+            y=mercator_y(float(dc["lat"])),
+            count=1,
+            metrics=tuple(float(dc.get(metric) or 0) for metric in METRICS),
+            id=dc["id"],
+            origin_zoom=max_zoom + 1,
+            props={key: dc[key] for key in POINT_PROPERTIES if key in dc},
+        )
+        for dc in datacenters
+    ]
+    levels = {max_zoom + 1: points}
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        levels[zoom] = cluster_level(levels[zoom + 1], zoom, radius, extent)
+    return levels
+
+
+def to_feature(node: Node) -> dict:
+    if node.props is not None:
+        properties = dict(node.props)
+    else:
+        properties = {"cluster": True, "pointCount": node.count, "expansionZoom": node.origin_zoom + 1}
+    properties.update({metric: round(value, 3) for metric, value in zip(METRICS, node.metrics)})
+    return {
+        "type": "Feature",
+        "id": node.id,
+        "geometry": {"type": "Point", "coordinates": [round(lon_of(node.x), 5), round(lat_of(node.y), 5)]},
+        "properties": properties,
+    }
+
+
+def replaceable(out_dir: Path) -> bool:
+    """True for a missing or empty directory, or one this tool wrote (it holds our index.json)."""
+    if not out_dir.exists():
+        return True
+    if not out_dir.is_dir():
+        return False
+    if not any(out_dir.iterdir()):
+        return True
+    try:
+        index = json.loads((out_dir / "index.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return isinstance(index, dict) and {"radius", "extent", "tiles"} <= index.keys()
+
+
+def write_tiles(levels: dict[int, list[Node]], out_dir: Path, radius: float, extent: int) -> dict:
+    """Write the tiles to a scratch directory next to `out_dir`, then swap it in.
+
+    Only a directory that replaceable() accepts is ever removed.
+    """
+    if not replaceable(out_dir):
+        raise FileExistsError(f"{out_dir} exists and is not a tile directory written by this tool")
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{out_dir.name}-", dir=out_dir.parent))
+    try:
+        index: dict = {"radius": radius, "extent": extent, "minZoom": min(levels), "rawZoom": max(levels), "tiles": {}}
+        for zoom, nodes in sorted(levels.items()):
+            scale = 2 ** zoom
+            tiles: dict[tuple[int, int], list[dict]] = {}
+            for node in nodes:
+                key = (min(scale - 1, int(node.x * scale)), min(scale - 1, int(node.y * scale)))
+                tiles.setdefault(key, []).append(to_feature(node))
+            for (x, y), features in tiles.items():
+                path = staging / str(zoom) / str(x) / f"{y}.json"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(
+                    json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":"), ensure_ascii=False),
+                    encoding="utf-8",
+                )
+            index["tiles"][str(zoom)] = sorted([x, y, len(features)] for (x, y), features in tiles.items())
+        (staging / "index.json").write_text(json.dumps(index, separators=(",", ":")) + "\n", encoding="utf-8")
+        staging.chmod(0o755)  # mkdtemp creates it 0700
+        if out_dir.exists():
+            # os.replace cannot overwrite a non-empty directory: move the old tiles aside first.
+            retired = Path(tempfile.mkdtemp(prefix=f".{out_dir.name}-old-", dir=out_dir.parent))
+            os.replace(out_dir, retired / out_dir.name)
+            os.replace(staging, out_dir)
+            shutil.rmtree(retired)
+        else:
+            os.replace(staging, out_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build per-zoom datacenter cluster tiles for the map layer.")
+    parser.add_argument("--input", "-i", type=Path, default=DATACENTERS_PATH, help="GeoJSON to cluster.")
+    parser.add_argument("--output", "-o", type=Path, default=TILES_DIR, help="Tile directory (replaced on each run if this tool wrote it).")
+    parser.add_argument("--min-zoom", type=int, default=0)
+    parser.add_argument("--max-zoom", type=int, default=8, help="Deepest zoom that still clusters (default 8).")
+    parser.add_argument("--radius", type=float, default=40.0, help="Cluster radius in pixels (default 40).")
+    parser.add_argument("--extent", type=int, default=512, help="Tile extent in pixels (default 512).")
+    args = parser.parse_args()
+
+    if not 0 <= args.min_zoom <= args.max_zoom:
+        print("ERROR: Expected 0 <= --min-zoom <= --max-zoom.")
+        sys.exit(1)
+    if not replaceable(args.output):
+        print(f"ERROR: {args.output} exists and is not a tile directory written by this tool; pick another --output.")
+        sys.exit(1)
+    levels = build_levels(load_datacenters(args.input), args.min_zoom, args.max_zoom, args.radius, args.extent)
+    index = write_tiles(levels, args.output, args.radius, args.extent)
+    tile_count = sum(len(tiles) for tiles in index["tiles"].values())
+    summary = ", ".join(f"z{zoom}:{len(levels[int(zoom)])}" for zoom in index["tiles"])
+    print(f"OK: Wrote {tile_count} tiles to {args.output} ({summary}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Export datacenters.geojson in a compact, precompressed form for the client.
+
+The export stays a GeoJSON FeatureCollection: coordinates are rounded to
+`--precision` decimals, repeated enum-like properties are replaced by indexes
+into a top-level `dictionaries` member (GeoJSON allows foreign members),
+imagePrompts are reduced to their subjects (see image_prompts.py), and all
+whitespace is stripped. `.gz` and `.br` variants are written alongside,
+and a byte report compares every form with the checked-in file.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import gzip
+import json
+import sys
+from pathlib import Path
+
+from build_output import BUILD_DIR, brotli, write_compressed
+from content_loader import DATACENTERS_PATH, load_json
+from image_prompts import expand_document, factor_document
+
+COMPACT_PATH = BUILD_DIR / "datacenters.compact.geojson"
+DICTIONARY_FIELDS = ("operator", "region", "regionGroup", "state", "powerTier", "status", "icon")
+
+
+def minify(value: object) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact(geojson: dict, precision: int, drop: tuple[str, ...] = ()) -> dict:
+    geojson = copy.deepcopy(geojson)
+    factor_document(geojson)
+    if "imagePrompt" in drop:
+        drop += ("imagePromptSubject",)
+    dictionaries: dict[str, list] = {name: [] for name in DICTIONARY_FIELDS}
+    lookups: dict[str, dict] = {name: {} for name in DICTIONARY_FIELDS}
+    features = []
+    for feature in geojson.get("features") or []:
+        properties = {}
+        for key, value in (feature.get("properties") or {}).items():
+            if key in drop:
+                continue
+            if key in lookups:
+                lookup = lookups[key]
+                if value not in lookup:
+                    lookup[value] = len(dictionaries[key])
+                    dictionaries[key].append(value)
+                value = lookup[value]
+            properties[key] = value
+        geometry = dict(feature["geometry"])
+        geometry["coordinates"] = [round(float(axis), precision) for axis in geometry["coordinates"]]
+        features.append({**feature, "geometry": geometry, "properties": properties})
+    out = {key: value for key, value in geojson.items() if key != "features"}
+    out["dictionaries"] = {name: values for name, values in dictionaries.items() if values}
+    out["features"] = features
+    return out
+
+
+def expand(doc: dict) -> dict:
+    """Undo the dictionary and prompt encoding (coordinates stay rounded)."""
+    dictionaries = doc.get("dictionaries") or {}
+    out = {key: value for key, value in doc.items() if key not in ("dictionaries", "features")}
+    out["features"] = [
+        {
+            **feature,
+            "properties": {
+                key: dictionaries[key][value] if key in dictionaries else value
+                for key, value in feature["properties"].items()
+            },
+        }
+        for feature in doc.get("features") or []
+    ]
+    expand_document(out)
+    return out
+
+
+def byte_report(original: bytes, packed: bytes) -> list[tuple[str, int]]:
+    minified = minify(json.loads(original)).encode()
+    rows = [
+        ("datacenters.geojson (indent=2)", len(original)),
+        ("  minified", len(minified)),
+        ("  gzip -9", len(gzip.compress(original, 9, mtime=0))),
+    ]
+    if brotli is not None:
+        rows.append(("  brotli -11", len(brotli.compress(original, quality=11))))
+    rows += [
+        ("compact export", len(packed)),
+        ("  gzip -9", len(gzip.compress(packed, 9, mtime=0))),
+    ]
+    if brotli is not None:
+        rows.append(("  brotli -11", len(brotli.compress(packed, quality=11))))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a quantized, dictionary-encoded datacenters export.")
+    parser.add_argument("--input", "-i", type=Path, default=DATACENTERS_PATH)
+    parser.add_argument("--output", "-o", type=Path, default=COMPACT_PATH)
+    parser.add_argument("--precision", type=int, default=4, help="Coordinate decimals (default 4, about 11 m).")
+    parser.add_argument("--drop", default="", help="Comma-separated properties to omit, e.g. notes,imagePrompt.")
+    args = parser.parse_args()
+
+    if not 0 <= args.precision <= 10:
+        print("ERROR: --precision must be between 0 and 10.")
+        sys.exit(1)
+    drop = tuple(name.strip() for name in args.drop.split(",") if name.strip())
+    geojson = load_json(args.input)
+    packed_doc = compact(geojson, args.precision, drop)
+    packed = (minify(packed_doc) + "\n").encode()
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_bytes(packed)
+    write_compressed(args.output)
+
+    original = args.input.read_bytes()
+    for label, size in byte_report(original, packed):
+        print(f"{label:32s} {size:9,d} B  {size / len(original):6.1%}")
+    if brotli is None:
+        print("(brotli not installed; .br variants skipped)")
+    print(f"OK: Wrote {args.output} ({len(packed_doc['features'])} features).")
+
+
+if __name__ == "__main__":
+    main()
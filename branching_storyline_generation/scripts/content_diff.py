@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Diff two versions of a content file by stable id and emit a compact delta.
+
+Items are matched by id (`ev:`, `dc:`, `wp:`, `ag:`), and each side is hashed
+once per item over canonical JSON, so unchanged items cost one comparison and
+the whole diff is O(n). Changed items carry RFC 6902 JSON Patch operations
+relative to the item, which keeps a delta for a one-field retune to a few
+bytes instead of a full re-download.
+
+    content_diff.py diff OLD NEW [-o delta.json]   # report, optionally write the delta
+    content_diff.py apply OLD delta.json [-o OUT]  # rebuild NEW from OLD + delta
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import sys
+from pathlib import Path
+
+from build_output import write_compressed
+from content_loader import canonical, digest, load_json
+
+ITEM_KEYS = ("features", "events", "weapons", "agents")
+DELTA_FORMAT = "content-delta/1"
+
+
+def item_key(doc: dict) -> str:
+    for key in ITEM_KEYS:
+        if isinstance(doc.get(key), list):
+            return key
+    raise ValueError(f"expected one of {', '.join(ITEM_KEYS)} in the document")
+
+
+def item_id(item: dict) -> str:
+    return item.get("id") or (item.get("properties") or {}).get("id")
+
+
+def split_document(doc: dict) -> tuple[str, dict, dict[str, dict]]:
+    """Return (list key, top-level fields without the list, items by id)."""
+    key = item_key(doc)
+    meta = {name: value for name, value in doc.items() if name != key}
+    items: dict[str, dict] = {}
+    for item in doc[key]:
+        identifier = item_id(item)
+        if identifier in items:
+            raise ValueError(f"duplicate id {identifier} in {key}")
+        items[identifier] = item
+    return key, meta, items
+
+
+def pointer(parts: list) -> str:
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in parts)
+
+
+def json_patch(old: object, new: object, path: list | None = None) -> list[dict]:
+    """Minimal-ish RFC 6902 ops turning `old` into `new`.
+
+    Dicts diff per key and equal-length lists per index; any other change
+    replaces the value wholesale.
+    """
+    path = path or []
+    if type(old) is type(new) and old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": pointer(path + [key])} for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": pointer(path + [key]), "value": value})
+            else:
+                ops.extend(json_patch(old[key], value, path + [key]))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (before, after) in enumerate(zip(old, new)):
+            ops.extend(json_patch(before, after, path + [index]))
+        return ops
+    return [{"op": "replace", "path": pointer(path), "value": new}]
+
+
+def apply_json_patch(document: object, ops: list[dict]) -> object:
+    for op in ops:
+        parts = [part.replace("~1", "/").replace("~0", "~") for part in op["path"].split("/")[1:]]
+        if not parts:
+            document = copy.deepcopy(op["value"])
+            continue
+        parent = document
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        last: int | str = int(parts[-1]) if isinstance(parent, list) else parts[-1]
+        if op["op"] == "remove":
+            del parent[last]
+        elif op["op"] in ("add", "replace"):
+            parent[last] = copy.deepcopy(op["value"])
+        else:
+            raise ValueError(f"unsupported patch op {op['op']}")
+    return document
+
+
+def changed_fields(ops: list[dict]) -> list[str]:
+    fields = []
+    for op in ops:
+        head = op["path"].split("/")[1:2]
+        if head and head[0] == "properties":
+            head = op["path"].split("/")[2:3] or head
+        name = head[0] if head else "(item)"
+        if name not in fields:
+            fields.append(name)
+    return fields
+
+
+def diff_documents(old_doc: dict, new_doc: dict) -> dict:
+    old_key, old_meta, old_items = split_document(old_doc)
+    new_key, new_meta, new_items = split_document(new_doc)
+    if old_key != new_key:
+        raise ValueError(f"cannot diff {old_key} against {new_key}")
+
+    old_hashes = {identifier: digest(item) for identifier, item in old_items.items()}
+    removed = [identifier for identifier in old_items if identifier not in new_items]
+    added = [new_items[identifier] for identifier in new_items if identifier not in old_items]
+    changed = {
+        identifier: json_patch(old_items[identifier], item)
+        for identifier, item in new_items.items()
+        if identifier in old_items and digest(item) != old_hashes[identifier]
+    }
+    delta = {
+        "format": DELTA_FORMAT,
+        "items": new_key,
+        "from": digest(old_doc),
+        "to": digest(new_doc),
+        "fromVersion": old_doc.get("version"),
+        "toVersion": new_doc.get("version"),
+        "meta": json_patch(old_meta, new_meta),
+        "remove": removed,
+        "add": added,
+        "change": changed,
+    }
+    # Applying keeps surviving items in their old order and appends additions;
+    # only ship an explicit order when the new file disagrees with that.
+    implied = [identifier for identifier in old_items if identifier in new_items]
+    implied += [item_id(item) for item in added]
+    if implied != list(new_items):
+        delta["order"] = list(new_items)
+    return delta
+
+
+def apply_delta(old_doc: dict, delta: dict) -> dict:
+    if delta.get("format") != DELTA_FORMAT:
+        raise ValueError(f"unsupported delta format {delta.get('format')}")
+    if digest(old_doc) != delta["from"]:
+        raise ValueError("delta does not apply to this document (base hash mismatch)")
+    key, meta, items = split_document(copy.deepcopy(old_doc))
+    for identifier in delta["remove"]:
+        del items[identifier]
+    for identifier, ops in delta["change"].items():
+        items[identifier] = apply_json_patch(items[identifier], ops)
+    for item in delta["add"]:
+        items[item_id(item)] = copy.deepcopy(item)
+    order = delta.get("order") or list(items)
+    meta = apply_json_patch(meta, delta["meta"])
+    # Rebuild with the list in its original position among the top-level keys.
+    result = {}
+    for name in list(old_doc):
+        if name == key:
+            result[key] = [items[identifier] for identifier in order]
+        elif name in meta:
+            result[name] = meta[name]
+    for name, value in meta.items():
+        result.setdefault(name, value)
+    if digest(result) != delta["to"]:
+        raise ValueError("patched document does not match the target hash")
+    return result
+
+
+def write_json(path: Path, value: object, compact: bool) -> None:
+    if compact:
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False) + "\n"
+    else:
+        text = json.dumps(value, indent=2, ensure_ascii=False) + "\n"
+    path.write_text(text, encoding="utf-8")
+
+
+def print_report(delta: dict, old_size: int) -> None:
+    for identifier in delta["remove"]:
+        print(f"REMOVED: {identifier}")
+    for item in delta["add"]:
+        print(f"ADDED:   {item_id(item)}")
+    for identifier, ops in delta["change"].items():
+        print(f"CHANGED: {identifier} ({', '.join(changed_fields(ops))})")
+    if delta["meta"]:
+        print(f"META:    {', '.join(changed_fields(delta['meta']))}")
+    if "order" in delta:
+        print("ORDER:   items were reordered")
+    size = len(canonical(delta))
+    print(
+        f"OK: {len(delta['add'])} added, {len(delta['remove'])} removed, {len(delta['change'])} changed "
+        f"{delta['items']}; delta {size} bytes vs {old_size} bytes for the full file."
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Id-keyed diff and JSON Patch deltas for content files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    diff_parser = sub.add_parser("diff", help="Compare two versions of a content file.")
+    diff_parser.add_argument("old", type=Path)
+    diff_parser.add_argument("new", type=Path)
+    diff_parser.add_argument("--output", "-o", type=Path, help="Write the delta here (plus .gz/.br).")
+    apply_parser = sub.add_parser("apply", help="Rebuild the new version from the old one and a delta.")
+    apply_parser.add_argument("old", type=Path)
+    apply_parser.add_argument("delta", type=Path)
+    apply_parser.add_argument("--output", "-o", type=Path, help="Write the rebuilt file here (default: stdout).")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "diff":
+            new_doc = load_json(args.new)
+            delta = diff_documents(load_json(args.old), new_doc)
+            print_report(delta, args.new.stat().st_size)
+            if args.output:
+                write_json(args.output, delta, compact=True)
+                write_compressed(args.output)
+            return
+        result = apply_delta(load_json(args.old), load_json(args.delta))
+    except (ValueError, KeyError) as exc:
+        print(f"ERROR: {exc}")
+        sys.exit(1)
+    if args.output:
+        write_json(args.output, result, compact=False)
+        print(f"OK: Wrote {args.output}.")
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Shared loaders for the static content files under content/."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CONTENT_DIR = ROOT / "content"
+CONSTANTS_PATH = CONTENT_DIR / "constants.json"
+WEAPONS_PATH = CONTENT_DIR / "weapons.json"
+AGENTS_PATH = CONTENT_DIR / "agents.json"
+EVENTS_PATH = CONTENT_DIR / "events.json"
+DATACENTERS_PATH = CONTENT_DIR / "datacenters.geojson"
+TRIGGER_CHANCES_PATH = CONTENT_DIR / "trigger_chances.json"
+REGISTRY_PATH = ROOT / "creative_registry.json"
+
+
+def load_json(path: Path) -> dict:
+    if not path.exists():
+        print(f"ERROR: {path} does not exist.")
+        sys.exit(1)
+    try:
+        with path.open("r", encoding="utf-8") as fp:
+            return json.load(fp)
+    except json.JSONDecodeError as exc:
+        print(f"ERROR: Failed to parse {path}: {exc}")
+        sys.exit(1)
+
+
+def canonical(value: object) -> bytes:
+    """Key-sorted compact JSON, so equal content always hashes the same."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def digest(value: object) -> str:
+    return hashlib.sha256(canonical(value)).hexdigest()
+
+
+def load_constants(path: Path = CONSTANTS_PATH) -> dict:
+    return load_json(path)
+
+
+def load_weapons(path: Path = WEAPONS_PATH) -> list[dict]:
+    return load_json(path).get("weapons") or []
+
+
+def load_agents(path: Path = AGENTS_PATH) -> list[dict]:
+    return load_json(path).get("agents") or []
+
+
+def load_events(path: Path = EVENTS_PATH) -> list[dict]:
+    return load_json(path).get("events") or []
+
+
+def load_datacenters(path: Path = DATACENTERS_PATH) -> list[dict]:
+    """Return datacenter properties with `lon`/`lat` lifted from the geometry."""
+    datacenters = []
+    for feature in load_json(path).get("features") or []:
+        props = dict(feature.get("properties") or {})
+        lon, lat = (feature.get("geometry") or {}).get("coordinates") or (0.0, 0.0)
+        props["lon"] = lon
+        props["lat"] = lat
+        datacenters.append(props)
+    return datacenters
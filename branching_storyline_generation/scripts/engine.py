@@ -0,0 +1,477 @@
+"""Headless game engine implementing the spec.md rules over `GameState` dicts.
+
+States are plain JSON-serializable dicts shaped like the TypeScript
+`GameState` in spec.md, plus two engine-side fields: `pendingEvents` (ids
+waiting on `chooseEventOption`) and a runtime `defense` on each datacenter row.
+Randomness comes from an explicit `random.Random` so seeded runs replay.
+
+Rule interpretations not spelled out in spec.md:
+- A weapon's `cost` is paid once, when it first enters the inventory; later
+  uses are gated by `cooldownTicks` only.
+- `agiRate` is scaled by the share of total `agiImpact` still intact, which is
+  the spec's "minus destroyed agiImpact" term normalized to the base rate.
+- Weapon `stealth` scales down the weapon's own positive heat effects.
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+from content_loader import load_agents, load_constants, load_datacenters, load_events, load_weapons
+from event_chunks import PhasedEvents
+from timers import cancel_timer, make_timer, pop_due, push_timer
+
+GLOBAL_BOUNDS = {
+    "agiProgress": (0.0, 100.0),
+    "publicSupport": (0.0, 100.0),
+    "heat": (0.0, float("inf")),
+    "funds": (0.0, float("inf")),
+    "agiRate": (float("-inf"), float("inf")),
+}
+
+
+class ActionError(ValueError):
+    """Raised when an action is not legal in the current state."""
+
+
+def clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def apply_op(op: str, current: float, value: float) -> float:
+    if op == "add":
+        return current + value
+    if op == "mul":
+        return current * value
+    if op == "set":
+        return value
+    raise ValueError(f"unknown effect op {op!r}")
+
+
+def compare(cmp: str, actual: object, expected: object) -> bool:
+    if cmp == "gte":
+        return actual >= expected
+    if cmp == "lte":
+        return actual <= expected
+    if cmp == "eq":
+        return actual == expected
+    if cmp == "ne":
+        return actual != expected
+    raise ValueError(f"unknown requirement cmp {cmp!r}")
+
+
+def damage_multiplier(constants: dict, defense: float) -> float:
+    return 1.0 - clamp(defense, 0.0, 1.0) * float(constants["damageDefenseFactor"])
+
+
+def derived_agi_rate(constants: dict, heat: float, intact_share: float) -> float:
+    rate = float(constants["baseAgiRatePerTick"]) * (1 + heat * float(constants["heatAffectsAgiRate"]))
+    return max(0.0, rate * intact_share)
+
+
+@dataclass
+class Content:
+    constants: dict
+    weapons: dict[str, dict]
+    agents: dict[str, dict]
+    events: Mapping[str, dict]
+    datacenters: dict[str, dict]
+    # Trigger-side view of every event (id, phase, oneTime, triggers, ...);
+    # with `PhasedEvents` this never forces a chunk to load.
+    event_headers: Mapping[str, dict] = field(init=False)
+    total_agi_impact: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.event_headers = getattr(self.events, "headers", self.events)
+        self.total_agi_impact = sum(float(dc.get("agiImpact") or 0) for dc in self.datacenters.values())
+
+    @cached_property
+    def choices(self) -> dict[str, dict]:
+        return {
+            choice["id"]: choice
+            for event in self.events.values()
+            for choice in event.get("choices") or []
+        }
+
+    @property
+    def version(self) -> str:
+        return str(self.constants.get("version", ""))
+
+    @classmethod
+    def from_lists(
+        cls,
+        constants: dict,
+        weapons: list[dict],
+        agents: list[dict],
+        events: list[dict],
+        datacenters: list[dict],
+    ) -> "Content":
+        return cls(
+            constants=constants,
+            weapons={item["id"]: item for item in weapons},
+            agents={item["id"]: item for item in agents},
+            events={item["id"]: item for item in events},
+            datacenters={item["id"]: item for item in datacenters},
+        )
+
+
+def load_content(event_chunks: Path | None = None) -> Content:
+    """Load all content; with `event_chunks`, events come from the phase
+    chunks written by event_chunks.py and later phases load on first use."""
+    if event_chunks is None:
+        return Content.from_lists(load_constants(), load_weapons(), load_agents(), load_events(), load_datacenters())
+    return Content(
+        constants=load_constants(),
+        weapons={item["id"]: item for item in load_weapons()},
+        agents={item["id"]: item for item in load_agents()},
+        events=PhasedEvents(event_chunks),
+        datacenters={item["id"]: item for item in load_datacenters()},
+    )
+
+
+def new_game(content: Content, seed: int = 0) -> dict:
+    constants = content.constants
+    state = {
+        "version": content.version,
+        "seed": seed,
+        "tick": 0,
+        "funds": float(constants["startingFunds"]),
+        "publicSupport": float(constants["startingPublicSupport"]),
+        "heat": float(constants["startingHeat"]),
+        "agiProgress": float(constants["startingAgiProgress"]),
+        "agiRate": 0.0,
+        "datacenters": {
+            dc_id: {
+                "id": dc_id,
+                "health": float(dc["healthMax"]),
+                "status": "intact",
+                "defense": float(dc.get("defense") or 0),
+            }
+            for dc_id, dc in content.datacenters.items()
+        },
+        "inventory": {},
+        "seenEvents": {},
+        "activeTimers": [],
+        "pendingEvents": [],
+    }
+    state["agiRate"] = agi_rate(state, content)
+    arm_timer_triggers(state, content)
+    enqueue_triggered(state, content, random.Random(seed), "onStart")
+    return state
+
+
+def agi_rate(state: dict, content: Content) -> float:
+    if content.total_agi_impact <= 0:
+        intact_share = 1.0
+    else:
+        destroyed = sum(
+            float(row.get("agiImpact", content.datacenters[dc_id].get("agiImpact") or 0))
+            for dc_id, row in state["datacenters"].items()
+            if row["status"] == "destroyed"
+        )
+        intact_share = max(0.0, 1.0 - destroyed / content.total_agi_impact)
+    return derived_agi_rate(content.constants, state["heat"], intact_share)
+
+
+def inventory_count(state: dict, item_id: str) -> float:
+    item = state["inventory"].get(item_id)
+    return item["count"] if item else 0
+
+
+def check_requirement(state: dict, requirement: dict) -> bool:
+    kind = requirement.get("type")
+    key = requirement.get("key")
+    if kind == "global":
+        actual = state.get(key, 0)
+    elif kind == "inventory":
+        actual = inventory_count(state, key)
+    elif kind == "datacenter":
+        row = state["datacenters"].get(requirement.get("datacenterId"))
+        if row is None:
+            return False
+        actual = row.get(key)
+    else:
+        raise ValueError(f"unknown requirement type {kind!r}")
+    return compare(requirement.get("cmp", "gte"), actual, requirement.get("value"))
+
+
+def requirements_met(state: dict, requirements: list[dict] | None) -> bool:
+    return all(check_requirement(state, requirement) for requirement in requirements or [])
+
+
+def set_health(state: dict, content: Content, dc_id: str, health: float) -> bool:
+    """Update a datacenter's health and status; returns True if it was just destroyed."""
+    row = state["datacenters"][dc_id]
+    if row["status"] == "destroyed":
+        return False
+    health_max = float(content.datacenters[dc_id]["healthMax"])
+    row["health"] = clamp(health, 0.0, health_max)
+    if row["health"] <= 0:
+        row["status"] = "destroyed"
+        state["agiProgress"] = clamp(
+            state["agiProgress"] - float(content.constants["destroyedDcAgiPenalty"]), *GLOBAL_BOUNDS["agiProgress"]
+        )
+        return True
+    row["status"] = "damaged" if row["health"] < health_max else "intact"
+    return False
+
+
+def apply_effect(state: dict, content: Content, effect: dict, heat_scale: float = 1.0) -> list[str]:
+    """Apply one declarative effect; returns ids of datacenters it destroyed."""
+    target = effect.get("target") or {}
+    kind = target.get("type")
+    key = target.get("key")
+    op = effect.get("op", "add")
+    value = float(effect.get("value", 0))
+    destroyed: list[str] = []
+    if kind == "global":
+        if key == "heat" and op == "add" and value > 0:
+            value *= heat_scale
+        state[key] = clamp(apply_op(op, state.get(key, 0.0), value), *GLOBAL_BOUNDS.get(key, (float("-inf"), float("inf"))))
+    elif kind == "inventory":
+        item = state["inventory"].setdefault(key, {"id": key, "count": 0})
+        item["count"] = max(0, int(apply_op(op, item["count"], value)))
+    elif kind in ("datacenter", "datacenters"):
+        ids = [target.get("id")] if kind == "datacenter" else list(state["datacenters"])
+        for dc_id in ids:
+            row = state["datacenters"].get(dc_id)
+            if row is None or row["status"] == "destroyed":
+                continue
+            if key == "health":
+                if set_health(state, content, dc_id, apply_op(op, row["health"], value)):
+                    destroyed.append(dc_id)
+            elif key == "defense":
+                row["defense"] = clamp(apply_op(op, row["defense"], value), 0.0, 1.0)
+            elif key == "agiImpact":
+                base = float(row.get("agiImpact", content.datacenters[dc_id].get("agiImpact") or 0))
+                row["agiImpact"] = max(0.0, apply_op(op, base, value))
+    else:
+        raise ValueError(f"unknown effect target type {kind!r}")
+    return destroyed
+
+
+def weapon_ready(state: dict, weapon: dict) -> bool:
+    item = state["inventory"].get(weapon["id"])
+    if item and item.get("cooldownUntilTick", 0) > state["tick"]:
+        return False
+    if not (item and item["count"] > 0) and state["funds"] < float(weapon.get("cost") or 0):
+        return False
+    return requirements_met(state, weapon.get("requires"))
+
+
+def attack_datacenter(state: dict, content: Content, payload: dict, rng: random.Random) -> dict:
+    dc_id = payload.get("datacenterId")
+    weapon_id = payload.get("weaponId")
+    agent_id = payload.get("agentId")
+    weapon = content.weapons.get(weapon_id)
+    if weapon is None:
+        raise ActionError(f"unknown weapon {weapon_id!r}")
+    row = state["datacenters"].get(dc_id)
+    if row is None:
+        raise ActionError(f"unknown datacenter {dc_id!r}")
+    if row["status"] == "destroyed":
+        raise ActionError(f"{dc_id} is already destroyed")
+    if not requirements_met(state, weapon.get("requires")):
+        raise ActionError(f"requirements for {weapon_id} are not met")
+    item = state["inventory"].get(weapon_id)
+    if item and item.get("cooldownUntilTick", 0) > state["tick"]:
+        raise ActionError(f"{weapon_id} is cooling down until tick {item['cooldownUntilTick']}")
+    owned = bool(item and item["count"] > 0)
+    cost = float(weapon.get("cost") or 0)
+    if not owned and state["funds"] < cost:
+        raise ActionError(f"cannot afford {weapon_id} ({cost:g} funds)")
+    if agent_id is not None and inventory_count(state, agent_id) < 1:
+        raise ActionError(f"agent {agent_id!r} is not in the inventory")
+
+    # Every check has passed; only now touch the state.
+    if not owned:
+        state["funds"] -= cost
+        item = state["inventory"].setdefault(weapon_id, {"id": weapon_id, "count": 0})
+        item["count"] += 1
+
+    item["cooldownUntilTick"] = state["tick"] + int(weapon.get("cooldownTicks") or 0)
+    result = {"datacenterId": dc_id, "weaponId": weapon_id, "damage": 0.0, "destroyed": [], "captured": False}
+    success = True
+    if agent_id is not None:
+        agent = content.agents.get(agent_id) or {}
+        success = rng.random() < float(agent.get("successRate", 1.0))
+        if rng.random() < float(agent.get("risk", 0.0)):
+            state["inventory"][agent_id]["count"] -= 1
+            result["captured"] = True
+    if success:
+        variance = weapon.get("variance")
+        if variance is None:
+            variance = content.constants["randomVarianceDefault"]
+        raw = float(weapon["damage"]) * (1 + rng.uniform(-float(variance), float(variance)))
+        damage = raw * damage_multiplier(content.constants, row["defense"])
+        result["damage"] = damage
+        if set_health(state, content, dc_id, row["health"] - damage):
+            result["destroyed"].append(dc_id)
+    heat_scale = 1.0 - float(weapon.get("stealth") or 0)
+    for effect in weapon.get("effects") or []:
+        result["destroyed"].extend(apply_effect(state, content, effect, heat_scale))
+    if result["damage"] > 0:
+        enqueue_triggered(state, content, rng, "onDamage", dc_id)
+    for destroyed_id in result["destroyed"]:
+        enqueue_triggered(state, content, rng, "onDestroy", destroyed_id)
+    return result
+
+
+def trigger_fires(state: dict, trigger: dict, rng: random.Random, when: str, dc_id: str | None) -> bool:
+    if trigger.get("when") != when:
+        return False
+    if trigger.get("datacenterId") is not None and trigger["datacenterId"] != dc_id:
+        return False
+    return trigger_rolls(state, trigger, rng)
+
+
+def trigger_rolls(state: dict, trigger: dict, rng: random.Random) -> bool:
+    if not requirements_met(state, trigger.get("requires")):
+        return False
+    chance = trigger.get("chance")
+    return chance is None or rng.random() < float(chance)
+
+
+def enqueue_event(state: dict, content: Content, event_id: str) -> bool:
+    event = content.event_headers.get(event_id)
+    if event is None or event_id in state["pendingEvents"]:
+        return False
+    if event.get("oneTime", True) and state["seenEvents"].get(event_id):
+        return False
+    state["pendingEvents"].append(event_id)
+    return True
+
+
+def enqueue_triggered(
+    state: dict, content: Content, rng: random.Random, when: str, dc_id: str | None = None
+) -> list[str]:
+    fired = []
+    for event_id, event in content.event_headers.items():
+        if event_id in state["pendingEvents"]:
+            continue
+        if event.get("oneTime", True) and state["seenEvents"].get(event_id):
+            continue
+        if any(trigger_fires(state, trigger, rng, when, dc_id) for trigger in event.get("triggers") or []):
+            if enqueue_event(state, content, event_id):
+                fired.append(event_id)
+    return fired
+
+
+def schedule_timer(state: dict, event_id: str, after_ticks: int, payload: object = None) -> None:
+    """Queue `event_id` to be enqueued `after_ticks` from now (activeTimers is a heap, see timers.py)."""
+    push_timer(state["activeTimers"], make_timer(event_id, state["tick"] + int(after_ticks), payload))
+
+
+def cancel_event_timers(state: dict, content: Content, event_id: str) -> int:
+    """Drop the plain timer and the onTimer trigger entries pending for
+    `event_id` (each keyed by timers.timer_key); returns how many went."""
+    event = content.event_headers.get(event_id) or {}
+    keys = [None] + [idx for idx, trigger in enumerate(event.get("triggers") or []) if trigger.get("when") == "onTimer"]
+    return sum(cancel_timer(state["activeTimers"], event_id, trigger) for trigger in keys)
+
+
+def timer_triggers(content: Content) -> list[tuple[str, int, dict]]:
+    return [
+        (event_id, idx, trigger)
+        for event_id, event in content.event_headers.items()
+        for idx, trigger in enumerate(event.get("triggers") or [])
+        if trigger.get("when") == "onTimer"
+    ]
+
+
+def arm_timer_triggers(state: dict, content: Content) -> None:
+    """Put every onTimer trigger on the timer heap, due `afterTicks` after the
+    start, skipping triggers a (loaded) state already holds a timer for."""
+    armed = {
+        (timer["id"], timer["payload"]["trigger"])
+        for timer in state["activeTimers"]
+        if isinstance(timer.get("payload"), dict) and "trigger" in timer["payload"]
+    }
+    for event_id, idx, trigger in timer_triggers(content):
+        if (event_id, idx) in armed:
+            continue
+        if content.event_headers[event_id].get("oneTime", True) and state["seenEvents"].get(event_id):
+            continue
+        resume = max(int(trigger.get("afterTicks") or 0), state["tick"] + 1)
+        push_timer(state["activeTimers"], make_timer(event_id, resume, {"trigger": idx}))
+
+
+def fire_timer(state: dict, content: Content, rng: random.Random, timer: dict) -> bool:
+    """Handle one due timer; returns True if it queued its event.
+
+    A plain timer (schedule_timer) just enqueues its event. An onTimer
+    trigger rolls its requires/chance; while it has not fired (or its event
+    is still pending) it is re-checked next tick, and once it fires it is
+    re-armed `afterTicks` later unless its event is oneTime.
+    """
+    payload = timer.get("payload")
+    if not (isinstance(payload, dict) and "trigger" in payload):
+        return enqueue_event(state, content, timer["id"])
+    event_id = timer["id"]
+    event = content.event_headers.get(event_id)
+    triggers = (event or {}).get("triggers") or []
+    idx = payload["trigger"]
+    if event is None or idx >= len(triggers) or triggers[idx].get("when") != "onTimer":
+        return False  # the content changed under a loaded save
+    one_time = event.get("oneTime", True)
+    if one_time and state["seenEvents"].get(event_id):
+        return False
+    fired = False
+    if event_id not in state["pendingEvents"] and trigger_rolls(state, triggers[idx], rng):
+        fired = enqueue_event(state, content, event_id)
+    if fired and one_time:
+        return True
+    delay = max(1, int(triggers[idx].get("afterTicks") or 0)) if fired else 1
+    push_timer(state["activeTimers"], make_timer(event_id, state["tick"] + delay, payload))
+    return fired
+
+
+def resolve_tick(state: dict, content: Content, rng: random.Random) -> list[str]:
+    """Advance one tick and return the ids of newly queued events.
+
+    Progress is applied with the rate carried into the tick (so `agiRate`
+    effects from the previous tick count once), then the rate is re-derived.
+    onTimer triggers live on the activeTimers heap (arm_timer_triggers), so
+    only due ones are looked at.
+    """
+    state["tick"] += 1
+    state["agiProgress"] = clamp(state["agiProgress"] + state["agiRate"], *GLOBAL_BOUNDS["agiProgress"])
+    state["agiRate"] = agi_rate(state, content)
+    fired = []
+    for timer in pop_due(state["activeTimers"], state["tick"]):
+        if fire_timer(state, content, rng, timer):
+            fired.append(timer["id"])
+    fired.extend(enqueue_triggered(state, content, rng, "onTick"))
+    return fired
+
+
+def choose_event_option(state: dict, content: Content, event_id: str, choice_id: str) -> dict:
+    if event_id not in state["pendingEvents"]:
+        raise ActionError(f"event {event_id!r} is not pending")
+    choice = next((c for c in content.events[event_id].get("choices") or [] if c["id"] == choice_id), None)
+    if choice is None:
+        raise ActionError(f"event {event_id!r} has no choice {choice_id!r}")
+    if not requirements_met(state, choice.get("requires")):
+        raise ActionError(f"requirements for {choice_id} are not met")
+    destroyed: list[str] = []
+    for effect in choice.get("effects") or []:
+        destroyed.extend(apply_effect(state, content, effect))
+    state["pendingEvents"].remove(event_id)
+    state["seenEvents"][event_id] = True
+    if content.event_headers[event_id].get("oneTime", True):
+        cancel_event_timers(state, content, event_id)  # they could never fire again
+    followup = choice.get("followupEventId")
+    if followup:
+        enqueue_event(state, content, followup)
+    return {"eventId": event_id, "choiceId": choice_id, "destroyed": destroyed}
+
+
+def outcome(state: dict) -> str | None:
+    if state["agiProgress"] >= 100:
+        return "lost"
+    if all(row["status"] == "destroyed" for row in state["datacenters"].values()):
+        return "won"
+    return None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Split events.json into per-phase chunks behind a small trigger manifest.
+
+build/events/manifest.json keeps what trigger evaluation needs for every
+event (id, phase, priority, oneTime, triggers), the shared
+imagePromptTemplate, and one chunk name per phase; events.<phase>.json holds
+the full bodies, choices and imagePrompt subjects.
+A client (or `PhasedEvents` here) loads the manifest and the early chunk up
+front and fetches a later chunk the first time one of its events is needed.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from build_output import BUILD_DIR, write_compressed
+from content_loader import EVENTS_PATH, load_json
+from image_prompts import expand_item, factor_item, template_parts
+
+CHUNKS_DIR = BUILD_DIR / "events"
+MANIFEST_NAME = "manifest.json"
+HEADER_KEYS = ("id", "phase", "priority", "oneTime", "triggers")
+EAGER_PHASES = ("early",)
+
+
+def minify(value: object) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def split_events(doc: dict) -> tuple[dict, dict[str, list[dict]]]:
+    template = (doc.get("style") or {}).get("imagePromptTemplate", "")
+    parts = template_parts(template)
+    chunks: dict[str, list[dict]] = {}
+    headers = []
+    for event in doc.get("events") or []:
+        phase = event.get("phase") or EAGER_PHASES[0]
+        headers.append({key: event[key] for key in HEADER_KEYS if key in event})
+        event = dict(event)
+        if parts is not None:
+            factor_item(event, parts)
+        chunks.setdefault(phase, []).append(event)
+    manifest = {
+        "version": doc.get("version"),
+        "imagePromptTemplate": template,
+        "eager": [phase for phase in EAGER_PHASES if phase in chunks],
+        "chunks": {phase: f"events.{phase}.json" for phase in chunks},
+        "events": headers,
+    }
+    return manifest, chunks
+
+
+def write_chunks(doc: dict, out_dir: Path = CHUNKS_DIR) -> list[Path]:
+    manifest, chunks = split_events(doc)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = [out_dir / MANIFEST_NAME]
+    written[0].write_text(minify(manifest), encoding="utf-8")
+    for phase, events in chunks.items():
+        path = out_dir / manifest["chunks"][phase]
+        path.write_text(minify({"version": doc.get("version"), "phase": phase, "events": events}), encoding="utf-8")
+        written.append(path)
+    for path in written:
+        write_compressed(path)
+    return written
+
+
+class PhasedEvents(Mapping):
+    """Read-only id -> event mapping that loads phase chunks on first access.
+
+    `headers` is always complete, so iterating triggers never touches a
+    chunk; indexing an event loads its phase if it has not been loaded yet.
+    """
+
+    def __init__(self, directory: Path = CHUNKS_DIR) -> None:
+        self.directory = directory
+        manifest = load_json(directory / MANIFEST_NAME)
+        self.chunks: dict[str, str] = manifest["chunks"]
+        self.template: str = manifest.get("imagePromptTemplate", "")
+        self.headers: dict[str, dict] = {header["id"]: header for header in manifest["events"]}
+        self.loaded_phases: set[str] = set()
+        self._events: dict[str, dict] = {}
+        for phase in manifest.get("eager") or []:
+            self.load_phase(phase)
+
+    def load_phase(self, phase: str) -> None:
+        if phase in self.loaded_phases:
+            return
+        for event in load_json(self.directory / self.chunks[phase]).get("events") or []:
+            expand_item(event, self.template)
+            self._events[event["id"]] = event
+        self.loaded_phases.add(phase)
+
+    def __getitem__(self, event_id: str) -> dict:
+        event = self._events.get(event_id)
+        if event is None:
+            self.load_phase(self.headers[event_id].get("phase") or EAGER_PHASES[0])
+            event = self._events[event_id]
+        return event
+
+    def __contains__(self, event_id: object) -> bool:
+        return event_id in self.headers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.headers)
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+
+def main() -> None:
+    doc = load_json(EVENTS_PATH)
+    written = write_chunks(doc)
+    manifest = load_json(written[0])
+    initial = [written[0]] + [CHUNKS_DIR / manifest["chunks"][phase] for phase in manifest["eager"]]
+    initial_size = sum(path.stat().st_size for path in initial)
+    full_size = len(minify(doc).encode())
+    for path in written:
+        print(f"{path.name:24s} {path.stat().st_size:9,d} B")
+    print(f"OK: Initial load {initial_size:,d} B vs {full_size:,d} B for minified events.json ({initial_size / full_size:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Expected damage and uses-to-destroy for every weapon x datacenter pair.
+
+Expected damage is `weapon.damage * (1 - defense * damageDefenseFactor)` (the
+`1 ± variance` roll is uniform, so it only widens the band). The matrix is the
+outer product of a weapon vector and a datacenter vector, so both are kept as
+flat arrays and rows/columns are expanded on demand. Defense and health changes
+only touch the datacenter vector.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator
+
+from content_loader import load_constants, load_datacenters, load_weapons
+from engine import apply_op, clamp
+
+EPSILON = 1e-9
+
+
+def uses_for(effective_health: float, damage: float) -> float:
+    if effective_health <= 0:
+        return 0.0
+    if damage <= 0 or math.isinf(effective_health):
+        return math.inf
+    return float(math.ceil(effective_health / damage - EPSILON))
+
+
+class ExpectedDamageMatrix:
+    def __init__(self, weapons: list[dict], datacenters: list[dict], constants: dict) -> None:
+        self.defense_factor = float(constants.get("damageDefenseFactor", 0.0))
+        default_variance = float(constants.get("randomVarianceDefault", 0.0))
+
+        self.weapon_ids = [weapon["id"] for weapon in weapons]
+        self.weapon_index = {weapon_id: idx for idx, weapon_id in enumerate(self.weapon_ids)}
+        self.damage = array("d", (float(weapon.get("damage") or 0) for weapon in weapons))
+        self.variance = array("d", (
+            float(weapon["variance"]) if weapon.get("variance") is not None else default_variance
+            for weapon in weapons
+        ))
+
+        self.datacenter_ids = [dc["id"] for dc in datacenters]
+        self.datacenter_index = {dc_id: idx for idx, dc_id in enumerate(self.datacenter_ids)}
+        self.health = array("d", (float(dc.get("healthMax") or 0) for dc in datacenters))
+        self.defense = array("d", (clamp(float(dc.get("defense") or 0), 0.0, 1.0) for dc in datacenters))
+        self.multiplier = array("d", bytes(8 * len(datacenters)))
+        self.effective_health = array("d", bytes(8 * len(datacenters)))
+        for idx in range(len(datacenters)):
+            self._refresh(idx)
+
+    def _refresh(self, idx: int) -> None:
+        multiplier = 1.0 - self.defense[idx] * self.defense_factor
+        self.multiplier[idx] = multiplier
+        if self.health[idx] <= 0:
+            self.effective_health[idx] = 0.0
+        elif multiplier <= 0:
+            self.effective_health[idx] = math.inf
+        else:
+            self.effective_health[idx] = self.health[idx] / multiplier
+
+    def apply_effect(self, effect: dict) -> bool:
+        """Apply a `defense`/`health` effect; returns False for unrelated effects."""
+        target = effect.get("target") or {}
+        key = target.get("key")
+        if key not in ("defense", "health"):
+            return False
+        if target.get("type") == "datacenters":
+            indices: range | list[int] = range(len(self.datacenter_ids))
+        elif target.get("type") == "datacenter" and target.get("id") in self.datacenter_index:
+            indices = [self.datacenter_index[target["id"]]]
+        else:
+            return False
+        op = effect.get("op", "add")
+        value = float(effect.get("value", 0))
+        column = self.defense if key == "defense" else self.health
+        for idx in indices:
+            updated = apply_op(op, column[idx], value)
+            column[idx] = clamp(updated, 0.0, 1.0) if key == "defense" else max(0.0, updated)
+            self._refresh(idx)
+        return True
+
+    def set_health(self, datacenter_id: str, health: float) -> None:
+        idx = self.datacenter_index[datacenter_id]
+        self.health[idx] = max(0.0, health)
+        self._refresh(idx)
+
+    def expected_damage(self, weapon_id: str, datacenter_id: str) -> float:
+        return self.damage[self.weapon_index[weapon_id]] * self.multiplier[self.datacenter_index[datacenter_id]]
+
+    def cell(self, weapon_id: str, datacenter_id: str) -> dict[str, float]:
+        w = self.weapon_index[weapon_id]
+        d = self.datacenter_index[datacenter_id]
+        damage, variance = self.damage[w], self.variance[w]
+        multiplier, effective_health = self.multiplier[d], self.effective_health[d]
+        return {
+            "expectedDamage": damage * multiplier,
+            "damageLow": damage * (1 - variance) * multiplier,
+            "damageHigh": damage * (1 + variance) * multiplier,
+            "expectedUses": uses_for(effective_health, damage),
+            "usesBest": uses_for(effective_health, damage * (1 + variance)),
+            "usesWorst": uses_for(effective_health, damage * (1 - variance)),
+        }
+
+    def row(self, weapon_id: str) -> dict[str, array]:
+        w = self.weapon_index[weapon_id]
+        return self._row(self.damage[w], self.variance[w])
+
+    def _row(self, damage: float, variance: float) -> dict[str, array]:
+        low, high = damage * (1 - variance), damage * (1 + variance)
+        multipliers, effective = self.multiplier, self.effective_health
+        return {
+            "expectedDamage": array("d", [damage * m for m in multipliers]),
+            "damageLow": array("d", [low * m for m in multipliers]),
+            "damageHigh": array("d", [high * m for m in multipliers]),
+            "expectedUses": array("d", [uses_for(h, damage) for h in effective]),
+            "usesBest": array("d", [uses_for(h, high) for h in effective]),
+            "usesWorst": array("d", [uses_for(h, low) for h in effective]),
+        }
+
+    def column(self, datacenter_id: str) -> dict[str, array]:
+        d = self.datacenter_index[datacenter_id]
+        multiplier, effective_health = self.multiplier[d], self.effective_health[d]
+        pairs = list(zip(self.damage, self.variance))
+        return {
+            "expectedDamage": array("d", [dmg * multiplier for dmg, _ in pairs]),
+            "damageLow": array("d", [dmg * (1 - var) * multiplier for dmg, var in pairs]),
+            "damageHigh": array("d", [dmg * (1 + var) * multiplier for dmg, var in pairs]),
+            "expectedUses": array("d", [uses_for(effective_health, dmg) for dmg, _ in pairs]),
+            "usesBest": array("d", [uses_for(effective_health, dmg * (1 + var)) for dmg, var in pairs]),
+            "usesWorst": array("d", [uses_for(effective_health, dmg * (1 - var)) for dmg, var in pairs]),
+        }
+
+    def iter_rows(self) -> Iterator[tuple[str, dict[str, array]]]:
+        """Stream the matrices one weapon row at a time (for maps too large to hold)."""
+        for weapon_id, damage, variance in zip(self.weapon_ids, self.damage, self.variance):
+            yield weapon_id, self._row(damage, variance)
+
+    def compute(self) -> dict[str, list[array]]:
+        """Materialize every matrix at once, indexed [weapon][datacenter]."""
+        result: dict[str, list[array]] = {}
+        for _, row in self.iter_rows():
+            for key, values in row.items():
+                result.setdefault(key, []).append(values)
+        return result
+
+
+def load_matrix() -> ExpectedDamageMatrix:
+    return ExpectedDamageMatrix(load_weapons(), load_datacenters(), load_constants())
+
+
+def format_uses(value: float) -> str:
+    return "inf" if math.isinf(value) else str(int(value))
+
+
+def print_ranking(ids: list[str], values: dict[str, array], top: int) -> None:
+    order = sorted(range(len(ids)), key=lambda idx: (values["expectedUses"][idx], -values["expectedDamage"][idx]))
+    for idx in order[:top]:
+        print(
+            f"{ids[idx]:40s} dmg {values['expectedDamage'][idx]:6.2f}"
+            f" [{values['damageLow'][idx]:6.2f}-{values['damageHigh'][idx]:6.2f}]"
+            f" uses {format_uses(values['expectedUses'][idx])}"
+            f" [{format_uses(values['usesBest'][idx])}-{format_uses(values['usesWorst'][idx])}]"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Expected damage matrix for weapons x datacenters.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--datacenter", "-d", help="Rank weapons against one datacenter (side panel view).")
+    group.add_argument("--weapon", "-w", help="Rank datacenters for one weapon.")
+    group.add_argument("--output", "-o", type=Path, help="Write the full matrices as JSON.")
+    parser.add_argument("--top", type=int, default=10, help="How many rows to print (default 10).")
+    args = parser.parse_args()
+
+    matrix = load_matrix()
+    if args.datacenter:
+        if args.datacenter not in matrix.datacenter_index:
+            print(f"ERROR: Unknown datacenter {args.datacenter!r}.")
+            sys.exit(1)
+        print_ranking(matrix.weapon_ids, matrix.column(args.datacenter), args.top)
+    elif args.weapon:
+        if args.weapon not in matrix.weapon_index:
+            print(f"ERROR: Unknown weapon {args.weapon!r}.")
+            sys.exit(1)
+        print_ranking(matrix.datacenter_ids, matrix.row(args.weapon), args.top)
+    else:
+        payload = {
+            "weapons": matrix.weapon_ids,
+            "datacenters": matrix.datacenter_ids,
+            "matrices": {
+                key: [[None if math.isinf(v) else round(v, 4) for v in row] for row in rows]
+                for key, rows in matrix.compute().items()
+            },
+        }
+        args.output.write_text(json.dumps(payload, separators=(",", ":")) + "\n", encoding="utf-8")
+        print(f"OK: wrote {len(matrix.weapon_ids)}x{len(matrix.datacenter_ids)} matrices to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
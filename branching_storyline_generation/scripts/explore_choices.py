@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Enumerate every choice path through an event sequence, merging equivalent states.
+
+Given the events a player meets, in order (`--events`, or the order a seeded
+autoplay game queued them), the explorer answers each with every legal
+choice through the real `choose_event_option`, forking states with
+state_fork.py, and merges states in a transposition table keyed by what can
+still matter. Choice effects are additive per target
+(build_events.phase_effects), so different orders of the same picks land on
+the same key. Each metric is searched on its own, keyed by its own value plus
+whatever the remaining choices' requirements read: a layer then holds at most
+one node per reachable value of that metric, and depth costs grow linearly
+instead of like 3^depth (or like the joint range of every metric). Ticks are
+not resolved between events; this maps what the choices alone can reach.
+
+For each depth it reports the min..max envelope of each metric and how many
+choice paths were folded into it, and for the final depth the choice path
+that reaches each extreme.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from itertools import repeat
+from pathlib import Path
+
+from autoplay import play
+from engine import ActionError, Content, choose_event_option, load_content, new_game, requirements_met
+from state_fork import cow_state, fork_state
+
+GLOBALS = ("agiProgress", "publicSupport", "heat", "funds")
+METRICS = (*GLOBALS, "defense", "itemsUnlocked")
+
+
+class Node:
+    __slots__ = ("state", "parent", "choice_id", "paths")
+
+    def __init__(self, state: dict, parent: Node | None = None, choice_id: str | None = None) -> None:
+        self.state = state
+        self.parent = parent
+        self.choice_id = choice_id
+        self.paths = parent.paths if parent is not None else 1  # choice paths merged into this node
+
+    def path(self) -> list[str]:
+        choices = []
+        node: Node | None = self
+        while node is not None and node.choice_id is not None:
+            choices.append(node.choice_id)
+            node = node.parent
+        return choices[::-1]
+
+
+def metrics(state: dict) -> dict[str, float]:
+    defenses = [row["defense"] for row in state["datacenters"].values() if row["status"] != "destroyed"]
+    values = {key: state[key] for key in GLOBALS}
+    values["defense"] = sum(defenses) / len(defenses) if defenses else 0.0
+    values["itemsUnlocked"] = sum(1 for item in state["inventory"].values() if item["count"] > 0)
+    return values
+
+
+def horizons(content: Content, sequence: list[str]) -> list[tuple]:
+    """Per depth, what the rest of the sequence can still observe: the globals,
+    inventory items and datacenter fields its choice requirements read, plus
+    the inventory items its effects change. Entry d covers sequence[d:]."""
+    out = []
+    reads: set[tuple] = set()
+    for event_id in reversed(sequence):
+        for choice in content.events[event_id].get("choices") or []:
+            for requirement in choice.get("requires") or []:
+                reads.add((requirement.get("type"), requirement.get("datacenterId"), requirement.get("key")))
+            for effect in choice.get("effects") or []:
+                target = effect.get("target") or {}
+                if target.get("type") == "inventory":
+                    reads.add(("inventory", None, target.get("key")))
+        out.append(tuple(sorted(reads, key=repr)))
+    return [*reversed(out), ()]
+
+
+def observed(state: dict, horizon: tuple) -> tuple:
+    values = []
+    for kind, dc_id, key in horizon:
+        if kind == "global":
+            values.append(round(state.get(key, 0), 6))
+        elif kind == "inventory":
+            item = state["inventory"].get(key)
+            values.append(item["count"] if item else 0)
+        else:
+            row = state["datacenters"].get(dc_id)
+            values.append(row.get(key) if row else None)
+    return tuple(values)
+
+
+def projection(state: dict, metric: str, health: bool) -> tuple:
+    """The part of a state that decides `metric` from here on (see explore())."""
+    datacenters = state["datacenters"]
+    if metric == "defense":
+        value: object = tuple(map(round, [row["defense"] for row in datacenters.values()], repeat(6)))
+    elif metric == "itemsUnlocked":
+        value = sum(1 for item in state["inventory"].values() if item["count"] > 0)
+    else:
+        value = round(state[metric], 6)
+    if health:
+        # Health effects destroy datacenters, which moves agiProgress and the defense mean.
+        return value, tuple(map(round, [row["health"] for row in datacenters.values()], repeat(6)))
+    return (value,)
+
+
+def game_sequence(content: Content, seed: int) -> list[str]:
+    """Events in the order autoplay game `seed` answered (then queued) them."""
+    final: dict = {}
+    play(content, seed, on_tick=lambda state: final.__setitem__("state", state))
+    state = final["state"]
+    return [*state["seenEvents"], *(event_id for event_id in state["pendingEvents"] if event_id not in state["seenEvents"])]
+
+
+def explore(
+    content: Content, root_state: dict, sequence: list[str]
+) -> tuple[list[dict], dict[str, tuple[Node, Node]]]:
+    """Per-depth stats and, for the last layer, the (min, max) node of each metric.
+
+    Each metric gets its own search whose transposition key is that metric's
+    projection plus everything the remaining choices can observe. Effects on
+    one global never read another, so two states with the same key have the
+    same reachable futures for that metric, and the layers stay as small as
+    the metric's range instead of the joint state space.
+    """
+    ahead = horizons(content, sequence)
+    health = any(
+        (effect.get("target") or {}).get("type") in ("datacenter", "datacenters")
+        and (effect.get("target") or {}).get("key") == "health"
+        for event_id in sequence
+        for choice in content.events[event_id].get("choices") or []
+        for effect in choice.get("effects") or []
+    )
+    depths = [
+        {"eventId": event_id, "edges": 0, "paths": 0, "states": 0, "envelope": {}}
+        for event_id in sequence
+    ]
+    extremes: dict[str, tuple[Node, Node]] = {}
+    reached = len(sequence)
+    for metric in METRICS:
+        layer = [Node(cow_state(root_state))]
+        for depth, event_id in enumerate(sequence):
+            choices = content.events[event_id].get("choices") or []
+            following: dict[tuple, Node] = {}
+            for node in layer:
+                for choice in choices:
+                    if not requirements_met(node.state, choice.get("requires")):
+                        continue
+                    state = fork_state(node.state)
+                    if event_id not in state["pendingEvents"]:
+                        state["pendingEvents"].append(event_id)
+                    try:
+                        choose_event_option(state, content, event_id, choice["id"])
+                    except ActionError:
+                        continue
+                    depths[depth]["edges"] += 1
+                    key = (projection(state, metric, health), observed(state, ahead[depth + 1]))
+                    merged = following.get(key)
+                    if merged is None:
+                        following[key] = Node(state, node, choice["id"])
+                    else:
+                        merged.paths += node.paths
+            if not following:
+                reached = min(reached, depth)
+                break
+            layer = list(following.values())
+            values = [metrics(node.state)[metric] for node in layer]
+            row = depths[depth]
+            row["paths"] = sum(node.paths for node in layer)
+            row["states"] += len(layer)
+            row["envelope"][metric] = [min(values), max(values)]
+        values = [metrics(node.state)[metric] for node in layer]
+        extremes[metric] = (layer[values.index(min(values))], layer[values.index(max(values))])
+    return depths[:reached], extremes
+
+
+def describe(path: list[str]) -> str:
+    """Choice kinds with repeats folded, e.g. `broadcast x10, stealth x2`."""
+    runs: list[list] = []
+    for choice_id in path:
+        kind = choice_id.rsplit("-", 1)[-1]
+        if runs and runs[-1][0] == kind:
+            runs[-1][1] += 1
+        else:
+            runs.append([kind, 1])
+    return ", ".join(kind if count == 1 else f"{kind} x{count}" for kind, count in runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Enumerate choice outcomes over an event sequence with state merging.")
+    parser.add_argument("--events", help="Comma-separated event ids, in order (default: the order of autoplay game --seed).")
+    parser.add_argument("--seed", type=int, default=0, help="Autoplay game whose event order to explore (default 0).")
+    parser.add_argument("--depth", "-d", type=int, default=12, help="Events to explore (default 12).")
+    parser.add_argument("--output", "-o", type=Path, help="Write per-depth envelopes and extreme paths as JSON.")
+    args = parser.parse_args()
+    if args.depth <= 0:
+        print("ERROR: --depth must be positive.")
+        sys.exit(1)
+
+    content = load_content()
+    if args.events:
+        sequence = [event_id.strip() for event_id in args.events.split(",") if event_id.strip()]
+        unknown = [event_id for event_id in sequence if event_id not in content.events]
+        if unknown:
+            print(f"ERROR: Unknown event(s): {', '.join(unknown)}.")
+            sys.exit(1)
+    else:
+        sequence = game_sequence(content, args.seed)
+    sequence = list(dict.fromkeys(sequence))[: args.depth]
+
+    started = time.perf_counter()
+    depths, extremes = explore(content, new_game(content, args.seed), sequence)
+    elapsed = time.perf_counter() - started
+
+    print(f"{'depth':>5s} {'paths':>10s} {'states':>7s}  " + "  ".join(f"{key:>17s}" for key in METRICS))
+    for depth, row in enumerate(depths, 1):
+        ranges = "  ".join(f"{low:8.2f}..{high:<7.2f}" for low, high in row["envelope"].values())
+        print(f"{depth:5d} {row['paths']:10.3g} {row['states']:7d}  {ranges}")
+    for key, (low, high) in extremes.items():
+        print(f"{key:14s} min {metrics(low.state)[key]:8.2f} via {describe(low.path())}")
+        print(f"{'':14s} max {metrics(high.state)[key]:8.2f} via {describe(high.path())}")
+    if args.output:
+        report = {
+            "events": sequence[: len(depths)],
+            "depths": depths,
+            "extremes": {
+                key: {
+                    "min": {"value": metrics(low.state)[key], "choices": low.path()},
+                    "max": {"value": metrics(high.state)[key], "choices": high.path()},
+                }
+                for key, (low, high) in extremes.items()
+            },
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    total = sum(row["states"] for row in depths)
+    print(f"OK: Explored {len(depths)} events ({total} merged states) in {elapsed:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()
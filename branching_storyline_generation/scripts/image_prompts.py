@@ -0,0 +1,86 @@
+"""Factor the shared imagePrompt style template out of content items and back.
+
+Every prompt is `style.imagePromptTemplate` with its `{...}` placeholder
+filled by a short subject. Factored items carry `imagePromptSubject` in
+place of `imagePrompt`; expansion puts the full prompt back in the same key
+position, so factor -> expand round-trips exactly. Prompts that do not fit
+the template are left untouched.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+
+PLACEHOLDER = re.compile(r"\{[^{}]*\}")
+REQUIRED_TOKENS = ("retro futurist", "light cyan", "persimmon", "2025")
+
+
+def template_parts(template: str) -> tuple[str, str] | None:
+    match = PLACEHOLDER.search(template or "")
+    if match is None:
+        return None
+    return template[:match.start()], template[match.end():]
+
+
+def fill(template: str, subject: str) -> str:
+    parts = template_parts(template)
+    if parts is None:
+        raise ValueError(f"imagePromptTemplate has no placeholder: {template!r}")
+    return parts[0] + subject + parts[1]
+
+
+def missing_tokens(template: str) -> list[str]:
+    """Style tokens the template lacks; checked once instead of per item."""
+    return [token for token in REQUIRED_TOKENS if token not in (template or "")]
+
+
+def _swap_key(item: dict, old: str, new: str, value: str) -> None:
+    entries = [(new, value) if key == old else (key, item[key]) for key in item]
+    item.clear()
+    item.update(entries)
+
+
+def factor_item(item: dict, parts: tuple[str, str]) -> bool:
+    prompt = item.get("imagePrompt")
+    prefix, suffix = parts
+    if not isinstance(prompt, str) or len(prompt) < len(prefix) + len(suffix):
+        return False
+    if not (prompt.startswith(prefix) and prompt.endswith(suffix)):
+        return False
+    _swap_key(item, "imagePrompt", "imagePromptSubject", prompt[len(prefix):len(prompt) - len(suffix)])
+    return True
+
+
+def expand_item(item: dict, template: str) -> None:
+    subject = item.get("imagePromptSubject")
+    if isinstance(subject, str):
+        _swap_key(item, "imagePromptSubject", "imagePrompt", fill(template, subject))
+
+
+def _style_and_items(doc: dict) -> tuple[dict, Iterator[dict]]:
+    if doc.get("type") == "FeatureCollection":
+        metadata = doc.get("metadata") or {}
+        features = list(doc.get("features") or [])
+        if isinstance(metadata.get("template"), dict):
+            features.append(metadata["template"])
+        return metadata.get("style") or {}, (feature.get("properties") or {} for feature in features)
+    items: list[dict] = list(doc.get("templates") or [])
+    for key in ("events", "weapons", "agents"):
+        items.extend(doc.get(key) or [])
+    return doc.get("style") or {}, iter(items)
+
+
+def factor_document(doc: dict) -> int:
+    """Factor every item in an events/weapons/agents doc or the GeoJSON in place."""
+    style, items = _style_and_items(doc)
+    parts = template_parts(style.get("imagePromptTemplate", ""))
+    if parts is None:
+        return 0
+    return sum(factor_item(item, parts) for item in items)
+
+
+def expand_document(doc: dict) -> None:
+    style, items = _style_and_items(doc)
+    template = style.get("imagePromptTemplate", "")
+    for item in items:
+        expand_item(item, template)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Typed-array weapon inventory with a ready set, for "what can I use now".
+
+Weapon ids are interned to small integers once per content load. Counts and
+`cooldownUntilTick` live in `array`s indexed by that integer, owned weapons
+that are off cooldown sit in `ready`, and weapons cooling down wait in a
+bucket keyed by the tick they come back. Advancing a tick therefore only
+touches the weapons whose cooldown ends on it, and "what can fire" is the
+ready set (plus each member's `requires`, which depend on globals) rather
+than a pass over the whole inventory.
+
+The index mirrors `state["inventory"]`, which stays the source of truth for
+saves and for the engine. After anything that may change the inventory,
+call `refresh` with the touched ids; `touched_by` lists the weapon ids a
+list of effects can change, so a weapon use or an event choice costs a
+refresh of just those.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from array import array
+
+from engine import Content, load_content, new_game, requirements_met, weapon_ready
+
+
+class InventoryIndex:
+    def __init__(self, content: Content, state: dict | None = None) -> None:
+        self.content = content
+        self.ids = list(content.weapons)
+        self.slot = {weapon_id: idx for idx, weapon_id in enumerate(self.ids)}
+        self.weapons = [content.weapons[weapon_id] for weapon_id in self.ids]
+        self.costs = [float(weapon.get("cost") or 0) for weapon in self.weapons]
+        self.damage = [float(weapon.get("damage") or 0) for weapon in self.weapons]
+        self.counts = array("l", [0] * len(self.ids))
+        self.cooldown_until = array("l", [0] * len(self.ids))
+        # Order each weapon first appeared in the inventory (-1: never), the bot's tie-break.
+        self.acquired = array("l", [-1] * len(self.ids))
+        self.seen = 0
+        self.ready: set[int] = set()
+        self.buckets: dict[int, list[int]] = {}
+        # Unowned weapons cheapest first, for affordable-purchase scans that stop at the first miss.
+        self.by_cost = sorted(range(len(self.ids)), key=lambda idx: self.costs[idx])
+        self.tick = 0
+        if state is not None:
+            self.sync(state)
+
+    def sync(self, state: dict) -> None:
+        """Rebuild everything from `state["inventory"]` (e.g. after loading a save)."""
+        self.tick = state["tick"]
+        self.ready.clear()
+        self.buckets.clear()
+        self.seen = 0
+        for idx in range(len(self.ids)):
+            self.counts[idx] = 0
+            self.cooldown_until[idx] = 0
+            self.acquired[idx] = -1
+        for weapon_id in state["inventory"]:
+            self.refresh(state, weapon_id)
+
+    def refresh(self, state: dict, weapon_id: str) -> None:
+        """Re-read one inventory row; ids that are not weapons are ignored."""
+        idx = self.slot.get(weapon_id)
+        if idx is None:
+            return
+        item = state["inventory"].get(weapon_id) or {}
+        if item and self.acquired[idx] < 0:
+            self.acquired[idx] = self.seen
+            self.seen += 1
+        self.counts[idx] = int(item.get("count") or 0)
+        until = int(item.get("cooldownUntilTick") or 0)
+        self.cooldown_until[idx] = until
+        self.ready.discard(idx)
+        if self.counts[idx] <= 0:
+            return
+        if until > self.tick:
+            # Stale bucket entries are skipped in advance() by re-checking cooldown_until.
+            self.buckets.setdefault(until, []).append(idx)
+        else:
+            self.ready.add(idx)
+
+    def touched_by(self, effects: list[dict] | None) -> list[str]:
+        return [
+            effect["target"]["key"] for effect in effects or []
+            if (effect.get("target") or {}).get("type") == "inventory" and effect["target"].get("key") in self.slot
+        ]
+
+    def advance(self, tick: int) -> None:
+        """Move weapons whose cooldown ended by `tick` into the ready set."""
+        for expiry in range(self.tick + 1, tick + 1):
+            for idx in self.buckets.pop(expiry, ()):
+                if self.cooldown_until[idx] == expiry and self.counts[idx] > 0:
+                    self.ready.add(idx)
+        self.tick = max(self.tick, tick)
+
+    def fire_order(self) -> list[str]:
+        """Weapons off cooldown, hardest hitting first (ties: earliest acquired).
+
+        `requires` is left to the caller, since firing one weapon can change
+        whether the next one's requirements hold."""
+        ranked = sorted(self.ready, key=lambda idx: (-self.damage[idx], self.acquired[idx]))
+        return [self.ids[idx] for idx in ranked]
+
+    def usable(self, state: dict) -> list[str]:
+        """Owned weapons that can fire now (cooldown over, requirements met)."""
+        return [
+            self.ids[idx] for idx in self.ready
+            if requirements_met(state, self.weapons[idx].get("requires"))
+        ]
+
+    def purchasable(self, state: dict) -> list[str]:
+        """Unowned weapons the current funds and requirements allow buying."""
+        funds = state["funds"]
+        out = []
+        for idx in self.by_cost:
+            if self.costs[idx] > funds:
+                break
+            if self.ids[idx] not in state["inventory"] and requirements_met(state, self.weapons[idx].get("requires")):
+                out.append(self.ids[idx])
+        return out
+
+
+def scan_usable(state: dict, content: Content) -> list[str]:
+    """The filter the index replaces: every owned weapon, every tick."""
+    return [
+        weapon_id for weapon_id, item in state["inventory"].items()
+        if item["count"] > 0 and weapon_id in content.weapons and weapon_ready(state, content.weapons[weapon_id])
+    ]
+
+
+def synthetic_content(content: Content, weapons: int, rng: random.Random) -> Content:
+    base = list(content.weapons.values())
+    roster = {}
+    for idx in range(weapons):
+        weapon = dict(base[idx % len(base)], id=f"wp:bench-{idx}")
+        weapon["cooldownTicks"] = rng.randint(1, 40)
+        weapon["requires"] = []
+        roster[weapon["id"]] = weapon
+    return Content(content.constants, roster, content.agents, content.events, content.datacenters)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the ready-set inventory against a full re-filter per tick.")
+    parser.add_argument("--weapons", type=int, default=5000, help="Owned weapons (default 5000).")
+    parser.add_argument("--ticks", type=int, default=500, help="Ticks to simulate (default 500).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.weapons <= 0 or args.ticks <= 0:
+        print("ERROR: --weapons and --ticks must be positive.")
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    content = synthetic_content(load_content(), args.weapons, rng)
+    state = new_game(content, args.seed)
+    for weapon_id in content.weapons:
+        state["inventory"][weapon_id] = {"id": weapon_id, "count": 1}
+    index = InventoryIndex(content, state)
+    scan_time = index_time = 0.0
+    fired = 0
+    for _ in range(args.ticks):
+        state["tick"] += 1
+        started = time.perf_counter()
+        expected = scan_usable(state, content)
+        scan_time += time.perf_counter() - started
+        started = time.perf_counter()
+        index.advance(state["tick"])
+        usable = index.usable(state)
+        index_time += time.perf_counter() - started
+        if sorted(usable) != sorted(expected):
+            print(f"ERROR: index disagrees with the scan at tick {state['tick']}.")
+            sys.exit(1)
+        # Fire everything usable, as the autoplay bot does.
+        fired += len(usable)
+        for weapon_id in usable:
+            state["inventory"][weapon_id]["cooldownUntilTick"] = state["tick"] + int(content.weapons[weapon_id]["cooldownTicks"])
+            index.refresh(state, weapon_id)
+    print(f"full re-filter  {scan_time / args.ticks * 1e6:9.1f} us/tick")
+    print(f"ready set       {index_time / args.ticks * 1e6:9.1f} us/tick")
+    print(f"OK: {fired / args.ticks:.0f} of {args.weapons} weapons usable per tick on average; results matched every tick.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Upgrade saved `GameState`s to the current content version.
+
+Migrations live in content/migrations.json as declarative steps between two
+content versions:
+
+    {"from": "2025.0", "to": "2025.1", "steps": [
+      {"op": "renameDatacenters", "map": {"dc:old": "dc:new"}},
+      {"op": "removeDatacenters", "ids": ["dc:gone"]},
+      {"op": "retuneHealthMax", "healthMax": {"dc:new": [100, 150]}},
+      {"op": "renameInventory", "map": {"wp:old": "wp:new"}},
+      {"op": "removeInventory", "ids": ["wp:gone"]},
+      {"op": "markSeen", "ids": ["ev:new-intro"]},
+      {"op": "forgetEvents", "ids": ["ev:cut"]}
+    ]}
+
+The chain of migrations between a save's version and the target is folded
+into one `FusedMigration` per (from, to) pair, so each save is walked once no
+matter how many versions it skips. Afterwards the save is reconciled with the
+target content: new datacenters get fresh rows, unknown ones are dropped and
+`agiRate` is re-derived. Batches (a JSONL file or a directory of saves) are
+split across worker processes.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from content_loader import CONTENT_DIR, load_json
+from engine import Content, agi_rate, arm_timer_triggers, load_content
+from timers import heapify_timers
+
+MIGRATIONS_PATH = CONTENT_DIR / "migrations.json"
+CHUNK_SIZE = 2000
+
+
+class MigrationError(ValueError):
+    """Raised when a save cannot be brought to the target version."""
+
+
+@dataclass
+class FusedMigration:
+    source: str
+    target: str
+    # id in the source version -> id in the target version (None = removed);
+    # ids not listed carry over unchanged.
+    datacenters: dict[str, str | None] = field(default_factory=dict)
+    inventory: dict[str, str | None] = field(default_factory=dict)
+    health_scale: dict[str, float] = field(default_factory=dict)  # keyed by target id
+    seen: dict[str, bool] = field(default_factory=dict)  # True marks seen, False forgets
+
+    def then(self, step: dict) -> None:
+        """Fold one more step onto the end of this migration."""
+        op = step.get("op")
+        if op == "renameDatacenters":
+            self._rename(self.datacenters, step["map"])
+            self.health_scale = {step["map"].get(dc_id, dc_id): scale for dc_id, scale in self.health_scale.items()}
+        elif op == "removeDatacenters":
+            self._rename(self.datacenters, dict.fromkeys(step["ids"]))
+            for dc_id in step["ids"]:
+                self.health_scale.pop(dc_id, None)
+        elif op == "retuneHealthMax":
+            for dc_id, (old, new) in step["healthMax"].items():
+                self.health_scale[dc_id] = self.health_scale.get(dc_id, 1.0) * float(new) / float(old)
+        elif op == "renameInventory":
+            self._rename(self.inventory, step["map"])
+        elif op == "removeInventory":
+            self._rename(self.inventory, dict.fromkeys(step["ids"]))
+        elif op in ("markSeen", "forgetEvents"):
+            for event_id in step["ids"]:
+                self.seen[event_id] = op == "markSeen"
+        else:
+            raise MigrationError(f"unknown migration step {op!r}")
+
+    @staticmethod
+    def _rename(mapping: dict[str, str | None], renames: dict[str, str | None]) -> None:
+        for source, current in mapping.items():
+            if current is not None and current in renames:
+                mapping[source] = renames[current]
+        for old, new in renames.items():
+            mapping.setdefault(old, new)
+
+    def apply(self, state: dict, content: Content) -> dict:
+        if self.datacenters or self.health_scale:
+            rows = {}
+            for dc_id, row in state["datacenters"].items():
+                new_id = self.datacenters.get(dc_id, dc_id)
+                if new_id is None:
+                    continue
+                row["id"] = new_id
+                scale = self.health_scale.get(new_id)
+                if scale is not None:
+                    row["health"] = float(row["health"]) * scale
+                rows[new_id] = row
+            state["datacenters"] = rows
+        if self.inventory:
+            inventory = {}
+            for item_id, item in state["inventory"].items():
+                new_id = self.inventory.get(item_id, item_id)
+                if new_id is not None:
+                    item["id"] = new_id
+                    inventory[new_id] = item
+            state["inventory"] = inventory
+        if self.seen:
+            forgotten = {event_id for event_id, seen in self.seen.items() if not seen}
+            for event_id, seen in self.seen.items():
+                if seen:
+                    state["seenEvents"][event_id] = True
+                else:
+                    state["seenEvents"].pop(event_id, None)
+            if forgotten:
+                state["pendingEvents"] = [event_id for event_id in state.get("pendingEvents", []) if event_id not in forgotten]
+                # reconcile() below re-heapifies what is left.
+                state["activeTimers"] = [timer for timer in state["activeTimers"] if timer["id"] not in forgotten]
+        reconcile(state, content)
+        state["version"] = self.target
+        return state
+
+
+def reconcile(state: dict, content: Content) -> None:
+    rows = state["datacenters"]
+    for dc_id in [dc_id for dc_id in rows if dc_id not in content.datacenters]:
+        del rows[dc_id]
+    for dc_id, dc in content.datacenters.items():
+        if dc_id not in rows:
+            rows[dc_id] = {
+                "id": dc_id,
+                "health": float(dc["healthMax"]),
+                "status": "intact",
+                "defense": float(dc.get("defense") or 0),
+            }
+    state.setdefault("pendingEvents", [])
+    # Saves from before timers.py may hold activeTimers in insertion order.
+    heapify_timers(state.setdefault("activeTimers", []))
+    arm_timer_triggers(state, content)
+    state["agiRate"] = agi_rate(state, content)
+
+
+class MigrationRegistry:
+    def __init__(self, migrations: list[dict]) -> None:
+        self.edges: dict[str, list[dict]] = {}
+        for migration in migrations:
+            self.edges.setdefault(migration["from"], []).append(migration)
+        self.fused: dict[tuple[str, str], FusedMigration] = {}
+
+    @classmethod
+    def load(cls, path: Path = MIGRATIONS_PATH) -> "MigrationRegistry":
+        if not path.exists():
+            return cls([])
+        return cls(load_json(path).get("migrations") or [])
+
+    def chain(self, source: str, target: str) -> list[dict]:
+        """Shortest run of migrations from `source` to `target` (BFS)."""
+        previous: dict[str, dict | None] = {source: None}
+        queue = deque([source])
+        while queue:
+            version = queue.popleft()
+            if version == target:
+                break
+            for migration in self.edges.get(version, []):
+                if migration["to"] not in previous:
+                    previous[migration["to"]] = migration
+                    queue.append(migration["to"])
+        if target not in previous:
+            raise MigrationError(f"no migration path from {source!r} to {target!r}")
+        chain = []
+        version = target
+        while previous[version] is not None:
+            migration = previous[version]
+            chain.append(migration)
+            version = migration["from"]
+        return chain[::-1]
+
+    def fuse(self, source: str, target: str) -> FusedMigration:
+        key = (source, target)
+        if key not in self.fused:
+            fused = FusedMigration(source, target)
+            for migration in self.chain(source, target):
+                for step in migration.get("steps") or []:
+                    fused.then(step)
+            self.fused[key] = fused
+        return self.fused[key]
+
+    def migrate(self, state: dict, content: Content, target: str | None = None) -> dict:
+        target = target or content.version
+        return self.fuse(str(state.get("version", "")), target).apply(state, content)
+
+
+_worker: tuple[MigrationRegistry, Content, str] | None = None
+
+
+def init_worker(migrations_path: Path, target: str | None) -> None:
+    global _worker
+    content = load_content()
+    _worker = (MigrationRegistry.load(migrations_path), content, target or content.version)
+
+
+def migrate_lines(lines: list[str]) -> tuple[list[str], list[str]]:
+    """Migrate serialized saves; failures are passed through unchanged."""
+    assert _worker is not None
+    registry, content, target = _worker
+    output, errors = [], []
+    for line in lines:
+        try:
+            state = json.loads(line)
+            if not isinstance(state, dict):
+                raise MigrationError(f"save is a JSON {type(state).__name__}, not an object")
+            output.append(json.dumps(registry.migrate(state, content, target), separators=(",", ":")))
+        except (MigrationError, KeyError, TypeError, ValueError) as exc:
+            errors.append(f"{type(exc).__name__}: {exc}")
+            output.append(line.rstrip("\n"))
+    return output, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upgrade saved games to the current content version.")
+    parser.add_argument("input", type=Path, help="JSONL file of saves, or a directory of *.json saves.")
+    parser.add_argument("--output", "-o", type=Path, required=True, help="JSONL file or directory to write.")
+    parser.add_argument("--to", dest="target", help="Target version (default: constants.json version).")
+    parser.add_argument("--migrations", type=Path, default=MIGRATIONS_PATH, help="Migration registry JSON.")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    args = parser.parse_args()
+
+    if args.input.is_dir():
+        paths = sorted(args.input.glob("*.json"))
+        lines = [path.read_text(encoding="utf-8") for path in paths]
+    elif args.input.exists():
+        paths = []
+        lines = [line for line in args.input.read_text(encoding="utf-8").splitlines() if line.strip()]
+    else:
+        print(f"ERROR: {args.input} does not exist.")
+        sys.exit(1)
+
+    chunks = [lines[start:start + CHUNK_SIZE] for start in range(0, len(lines), CHUNK_SIZE)]
+    migrated: list[str] = []
+    errors: list[str] = []
+    pool = None
+    if args.jobs <= 1 or len(chunks) <= 1:
+        # Shipping chunks to a single worker only adds pickling overhead.
+        init_worker(args.migrations, args.target)
+        results = map(migrate_lines, chunks)
+    else:
+        pool = ProcessPoolExecutor(args.jobs, initializer=init_worker, initargs=(args.migrations, args.target))
+        results = pool.map(migrate_lines, chunks)
+    for output, chunk_errors in results:
+        migrated.extend(output)
+        errors.extend(chunk_errors)
+    if pool is not None:
+        pool.shutdown()
+
+    if paths:
+        args.output.mkdir(parents=True, exist_ok=True)
+        for path, text in zip(paths, migrated):
+            (args.output / path.name).write_text(text + "\n", encoding="utf-8")
+    else:
+        args.output.write_text("".join(line + "\n" for line in migrated), encoding="utf-8")
+
+    for error in errors[:20]:
+        print(f"ERROR: {error}")
+    if errors:
+        print(f"ERROR: {len(errors)} of {len(lines)} saves could not be migrated and were copied unchanged.")
+        sys.exit(1)
+    print(f"OK: Migrated {len(lines)} saves to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Agent missions: travel between datacenters, multi-target routes, batch resolution.
+
+An agent on a mission carries one weapon from the inventory and may use it
+on up to `capacity` datacenters; an agent runs one mission at a time, and a
+copy carried by an active mission is not free for another until that
+mission is done or its agent captured. Travel time is great-circle distance
+over `speed * KM_PER_TICK` (speed is abstract in spec.md; 1.0 covers
+KM_PER_TICK km a tick), rounded up to whole ticks. Routes start at the agent's origin and are ordered with
+nearest neighbour followed by 2-opt, which is near-optimal at these sizes.
+
+Datacenters are kept as unit vectors, so a distance is a chord length and
+one asin; picking each agent's nearest targets visits cube-bucketed cells in
+order of distance and stops early instead of scanning every datacenter.
+
+`MissionBoard` keeps active missions in a heap by next arrival tick. Each
+tick `resolve` pops the legs that arrived and plays them through
+engine.attack_datacenter with the agent attached, which rolls the agent's
+successRate and capture risk; a captured agent abandons the rest of the
+route, and a leg that arrives while the weapon is cooling down waits on site.
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import math
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+from engine import ActionError, Content, attack_datacenter, inventory_count, load_content, new_game
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_TICK = 250.0
+CELL_SIZE = 0.05  # unit-sphere chord, about 320 km
+
+
+def unit_vector(lon: float, lat: float) -> tuple[float, float, float]:
+    lon_r, lat_r = math.radians(lon), math.radians(lat)
+    cos_lat = math.cos(lat_r)
+    return (cos_lat * math.cos(lon_r), cos_lat * math.sin(lon_r), math.sin(lat_r))
+
+
+def chord_km(a: tuple[float, float, float], b: tuple[float, float, float]) -> float:
+    chord = math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def great_circle_km(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    return chord_km(unit_vector(lon1, lat1), unit_vector(lon2, lat2))
+
+
+def travel_ticks(km: float, speed: float) -> int:
+    return max(1, math.ceil(km / (KM_PER_TICK * max(speed, 1e-6)) - 1e-9))
+
+
+class DatacenterIndex:
+    """Unit vectors bucketed into CELL_SIZE cubes for exact nearest-target scans."""
+
+    def __init__(self, datacenters: dict[str, dict]) -> None:
+        self.vectors = {dc_id: unit_vector(float(dc["lon"]), float(dc["lat"])) for dc_id, dc in datacenters.items()}
+        self.cells: dict[tuple[int, int, int], list[str]] = {}
+        for dc_id, vector in self.vectors.items():
+            self.cells.setdefault(tuple(math.floor(axis / CELL_SIZE) for axis in vector), []).append(dc_id)
+
+    def nearest(self, lon: float, lat: float, count: int, allowed: Callable[[str], bool]) -> list[str]:
+        """Up to `count` ids passing `allowed`, nearest first.
+
+        Cells are visited in order of their distance to the origin (a lower
+        bound for every point inside), stopping once the next cell cannot
+        hold anything closer than the `count`-th candidate found so far.
+        """
+        origin = unit_vector(lon, lat)
+        bounds = []
+        for key in self.cells:
+            gap = 0.0
+            for axis, cell in zip(origin, key):
+                low = cell * CELL_SIZE
+                gap += max(low - axis, 0.0, axis - low - CELL_SIZE) ** 2
+            bounds.append((gap, key))
+        bounds.sort()
+        best: list[tuple[float, str]] = []  # max-heap of (-squared chord, id)
+        for gap, key in bounds:
+            if len(best) == count and gap >= -best[0][0]:
+                break
+            for dc_id in self.cells[key]:
+                if not allowed(dc_id):
+                    continue
+                vector = self.vectors[dc_id]
+                squared = (vector[0] - origin[0]) ** 2 + (vector[1] - origin[1]) ** 2 + (vector[2] - origin[2]) ** 2
+                if len(best) < count:
+                    heapq.heappush(best, (-squared, dc_id))
+                elif squared < -best[0][0]:
+                    heapq.heapreplace(best, (-squared, dc_id))
+        return [dc_id for _, dc_id in sorted(best, key=lambda item: -item[0])]
+
+
+def plan_route(origin: tuple[float, float, float], stops: list[tuple[float, float, float]]) -> list[int]:
+    """Order `stops` (open path from `origin`): nearest neighbour, then 2-opt."""
+    n = len(stops)
+    if n <= 1:
+        return list(range(n))
+    points = [origin, *stops]
+    dist = [[chord_km(a, b) for b in points] for a in points]
+    order, left, here = [], set(range(1, n + 1)), 0
+    while left:
+        here = min(left, key=lambda idx: dist[here][idx])
+        order.append(here)
+        left.remove(here)
+    path = [0, *order]
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n):
+            for j in range(i + 1, n + 1):
+                # Reverse path[i..j]; the open end after path[-1] costs nothing.
+                before = dist[path[i - 1]][path[i]] + (dist[path[j]][path[j + 1]] if j < n else 0.0)
+                after = dist[path[i - 1]][path[j]] + (dist[path[i]][path[j + 1]] if j < n else 0.0)
+                if after < before - 1e-9:
+                    path[i:j + 1] = reversed(path[i:j + 1])
+                    improved = True
+    return [idx - 1 for idx in path[1:]]
+
+
+@dataclass
+class Mission:
+    id: int
+    agent_id: str
+    weapon_id: str
+    route: list[str]
+    arrivals: list[int]  # tick of arrival at each stop (later legs shift if a stop waits)
+    leg: int = 0
+    status: str = "active"  # "active", "done", "captured"
+    results: list[dict] = field(default_factory=list)
+
+
+class MissionBoard:
+    def __init__(self, content: Content) -> None:
+        self.content = content
+        self.index = DatacenterIndex(content.datacenters)
+        self.missions: dict[int, Mission] = {}
+        self.queue: list[tuple[int, int]] = []  # (arrival tick, mission id)
+        self.next_id = 1
+
+    def claimed(self) -> set[str]:
+        return {
+            dc_id for mission in self.missions.values() if mission.status == "active"
+            for dc_id in mission.route[mission.leg:]
+        }
+
+    def carried(self, weapon_id: str) -> int:
+        """Copies of `weapon_id` out with active missions."""
+        return sum(mission.weapon_id == weapon_id and mission.status == "active" for mission in self.missions.values())
+
+    def dispatch(self, state: dict, agent_id: str, weapon_id: str, origin: tuple[float, float], targets: list[str]) -> Mission:
+        agent = self.content.agents.get(agent_id)
+        if agent is None:
+            raise ActionError(f"unknown agent {agent_id!r}")
+        if inventory_count(state, agent_id) < 1:
+            raise ActionError(f"agent {agent_id!r} is not in the inventory")
+        if any(mission.agent_id == agent_id and mission.status == "active" for mission in self.missions.values()):
+            raise ActionError(f"agent {agent_id!r} is already on a mission")
+        if weapon_id not in self.content.weapons:
+            raise ActionError(f"unknown weapon {weapon_id!r}")
+        # The weapon is carried out from the inventory; attack_datacenter only buys for on-the-spot strikes.
+        if inventory_count(state, weapon_id) < 1:
+            raise ActionError(f"weapon {weapon_id!r} is not in the inventory")
+        if inventory_count(state, weapon_id) <= self.carried(weapon_id):
+            raise ActionError(f"every {weapon_id!r} in the inventory is out on a mission")
+        capacity = int(agent.get("capacity") or 1)
+        if not 0 < len(targets) <= capacity:
+            raise ActionError(f"{agent_id} can take 1-{capacity} targets, got {len(targets)}")
+        start = unit_vector(*origin)
+        vectors = [self.index.vectors[dc_id] for dc_id in targets]
+        order = plan_route(start, vectors)
+        route = [targets[idx] for idx in order]
+        speed = float(agent.get("speed") or 1.0)
+        arrivals, tick, here = [], state["tick"], start
+        for dc_id in route:
+            tick += travel_ticks(chord_km(here, self.index.vectors[dc_id]), speed)
+            arrivals.append(tick)
+            here = self.index.vectors[dc_id]
+        mission = Mission(self.next_id, agent_id, weapon_id, route, arrivals)
+        self.next_id += 1
+        self.missions[mission.id] = mission
+        heapq.heappush(self.queue, (arrivals[0], mission.id))
+        return mission
+
+    def assign(self, state: dict, crews: list[tuple[str, str, tuple[float, float]]]) -> list[Mission]:
+        """Send each (agent, weapon, origin) crew to its nearest unclaimed intact
+        datacenters, up to the agent's capacity; earlier crews pick first."""
+        taken = self.claimed()
+
+        def allowed(dc_id: str) -> bool:
+            return dc_id not in taken and state["datacenters"][dc_id]["status"] != "destroyed"
+
+        missions = []
+        for agent_id, weapon_id, origin in crews:
+            capacity = int((self.content.agents.get(agent_id) or {}).get("capacity") or 1)
+            targets = self.index.nearest(origin[0], origin[1], capacity, allowed)
+            if not targets:
+                break
+            taken.update(targets)
+            missions.append(self.dispatch(state, agent_id, weapon_id, origin, targets))
+        return missions
+
+    def resolve(self, state: dict, rng: random.Random) -> list[dict]:
+        """Play every leg that has arrived by `state["tick"]`."""
+        results = []
+        while self.queue and self.queue[0][0] <= state["tick"]:
+            _, mission_id = heapq.heappop(self.queue)
+            mission = self.missions[mission_id]
+            dc_id = mission.route[mission.leg]
+            result = {"missionId": mission_id, "agentId": mission.agent_id, "datacenterId": dc_id, "skipped": False}
+            if state["datacenters"][dc_id]["status"] == "destroyed":
+                result["skipped"] = True
+            else:
+                try:
+                    result.update(attack_datacenter(
+                        state, self.content,
+                        {"datacenterId": dc_id, "weaponId": mission.weapon_id, "agentId": mission.agent_id}, rng,
+                    ))
+                except ActionError as exc:
+                    cooldown = (state["inventory"].get(mission.weapon_id) or {}).get("cooldownUntilTick", 0)
+                    if cooldown > state["tick"]:
+                        self._delay(mission, cooldown - state["tick"])
+                        heapq.heappush(self.queue, (mission.arrivals[mission.leg], mission_id))
+                        continue
+                    result["error"] = str(exc)
+            mission.results.append(result)
+            results.append(result)
+            mission.leg += 1
+            if result.get("captured"):
+                mission.status = "captured"
+            elif mission.leg == len(mission.route):
+                mission.status = "done"
+            else:
+                heapq.heappush(self.queue, (mission.arrivals[mission.leg], mission_id))
+        return results
+
+    @staticmethod
+    def _delay(mission: Mission, ticks: int) -> None:
+        for idx in range(mission.leg, len(mission.arrivals)):
+            mission.arrivals[idx] += ticks
+
+    def to_json(self) -> dict:
+        return {
+            "nextId": self.next_id,
+            "missions": [asdict(mission) for mission in self.missions.values() if mission.status == "active"],
+        }
+
+    @classmethod
+    def from_json(cls, content: Content, data: dict) -> "MissionBoard":
+        board = cls(content)
+        board.next_id = int(data.get("nextId", 1))
+        for item in data.get("missions") or []:
+            mission = Mission(**item)
+            board.missions[mission.id] = mission
+            heapq.heappush(board.queue, (mission.arrivals[mission.leg], mission.id))
+        return board
+
+
+def synthetic_content(content: Content, datacenters: int, agents: int, rng: random.Random) -> Content:
+    """Scale content up for benchmarking: jittered datacenter copies and agents
+    cloned from the agents.json template (which ships without real agents)."""
+    base = list(content.datacenters.values())
+    scaled = {}
+    for idx in range(datacenters):
+        dc = dict(base[idx % len(base)])
+        if idx >= len(base):
+            dc["id"] = f"{dc['id']}-{idx}"
+            dc["lon"] = float(dc["lon"]) + rng.uniform(-2, 2)
+            dc["lat"] = max(-89.0, min(89.0, float(dc["lat"]) + rng.uniform(-2, 2)))
+        scaled[dc["id"]] = dc
+    roster = dict(content.agents)
+    for idx in range(agents):
+        roster[f"ag:bench-{idx}"] = {
+            "id": f"ag:bench-{idx}",
+            "successRate": 0.7,
+            "risk": 0.1,
+            "speed": rng.uniform(0.5, 2.0),
+            "capacity": rng.choice((1, 2, 3, 4, 6)),
+        }
+    return Content(content.constants, content.weapons, roster, content.events, scaled)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark agent mission planning and resolution.")
+    parser.add_argument("--agents", type=int, default=300, help="Synthetic agents to dispatch (default 300).")
+    parser.add_argument("--datacenters", type=int, default=3000, help="Datacenters, padded with jittered copies (default 3000).")
+    parser.add_argument("--ticks", type=int, default=20, help="Ticks to resolve (default 20).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.agents <= 0 or args.datacenters <= 0:
+        print("ERROR: --agents and --datacenters must be positive.")
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    content = synthetic_content(load_content(), args.datacenters, args.agents, rng)
+    state = new_game(content, args.seed)
+    state["funds"] = 1e9
+    weapon_ids = list(content.weapons)
+    crews = []
+    for agent_id in [agent_id for agent_id in content.agents if agent_id.startswith("ag:bench-")]:
+        state["inventory"][agent_id] = {"id": agent_id, "count": 1}
+        weapon_id = rng.choice(weapon_ids)
+        state["inventory"].setdefault(weapon_id, {"id": weapon_id, "count": 0})["count"] += 1
+        crews.append((agent_id, weapon_id, (rng.uniform(-125, -70), rng.uniform(25, 49))))
+
+    board = MissionBoard(content)
+    started = time.perf_counter()
+    missions = board.assign(state, crews)
+    planned = time.perf_counter() - started
+    legs = sum(len(mission.route) for mission in missions)
+    resolved = captured = 0
+    started = time.perf_counter()
+    for _ in range(args.ticks):
+        state["tick"] += 1
+        results = board.resolve(state, rng)
+        resolved += len(results)
+        captured += sum(bool(result.get("captured")) for result in results)
+    resolving = time.perf_counter() - started
+    print(f"planned {len(missions)} missions / {legs} stops over {len(content.datacenters)} datacenters in {planned * 1000:.1f} ms")
+    print(f"resolved {resolved} legs ({captured} captures) over {args.ticks} ticks in {resolving * 1000:.1f} ms")
+    print(f"OK: {sum(m.status == 'active' for m in missions)} missions still en route.")
+
+
+if __name__ == "__main__":
+    main()
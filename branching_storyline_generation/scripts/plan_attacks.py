@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Beam-search planner for the attack order that destroys the most datacenters.
+
+The planner runs a deterministic, expected-value copy of the engine rules
+(no variance rolls, no random events) over compact tuple states so thousands
+of branches per tick stay cheap. Each tick, every beam node branches over a
+targeting policy and an optional weapon purchase; all ready owned weapons then
+fire. Nodes that reach the same state signature are merged, keeping the best.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from engine import Content, clamp, compare, damage_multiplier, derived_agi_rate, load_content
+
+TARGET_POLICIES = ("value", "weakest", "impact")
+
+
+@dataclass
+class Plan:
+    destroyed: int
+    total: int
+    won: bool
+    tick: int
+    agi_progress: float
+    funds: float
+    actions: list[dict]
+
+
+class Node:
+    __slots__ = (
+        "tick", "funds", "heat", "support", "agi", "rate", "health", "owned",
+        "cooldowns", "defense_offset", "destroyed", "impact_destroyed", "parent", "actions", "score",
+    )
+
+    def child(self) -> "Node":
+        node = Node()
+        node.tick = self.tick
+        node.funds = self.funds
+        node.heat = self.heat
+        node.support = self.support
+        node.agi = self.agi
+        node.rate = self.rate
+        node.health = list(self.health)
+        node.owned = self.owned
+        node.cooldowns = list(self.cooldowns)
+        node.defense_offset = self.defense_offset
+        node.destroyed = self.destroyed
+        node.impact_destroyed = self.impact_destroyed
+        node.parent = self
+        node.actions = []
+        node.score = 0.0
+        return node
+
+    def signature(self) -> tuple:
+        return (
+            tuple(int(h) for h in self.health),
+            self.owned,
+            tuple(max(0, cd - self.tick) for cd in self.cooldowns),
+            int(self.funds),
+            int(self.heat),
+            round(self.agi, 1),
+            round(self.defense_offset, 2),
+        )
+
+
+class AttackPlanner:
+    ECONOMY_HORIZON = 20
+
+    def __init__(
+        self,
+        content: Content,
+        beam_width: int = 24,
+        buy_options: int = 2,
+        max_ticks: int = 1000,
+        starting_funds: float | None = None,
+    ) -> None:
+        self.constants = content.constants
+        self.beam_width = beam_width
+        self.buy_options = buy_options
+        self.max_ticks = max_ticks
+        self.starting_funds = float(self.constants["startingFunds"] if starting_funds is None else starting_funds)
+        self.penalty = float(self.constants["destroyedDcAgiPenalty"])
+
+        weapons = list(content.weapons.values())
+        self.weapon_ids = [weapon["id"] for weapon in weapons]
+        self.weapon_index = weapon_index = {weapon_id: idx for idx, weapon_id in enumerate(self.weapon_ids)}
+        self.damage = [float(weapon.get("damage") or 0) for weapon in weapons]
+        self.cost = [float(weapon.get("cost") or 0) for weapon in weapons]
+        self.cooldown = [int(weapon.get("cooldownTicks") or 0) for weapon in weapons]
+        self.heat_scale = [1.0 - float(weapon.get("stealth") or 0) for weapon in weapons]
+        self.requires = [weapon.get("requires") or [] for weapon in weapons]
+        self.deltas: list[dict[str, float]] = []
+        self.grants: list[int] = []
+        for weapon in weapons:
+            deltas: dict[str, float] = {}
+            grants = 0
+            for effect in weapon.get("effects") or []:
+                target = effect.get("target") or {}
+                if effect.get("op", "add") != "add":
+                    continue
+                key = target.get("key")
+                if target.get("type") == "global":
+                    deltas[key] = deltas.get(key, 0.0) + float(effect["value"])
+                elif target.get("type") == "datacenters" and key == "defense":
+                    deltas["defense"] = deltas.get("defense", 0.0) + float(effect["value"])
+                elif target.get("type") == "inventory" and key in weapon_index and effect["value"] > 0:
+                    grants |= 1 << weapon_index[key]
+            self.deltas.append(deltas)
+            self.grants.append(grants)
+
+        datacenters = list(content.datacenters.values())
+        self.datacenter_ids = [dc["id"] for dc in datacenters]
+        self.health_max = [float(dc["healthMax"]) for dc in datacenters]
+        self.defense = [float(dc.get("defense") or 0) for dc in datacenters]
+        self.impact = [float(dc.get("agiImpact") or 0) for dc in datacenters]
+        self.total_impact = sum(self.impact) or 1.0
+        self.mean_health = sum(self.health_max) / max(1, len(self.health_max))
+        self.fire_order = sorted(range(len(weapons)), key=lambda idx: -self.damage[idx])
+        self.dps = [
+            self.damage[idx] * damage_multiplier(self.constants, sum(self.defense) / max(1, len(self.defense)))
+            / max(1, self.cooldown[idx])
+            for idx in range(len(weapons))
+        ]
+        self.mean_cost = max(1.0, sum(self.cost) / max(1, len(self.cost)))
+        self.mean_dps = sum(self.dps) / max(1, len(self.dps))
+        self.income = [self.deltas[idx].get("funds", 0.0) / max(1, self.cooldown[idx]) for idx in range(len(weapons))]
+
+    def root(self) -> Node:
+        node = Node()
+        node.tick = 0
+        node.funds = self.starting_funds
+        node.heat = float(self.constants["startingHeat"])
+        node.support = float(self.constants["startingPublicSupport"])
+        node.agi = float(self.constants["startingAgiProgress"])
+        node.rate = derived_agi_rate(self.constants, node.heat, 1.0)
+        node.health = list(self.health_max)
+        node.owned = 0
+        node.cooldowns = [0] * len(self.weapon_ids)
+        node.defense_offset = 0.0
+        node.destroyed = 0
+        node.impact_destroyed = 0.0
+        node.parent = None
+        node.actions = []
+        node.score = 0.0
+        return node
+
+    def requirements_met(self, node: Node, weapon: int) -> bool:
+        for requirement in self.requires[weapon]:
+            kind, key = requirement.get("type"), requirement.get("key")
+            if kind == "global":
+                actual = {"funds": node.funds, "heat": node.heat, "publicSupport": node.support, "agiProgress": node.agi}.get(key, 0)
+            elif kind == "inventory":
+                actual = 1 if key in self.weapon_index and node.owned >> self.weapon_index[key] & 1 else 0
+            else:
+                return False
+            if not compare(requirement.get("cmp", "gte"), actual, requirement.get("value")):
+                return False
+        return True
+
+    def expected_damage(self, node: Node, weapon: int, dc: int) -> float:
+        return self.damage[weapon] * damage_multiplier(self.constants, self.defense[dc] + node.defense_offset)
+
+    def pick_target(self, node: Node, policy: str) -> int | None:
+        alive = [idx for idx, health in enumerate(node.health) if health > 0]
+        if not alive:
+            return None
+        if policy == "weakest":
+            return min(alive, key=lambda idx: node.health[idx])
+        if policy == "impact":
+            return max(alive, key=lambda idx: (self.impact[idx], -node.health[idx]))
+        return max(alive, key=lambda idx: self.impact[idx] / node.health[idx])
+
+    def purchase_candidates(self, node: Node) -> list[int]:
+        affordable = [
+            idx for idx in range(len(self.weapon_ids))
+            if not node.owned >> idx & 1 and self.cost[idx] <= node.funds and self.requirements_met(node, idx)
+        ]
+        by_dps = sorted(affordable, key=lambda idx: -self.dps[idx])[: self.buy_options]
+        by_income = [idx for idx in sorted(affordable, key=lambda idx: -self.income[idx])[:1] if self.income[idx] > 0]
+        return list(dict.fromkeys(by_dps + by_income))
+
+    def apply_deltas(self, node: Node, weapon: int) -> None:
+        deltas = self.deltas[weapon]
+        if "heat" in deltas:
+            heat = deltas["heat"] * (self.heat_scale[weapon] if deltas["heat"] > 0 else 1.0)
+            node.heat = max(0.0, node.heat + heat)
+        if "funds" in deltas:
+            node.funds = max(0.0, node.funds + deltas["funds"])
+        if "publicSupport" in deltas:
+            node.support = clamp(node.support + deltas["publicSupport"], 0.0, 100.0)
+        if "agiProgress" in deltas:
+            node.agi = clamp(node.agi + deltas["agiProgress"], 0.0, 100.0)
+        if "agiRate" in deltas:
+            node.rate += deltas["agiRate"]
+        if "defense" in deltas:
+            node.defense_offset += deltas["defense"]
+        node.owned |= self.grants[weapon]
+
+    def step(self, parent: Node, policy: str, purchase: int | None) -> Node:
+        node = parent.child()
+        if purchase is not None:
+            node.funds -= self.cost[purchase]
+            node.owned |= 1 << purchase
+            node.actions.append({"tick": node.tick, "action": "buy", "weaponId": self.weapon_ids[purchase]})
+        for weapon in self.fire_order:
+            if not node.owned >> weapon & 1 or node.cooldowns[weapon] > node.tick:
+                continue
+            if not self.requirements_met(node, weapon):
+                continue
+            target = self.pick_target(node, policy)
+            if target is None:
+                break
+            node.health[target] -= self.expected_damage(node, weapon, target)
+            node.actions.append({
+                "tick": node.tick,
+                "action": "attack",
+                "weaponId": self.weapon_ids[weapon],
+                "datacenterId": self.datacenter_ids[target],
+            })
+            if node.health[target] <= 0:
+                node.health[target] = 0.0
+                node.destroyed += 1
+                node.impact_destroyed += self.impact[target]
+                node.agi = max(0.0, node.agi - self.penalty)
+            node.cooldowns[weapon] = node.tick + self.cooldown[weapon]
+            self.apply_deltas(node, weapon)
+        node.tick += 1
+        node.agi = clamp(node.agi + node.rate, 0.0, 100.0)
+        intact_share = max(0.0, 1.0 - node.impact_destroyed / self.total_impact)
+        node.rate = derived_agi_rate(self.constants, node.heat, intact_share)
+        node.score = self.score(node)
+        return node
+
+    def score(self, node: Node) -> float:
+        partial = sum(1.0 - h / m for h, m in zip(node.health, self.health_max) if h > 0)
+        ticks_left = min(self.max_ticks - node.tick, (100.0 - node.agi) / max(node.rate, 1e-6))
+        owned = [idx for idx in range(len(self.weapon_ids)) if node.owned >> idx & 1]
+        # Funds on hand and per-tick income turn into future weapons, so count them as firepower.
+        budget = node.funds + sum(self.income[idx] for idx in owned) * min(ticks_left, self.ECONOMY_HORIZON)
+        firepower = sum(self.dps[idx] for idx in owned) + budget / self.mean_cost * self.mean_dps
+        kill_rate = firepower / self.mean_health
+        projected = min(len(node.health) - node.destroyed, kill_rate * ticks_left)
+        return node.destroyed + 0.5 * partial + projected + kill_rate
+
+    def is_terminal(self, node: Node) -> bool:
+        return node.agi >= 100.0 or node.destroyed == len(node.health) or node.tick >= self.max_ticks
+
+    def final_key(self, node: Node) -> tuple:
+        won = node.destroyed == len(node.health)
+        return (node.destroyed, won, -node.tick if won else 0, -node.agi)
+
+    def search(self) -> Plan:
+        beam = [self.root()]
+        best: Node | None = None
+        while beam:
+            layer: dict[tuple, Node] = {}
+            for parent in beam:
+                purchases: list[int | None] = [None, *self.purchase_candidates(parent)]
+                for policy in TARGET_POLICIES:
+                    for purchase in purchases:
+                        node = self.step(parent, policy, purchase)
+                        signature = node.signature()
+                        incumbent = layer.get(signature)
+                        if incumbent is None or node.score > incumbent.score:
+                            layer[signature] = node
+            beam = []
+            for node in sorted(layer.values(), key=lambda n: -n.score):
+                if self.is_terminal(node):
+                    if best is None or self.final_key(node) > self.final_key(best):
+                        best = node
+                elif len(beam) < self.beam_width:
+                    beam.append(node)
+            if best is not None and best.destroyed == len(best.health):
+                break
+        assert best is not None
+        return self.to_plan(best)
+
+    def to_plan(self, node: Node) -> Plan:
+        actions: list[dict] = []
+        cursor: Node | None = node
+        while cursor is not None:
+            actions[:0] = cursor.actions
+            cursor = cursor.parent
+        return Plan(
+            destroyed=node.destroyed,
+            total=len(node.health),
+            won=node.destroyed == len(node.health),
+            tick=node.tick,
+            agi_progress=round(node.agi, 2),
+            funds=round(node.funds, 2),
+            actions=actions,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search for the attack order that destroys the most datacenters.")
+    parser.add_argument("--funds", type=float, help="Override constants.startingFunds.")
+    parser.add_argument("--beam", type=int, default=24, help="Beam width per tick (default 24).")
+    parser.add_argument("--buy-options", type=int, default=2, help="Weapon purchases considered per node (default 2).")
+    parser.add_argument("--max-ticks", type=int, default=1000, help="Stop searching after this many ticks.")
+    parser.add_argument("--output", "-o", type=Path, help="Write the full plan as JSON.")
+    parser.add_argument("--show", type=int, default=10, help="How many plan actions to print (default 10).")
+    args = parser.parse_args()
+    if args.beam <= 0:
+        print("ERROR: beam must be positive.")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    planner = AttackPlanner(load_content(), args.beam, args.buy_options, args.max_ticks, args.funds)
+    plan = planner.search()
+    elapsed = time.perf_counter() - started
+
+    for action in plan.actions[: args.show]:
+        target = f" -> {action['datacenterId']}" if "datacenterId" in action else ""
+        print(f"tick {action['tick']:4d} {action['action']:6s} {action['weaponId']}{target}")
+    outcome = f"cleared the map at tick {plan.tick}" if plan.won else f"AGI reached {plan.agi_progress:.1f} at tick {plan.tick}"
+    print(f"OK: destroyed {plan.destroyed}/{plan.total}; {outcome}; searched in {elapsed:.2f}s.")
+    if args.output:
+        args.output.write_text(json.dumps(plan.__dict__, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""Lock-safe, per-item updates to creative_registry.json.
+
+Item edits are per-item patches applied to an in-memory view, and every
+change that alters something rewrites creative_registry.json through a temp
+file and `os.replace`: the JSON on disk is current after each command (the
+validators read it directly) and is never half-written. A long-lived store
+only re-reads the file when its inode, mtime or size changed.
+
+Every mutation holds an exclusive advisory `flock` on
+`creative_registry.json.lock`, and patches that would not change anything are
+dropped before touching disk. Older versions of this tool appended patches to
+`creative_registry.journal` and folded them in on `compact`; a journal left
+behind is still replayed (skipping any torn line) and folded into the JSON by
+the next change or by `compact`. Patch operations are idempotent (upsert,
+field patch, delete, replace), so replaying a journal over a snapshot that
+already contains it is harmless.
+
+A per-category status index (counts by status plus a pending queue) is kept
+in step with every applied patch, so claiming the next pending item,
+releasing or completing it, and reporting progress against `targetCount` take
+O(log n) at most. The queue is a heap on registry order holding each id once;
+an item that leaves pending keeps its entry, which is skipped on pop unless
+the item is pending again, so claims always follow registry order.
+
+    ./scripts/registry_store.py claim events --by event-writer
+    ./scripts/registry_store.py complete events ev:some-id
+    ./scripts/registry_store.py progress
+"""
+from __future__ import annotations
+
+import argparse
+import fcntl
+import heapq
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from content_loader import REGISTRY_PATH
+
+
+class RegistryError(ValueError):
+    """Raised for unknown categories/items or invalid statuses."""
+
+
+def encode_registry(registry: dict) -> str:
+    return json.dumps(registry, indent=2) + "\n"
+
+
+class RegistryStore:
+    def __init__(self, path: Path = REGISTRY_PATH) -> None:
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.registry: dict = {}
+        self._index: dict[str, dict[str, dict]] = {}
+        self._counts: dict[str, Counter] = {}
+        self._order: dict[str, dict[str, int]] = {}  # id -> position in registry order
+        self._next_order: dict[str, int] = {}
+        self._pending: dict[str, list[tuple[int, str]]] = {}  # heap of (order, id)
+        self._queued: dict[str, set[str]] = {}  # ids with a current entry in the heap
+        self._pending_ids: dict[str, set[str]] = {}
+        self._snapshot_key: tuple | None = None
+        self._journal_offset = 0
+
+    @contextmanager
+    def locked(self) -> Iterator["RegistryStore"]:
+        with self.lock_path.open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                self.sync()
+                yield self
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def sync(self) -> None:
+        """Bring the in-memory view up to date with the snapshot and journal."""
+        stat = self.path.stat()
+        snapshot_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if snapshot_key != self._snapshot_key:
+            self.registry = json.loads(self.path.read_text(encoding="utf-8"))
+            self._index = {}
+            for name in self.registry.get("categories", {}):
+                self._rebuild_index(name)
+            self._snapshot_key = snapshot_key
+            self._journal_offset = 0
+        if not self.journal_path.exists():
+            return
+        with self.journal_path.open("rb") as handle:
+            handle.seek(self._journal_offset)
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # a writer crashed mid-append; ignore the torn tail
+                self._journal_offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a torn append with a later line glued onto it
+                self._apply(entry)
+
+    def _category(self, name: str) -> dict:
+        category = self.registry.get("categories", {}).get(name)
+        if category is None:
+            raise RegistryError(f"unknown registry category {name!r}")
+        return category
+
+    def _rebuild_index(self, name: str) -> None:
+        items = self._category(name).get("items") or []
+        self._index[name] = {item["id"]: item for item in items}
+        self._counts[name] = Counter(item.get("status") for item in items)
+        self._order[name] = {item["id"]: pos for pos, item in enumerate(items)}
+        self._next_order[name] = len(items)
+        self._pending[name] = [(pos, item["id"]) for pos, item in enumerate(items) if item.get("status") == "pending"]
+        self._queued[name] = {item_id for _, item_id in self._pending[name]}
+        self._pending_ids[name] = set(self._queued[name])
+
+    def _track(self, name: str, item_id: str, old: str | None, new: str | None) -> None:
+        if old == new:
+            return
+        counts = self._counts[name]
+        if old is not None:
+            counts[old] -= 1
+        if new is not None:
+            counts[new] += 1
+        if old == "pending":
+            self._pending_ids[name].discard(item_id)
+        if new == "pending":
+            self._pending_ids[name].add(item_id)
+            if item_id not in self._queued[name]:
+                self._queued[name].add(item_id)
+                heapq.heappush(self._pending[name], (self._order[name][item_id], item_id))
+
+    def _apply(self, entry: dict) -> None:
+        op, name = entry["op"], entry["category"]
+        items = self._category(name).setdefault("items", [])
+        if name not in self._index:
+            self._rebuild_index(name)
+        index = self._index[name]
+        if op == "patch":
+            item = index[entry["id"]]
+            old = item.get("status")
+            item.update(entry["fields"])
+            for key in entry.get("unset") or []:
+                item.pop(key, None)
+            self._track(name, item["id"], old, item.get("status"))
+        elif op == "upsert":
+            current = index.get(entry["item"]["id"])
+            if current is None:
+                item = dict(entry["item"])
+                items.append(item)
+                index[item["id"]] = item
+                self._order[name][item["id"]] = self._next_order[name]
+                self._next_order[name] += 1
+                self._track(name, item["id"], None, item.get("status"))
+            else:
+                old = current.get("status")
+                current.clear()
+                current.update(entry["item"])
+                self._track(name, current["id"], old, current.get("status"))
+        elif op == "remove":
+            item = index.pop(entry["id"], None)
+            if item is not None:
+                items.remove(item)
+                self._track(name, entry["id"], item.get("status"), None)
+                del self._order[name][entry["id"]]
+                self._queued[name].discard(entry["id"])  # its heap entry is now stale
+        elif op == "replace":
+            items[:] = [dict(item) for item in entry["items"]]
+            self._rebuild_index(name)
+        else:
+            raise RegistryError(f"unknown journal op {op!r}")
+
+    def _commit(self, entry: dict) -> None:
+        self._apply(entry)
+        self._write_snapshot()
+
+    def get_item(self, category: str, item_id: str) -> dict | None:
+        self._category(category)
+        return self._index.get(category, {}).get(item_id)
+
+    def patch_item(self, category: str, item_id: str, fields: dict, unset: tuple[str, ...] = ()) -> bool:
+        """Set `fields` and delete the `unset` keys; False if nothing changes."""
+        item = self.get_item(category, item_id)
+        if item is None:
+            raise RegistryError(f"{category} has no item {item_id!r}")
+        changed = {key: value for key, value in fields.items() if item.get(key) != value}
+        removed = [key for key in unset if key in item]
+        if not changed and not removed:
+            return False
+        entry = {"op": "patch", "category": category, "id": item_id, "fields": changed}
+        if removed:
+            entry["unset"] = removed
+        self._commit(entry)
+        return True
+
+    def upsert_item(self, category: str, item: dict) -> bool:
+        if self.get_item(category, item["id"]) == item:
+            return False
+        self._commit({"op": "upsert", "category": category, "item": item})
+        return True
+
+    def remove_item(self, category: str, item_id: str) -> bool:
+        if self.get_item(category, item_id) is None:
+            return False
+        self._commit({"op": "remove", "category": category, "id": item_id})
+        return True
+
+    def replace_items(self, category: str, items: list[dict]) -> bool:
+        """Swap a whole category (e.g. regenerated datacenter stubs)."""
+        if self._category(category).get("items") == items:
+            return False
+        self._commit({"op": "replace", "category": category, "items": items})
+        return True
+
+    def set_status(self, category: str, item_id: str, status: str) -> bool:
+        options = self.registry.get("statusOptions") or []
+        if options and status not in options:
+            raise RegistryError(f"status {status!r} not in {', '.join(options)}")
+        return self.patch_item(category, item_id, {"status": status})
+
+    def claim_next(self, category: str, owner: str | None = None) -> dict | None:
+        """Move the first pending item to in_progress and return it (None if the queue is empty)."""
+        self._category(category)
+        queue, queued, pending_ids = self._pending[category], self._queued[category], self._pending_ids[category]
+        while queue:
+            order, item_id = heapq.heappop(queue)
+            if self._order[category].get(item_id) != order:
+                continue  # the item was removed (and maybe re-added later in the order)
+            queued.discard(item_id)
+            if item_id not in pending_ids:
+                continue  # left pending after it was queued; _track re-queues it if it returns
+            fields = {"status": "in_progress"}
+            if owner:
+                fields["claimedBy"] = owner
+            self.patch_item(category, item_id, fields)
+            return self._index[category][item_id]
+        return None
+
+    def release(self, category: str, item_id: str) -> bool:
+        item = self.get_item(category, item_id)
+        if item is None or item.get("status") != "in_progress":
+            raise RegistryError(f"{item_id!r} is not in progress in {category}")
+        return self.patch_item(category, item_id, {"status": "pending"}, unset=("claimedBy",))
+
+    def complete(self, category: str, item_id: str, fields: dict | None = None) -> bool:
+        return self.patch_item(category, item_id, {**(fields or {}), "status": "done"})
+
+    def progress(self, category: str) -> dict:
+        counts = self._counts[category] if category in self._counts else Counter()
+        target = int(self._category(category).get("targetCount") or 0)
+        return {
+            "category": category,
+            "targetCount": target,
+            "items": sum(counts.values()),
+            "pending": counts.get("pending", 0),
+            "inProgress": counts.get("in_progress", 0),
+            "done": counts.get("done", 0),
+            "remaining": max(0, target - counts.get("done", 0)),
+        }
+
+    def categories(self) -> list[str]:
+        return list(self.registry.get("categories", {}))
+
+    def _write_snapshot(self) -> bool:
+        """Write the in-memory registry to disk atomically and drop any journal."""
+        text = encode_registry(self.registry)
+        changed = self.path.read_text(encoding="utf-8") != text
+        # Always swap in a new file when a journal exists so other stores see a
+        # new inode and reload, instead of trusting stale journal offsets.
+        if changed or self.journal_path.exists():
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+            try:
+                os.chmod(tmp_name, self.path.stat().st_mode & 0o777)
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    handle.write(text)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        self.journal_path.unlink(missing_ok=True)
+        stat = self.path.stat()
+        self._snapshot_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self._journal_offset = 0
+        return changed
+
+    def compact(self) -> bool:
+        """Fold a leftover journal into creative_registry.json; returns True if the file changed."""
+        with self.locked():
+            if not self.journal_path.exists():
+                return False
+            return self._write_snapshot()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply incremental, locked edits to creative_registry.json.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("compact", help="Fold a leftover journal into creative_registry.json.")
+    status = sub.add_parser("set-status", help="Set one item's status.")
+    status.add_argument("category")
+    status.add_argument("item_id")
+    status.add_argument("status")
+    claim = sub.add_parser("claim", help="Claim the first pending item in a category.")
+    claim.add_argument("category")
+    claim.add_argument("--by", help="Record who claimed the item.")
+    for name, help_text in (("release", "Return an in-progress item to the pending queue."), ("complete", "Mark an item done.")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("category")
+        command.add_argument("item_id")
+    add = sub.add_parser("add", help="Append a pending stub to a category.")
+    add.add_argument("category")
+    add.add_argument("item_id")
+    progress = sub.add_parser("progress", help="Report status counts against targetCount.")
+    progress.add_argument("category", nargs="?")
+    args = parser.parse_args()
+
+    store = RegistryStore()
+    try:
+        if args.command == "compact":
+            changed = store.compact()
+            print("OK: registry compacted." if changed else "OK: registry already up to date.")
+            return
+        with store.locked():
+            if args.command == "set-status":
+                changed = store.set_status(args.category, args.item_id, args.status)
+                print(f"OK: {args.item_id} -> {args.status}" + ("" if changed else " (unchanged)"))
+            elif args.command == "claim":
+                item = store.claim_next(args.category, args.by)
+                if item is None:
+                    print(f"ERROR: no pending items in {args.category}; add a stub first.")
+                    sys.exit(1)
+                print(json.dumps(item))
+            elif args.command == "release":
+                store.release(args.category, args.item_id)
+                print(f"OK: {args.item_id} -> pending")
+            elif args.command == "complete":
+                changed = store.complete(args.category, args.item_id)
+                print(f"OK: {args.item_id} -> done" + ("" if changed else " (unchanged)"))
+            elif args.command == "add":
+                if store.get_item(args.category, args.item_id) is not None:
+                    print(f"ERROR: {args.category} already has {args.item_id}.")
+                    sys.exit(1)
+                store.upsert_item(args.category, {"id": args.item_id, "status": "pending"})
+                print(f"OK: added pending {args.item_id}")
+            else:
+                for name in [args.category] if args.category else store.categories():
+                    info = store.progress(name)
+                    print(
+                        f"{name:12s} done {info['done']}/{info['targetCount']}"
+                        f" (pending {info['pending']}, in progress {info['inProgress']}, items {info['items']})"
+                    )
+    except RegistryError as exc:
+        print(f"ERROR: {exc}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""Local asyncio server hosting many headless games for external bots.
+
+Protocol: newline-delimited JSON over TCP (loopback by default). Each request
+is `{"id": any, "method": str, "session": str?, "params": {...}}` and gets one
+response line `{"id", "ok": true, "result"}` or `{"id", "ok": false,
+"error"}`. Clients may pipeline: write any number of requests without
+waiting. Requests for one session run in the order they were sent; responses
+for different sessions can come back out of order, so match them by `id`.
+
+Methods:
+- `newGame {seed?}` -> `{session, tick, pendingEvents}`
+- `attackDatacenter {datacenterId, weaponId, agentId?}` (spec.md payload)
+- `chooseEventOption {eventId, choiceId}`
+- `resolveTick {}` -> `{tick, fired, agiProgress, pendingEvents, outcome}`
+- `getState {}` -> the full GameState; `closeSession {}`
+- `stats {}` -> per-method latency percentiles in milliseconds
+
+Actions run inline on the loop. `resolveTick` requests are not: they are
+collected until the loop is idle and resolved as one batch across sessions,
+and a batch of at least `--offload-at` ticks is split over a process pool
+(state and RNG state go to the worker and come back), so the loop keeps
+reading and answering while the workers tick. `--bench` starts the server
+and a pipelining client in one process and prints the latencies.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from engine import (
+    ActionError,
+    Content,
+    attack_datacenter,
+    choose_event_option,
+    load_content,
+    new_game,
+    outcome,
+    resolve_tick,
+)
+
+HOST = "127.0.0.1"
+PORT = 8765
+PERCENTILES = (50, 90, 99)
+_content: Content | None = None
+
+
+@dataclass
+class Session:
+    id: str
+    state: dict
+    rng: random.Random
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def tick_summary(state: dict, fired: list[str]) -> dict:
+    return {
+        "tick": state["tick"],
+        "fired": fired,
+        "agiProgress": state["agiProgress"],
+        "pendingEvents": list(state["pendingEvents"]),
+        "outcome": outcome(state),
+    }
+
+
+def init_worker() -> None:
+    global _content
+    _content = load_content()
+
+
+def tick_states(games: list[tuple[dict, tuple]]) -> list[tuple[dict, tuple, dict]]:
+    """Worker side of an offloaded batch: one resolve_tick per (state, rng state)."""
+    assert _content is not None, "init_worker() was not called"
+    results = []
+    rng = random.Random()
+    for state, rng_state in games:
+        rng.setstate(rng_state)
+        fired = resolve_tick(state, _content, rng)
+        results.append((state, rng.getstate(), tick_summary(state, fired)))
+    return results
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class SimServer:
+    def __init__(self, content: Content, pool: ProcessPoolExecutor | None = None, jobs: int = 1, offload_at: int = 256) -> None:
+        self.content = content
+        self.pool = pool
+        self.jobs = max(1, jobs)
+        self.offload_at = offload_at
+        self.sessions: dict[str, Session] = {}
+        self.created = 0
+        self.pending_ticks: list[tuple[Session, asyncio.Future]] = []
+        self.flush_scheduled = False
+        self.latencies: dict[str, list[float]] = {}
+        self.connections: set[asyncio.Task] = set()
+        self.batches = self.offloaded = 0
+
+    # -- ticks -------------------------------------------------------------
+
+    def resolve_later(self, session: Session) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending_ticks.append((session, future))
+        if not self.flush_scheduled:
+            # call_soon runs after every request already read has been started,
+            # so one batch picks up all the ticks pipelined so far.
+            self.flush_scheduled = True
+            loop.call_soon(self.flush_ticks)
+        return future
+
+    def flush_ticks(self) -> None:
+        batch, self.pending_ticks = self.pending_ticks, []
+        self.flush_scheduled = False
+        if not batch:
+            return
+        self.batches += 1
+        if self.pool is not None and len(batch) >= self.offload_at:
+            self.offloaded += 1
+            asyncio.get_running_loop().create_task(self.offload(batch))
+            return
+        for session, future in batch:
+            # One bad game fails its own request; the rest of the batch still resolves.
+            try:
+                fired = resolve_tick(session.state, self.content, session.rng)
+                future.set_result(tick_summary(session.state, fired))
+            except Exception as exc:
+                future.set_exception(exc)
+
+    async def offload(self, batch: list[tuple[Session, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        size = -(-len(batch) // self.jobs)
+        chunks = [batch[start:start + size] for start in range(0, len(batch), size)]
+        calls = [
+            loop.run_in_executor(self.pool, tick_states, [(session.state, session.rng.getstate()) for session, _ in chunk])
+            for chunk in chunks
+        ]
+        try:
+            results = await asyncio.gather(*calls)
+        except Exception as exc:  # a dead worker fails the whole batch, not the server
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for chunk, chunk_results in zip(chunks, results):
+            for (session, future), (state, rng_state, summary) in zip(chunk, chunk_results):
+                session.state = state
+                session.rng.setstate(rng_state)
+                future.set_result(summary)
+
+    # -- requests ----------------------------------------------------------
+
+    async def call(self, method: str, session_id: str | None, params: dict) -> object:
+        if method == "newGame":
+            seed = int(params.get("seed", self.created))
+            self.created += 1
+            session = Session(f"s{self.created}", new_game(self.content, seed), random.Random(seed))
+            self.sessions[session.id] = session
+            return {"session": session.id, "tick": 0, "pendingEvents": list(session.state["pendingEvents"])}
+        if method == "stats":
+            return self.stats()
+        session = self.sessions.get(session_id or "")
+        if session is None:
+            raise ActionError(f"unknown session {session_id!r}")
+        async with session.lock:
+            state = session.state
+            if method == "attackDatacenter":
+                if outcome(state) is not None:
+                    raise ActionError(f"game is over ({outcome(state)})")
+                return attack_datacenter(state, self.content, params, session.rng)
+            if method == "chooseEventOption":
+                return choose_event_option(state, self.content, params.get("eventId"), params.get("choiceId"))
+            if method == "resolveTick":
+                if outcome(state) is not None:
+                    raise ActionError(f"game is over ({outcome(state)})")
+                return await self.resolve_later(session)
+            if method == "getState":
+                return state
+            if method == "closeSession":
+                del self.sessions[session.id]
+                return {"session": session.id}
+        raise ActionError(f"unknown method {method!r}")
+
+    async def respond(self, line: bytes, received: float, writer: asyncio.StreamWriter) -> None:
+        request_id = method = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            method = request.get("method")
+            result = await self.call(method, request.get("session"), request.get("params") or {})
+            response = {"id": request_id, "ok": True, "result": result}
+        except Exception as exc:  # bad requests and failed batches are answered, never dropped
+            response = {"id": request_id, "ok": False, "error": str(exc)}
+        writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+        self.latencies.setdefault(str(method), []).append(time.perf_counter() - received)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks: set[asyncio.Task] = set()
+        connection = asyncio.current_task()
+        assert connection is not None
+        self.connections.add(connection)
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self.respond(line, time.perf_counter(), writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if len(tasks) > 4096:
+                    # Stop reading while a client has too much in flight.
+                    await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    await writer.drain()
+            if tasks:
+                await asyncio.wait(tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.discard(connection)
+            writer.close()
+
+    def stats(self) -> dict:
+        table = {}
+        for method, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            row = {f"p{pct}": round(percentile(ordered, pct) * 1000, 3) for pct in PERCENTILES}
+            row["max"] = round(ordered[-1] * 1000, 3)
+            row["count"] = len(ordered)
+            table[method] = row
+        return {"sessions": len(self.sessions), "tickBatches": self.batches, "offloadedBatches": self.offloaded, "latencyMs": table}
+
+
+def print_stats(stats: dict) -> None:
+    print(f"{'method':18s} {'count':>8s} " + " ".join(f"{'p' + str(pct):>8s}" for pct in PERCENTILES) + f" {'max':>8s}  (ms)")
+    for method, row in stats["latencyMs"].items():
+        print(f"{method:18s} {row['count']:8d} " + " ".join(f"{row['p' + str(pct)]:8.2f}" for pct in PERCENTILES) + f" {row['max']:8.2f}")
+    print(f"tick batches    {stats['tickBatches']} ({stats['offloadedBatches']} offloaded)")
+
+
+class Client:
+    """Minimal pipelining client: `send` returns a future resolved by id."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.waiting: dict[int, asyncio.Future] = {}
+        self.next_id = 0
+        self.listener = asyncio.get_running_loop().create_task(self.listen())
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> Client:
+        return cls(*await asyncio.open_connection(host, port, limit=1 << 24))
+
+    async def listen(self) -> None:
+        while line := await self.reader.readline():
+            response = json.loads(line)
+            self.waiting.pop(response["id"]).set_result(response)
+
+    def send(self, method: str, session: str | None = None, **params: object) -> asyncio.Future:
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[self.next_id] = future
+        request = {"id": self.next_id, "method": method, "session": session, "params": params}
+        self.writer.write(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+        return future
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.listener.cancel()
+
+
+async def bench_connection(host: str, port: int, content: Content, seeds: range, ticks: int) -> int:
+    """Drive one game per seed for `ticks` ticks, pipelining every session's requests each tick."""
+    client = await Client.connect(host, port)
+    weapons = sorted(content.weapons, key=lambda weapon_id: float(content.weapons[weapon_id].get("cost") or 0))
+    games = [(await future)["result"] for future in [client.send("newGame", seed=seed) for seed in seeds]]
+    alive = {game["session"]: set(content.datacenters) for game in games}
+    pending = {game["session"]: game["pendingEvents"] for game in games}
+    rng = random.Random(seeds.start)
+    requests = 0
+    for tick in range(ticks):
+        sent: list[tuple[str, str, asyncio.Future]] = []
+        for session, events in pending.items():
+            for event_id in events:
+                choices = content.events[event_id].get("choices") or []
+                if choices:
+                    sent.append((session, "choose", client.send("chooseEventOption", session, eventId=event_id, choiceId=rng.choice(choices)["id"])))
+            if alive[session]:
+                target = rng.choice(sorted(alive[session]))
+                sent.append((session, "attack", client.send("attackDatacenter", session, datacenterId=target, weaponId=weapons[tick % len(weapons)])))
+            sent.append((session, "tick", client.send("resolveTick", session)))
+        requests += len(sent)
+        await asyncio.gather(*(future for _, _, future in sent))
+        for session, kind, future in sent:
+            response = future.result()
+            if not response["ok"]:
+                continue
+            if kind == "attack":
+                alive[session].difference_update(response["result"]["destroyed"])
+            elif kind == "tick":
+                result = response["result"]
+                pending[session] = [] if result["outcome"] else result["pendingEvents"]
+                if result["outcome"]:
+                    alive[session].clear()
+        pending = {session: events for session, events in pending.items() if alive[session]}
+        if not pending:
+            break
+    await client.close()
+    return requests
+
+
+async def bench(content: Content, server: SimServer, sessions: int, ticks: int, connections: int) -> None:
+    listener = await asyncio.start_server(server.handle_client, HOST, 0, limit=1 << 24)
+    port = listener.sockets[0].getsockname()[1]
+    per = -(-sessions // connections)
+    started = time.perf_counter()
+    counts = await asyncio.gather(*(
+        bench_connection(HOST, port, content, range(start, min(start + per, sessions)), ticks)
+        for start in range(0, sessions, per)
+    ))
+    elapsed = time.perf_counter() - started
+    await asyncio.gather(*server.connections)
+    listener.close()
+    await listener.wait_closed()
+    print_stats(server.stats())
+    print(f"OK: {sum(counts)} requests over {sessions} sessions in {elapsed:.1f}s ({sum(counts) / elapsed:.0f} req/s).")
+
+
+async def serve(server: SimServer, host: str, port: int) -> None:
+    listener = await asyncio.start_server(server.handle_client, host, port, limit=1 << 24)
+    print(f"OK: Serving games on {host}:{port} (Ctrl-C to stop).")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve headless games to local bots over newline-delimited JSON.")
+    parser.add_argument("--host", default=HOST, help=f"Interface to listen on (default {HOST}).")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port (default {PORT}).")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes for large tick batches (1: tick on the loop).")
+    parser.add_argument("--offload-at", type=int, default=256, help="Smallest tick batch sent to the workers (default 256).")
+    parser.add_argument("--bench", type=int, metavar="SESSIONS", help="Run a pipelining client against an in-process server instead of serving.")
+    parser.add_argument("--ticks", type=int, default=20, help="Ticks per session in --bench (default 20).")
+    parser.add_argument("--connections", type=int, default=8, help="Client connections in --bench (default 8).")
+    args = parser.parse_args()
+    if args.offload_at <= 0 or (args.bench is not None and (args.bench <= 0 or args.ticks <= 0 or args.connections <= 0)):
+        print("ERROR: --offload-at, --bench, --ticks and --connections must be positive.")
+        sys.exit(1)
+
+    content = load_content()
+    # Workers start on the first offloaded batch, i.e. while the loop and the
+    # pool's feeder threads run; forking then can copy a held lock, so spawn.
+    spawn = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(args.jobs, spawn, init_worker) if args.jobs > 1 else None
+    server = SimServer(content, pool, args.jobs, args.offload_at)
+    try:
+        if args.bench is not None:
+            asyncio.run(bench(content, server, args.bench, args.ticks, args.connections))
+        else:
+            asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        print_stats(server.stats())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
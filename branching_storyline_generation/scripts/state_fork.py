@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Copy-on-write GameState forks for tree search.
+
+`cow_state(state)` wraps a GameState's keyed tables (`datacenters`,
+`inventory`, `seenEvents`) in `CowMap`s; `fork_state` then clones it by
+sharing those tables instead of copying them. A CowMap is a stack of frozen
+layers plus one private dict: forking moves the private dict onto the stack
+(both sides now share it) and gives each side a fresh, empty private dict, so
+a fork costs the same whether the game has 60 datacenters or 60,000. Rows
+are copied into the private dict the first time they are indexed, so a
+branch pays only for the rows it touches; re-index after forking rather than
+keep a row from before the fork, which is shared from then on.
+
+The engine runs on these states unchanged: it indexes (`[]`, `get`,
+`setdefault`) before it writes, and only reads while iterating. Iterating
+yields rows as read-only `MappingProxyType`s, so a write through an
+iterator fails loudly instead of leaking into sibling branches. The short
+`pendingEvents` / `activeTimers` lists are copied per fork (timer dicts are
+never edited in place). `thaw_state` turns a state back into plain dicts for
+saving.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import random
+import sys
+import time
+from collections.abc import Iterator, MutableMapping
+from types import MappingProxyType
+
+from engine import load_content, new_game
+
+COW_TABLES = ("datacenters", "inventory", "seenEvents")
+ROW_TABLES = ("datacenters", "inventory")  # values are row dicts
+COPIED_LISTS = ("pendingEvents", "activeTimers")
+MAX_LAYERS = 8  # flatten deeper stacks so lookups stay short
+_MISSING = object()
+_DELETED = object()
+
+
+class CowMap(MutableMapping):
+    __slots__ = ("_layers", "_own", "_len", "_rows")
+
+    def __init__(self, base: dict | None = None, rows: bool = True) -> None:
+        self._layers: tuple[dict, ...] = (base,) if base else ()
+        self._own: dict = {}
+        self._len = len(base) if base else 0
+        self._rows = rows
+
+    def _shared(self, key: object) -> object:
+        for layer in reversed(self._layers):
+            value = layer.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        return _MISSING
+
+    def __getitem__(self, key: object) -> object:
+        value = self._own.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._shared(key)
+            if value is _MISSING or value is _DELETED:
+                raise KeyError(key)
+            if type(value) is dict:
+                # First touch on this branch: take a private copy of the row.
+                value = self._own[key] = dict(value)
+            return value
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: object, default: object = None) -> object:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key: object, default: object = None) -> object:
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        value = self._own.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._shared(key)
+        return value is not _MISSING and value is not _DELETED
+
+    def __setitem__(self, key: object, value: object) -> None:
+        if key not in self:
+            self._len += 1
+        self._own[key] = value
+
+    def __delitem__(self, key: object) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if self._shared(key) is _MISSING:
+            del self._own[key]
+        else:
+            self._own[key] = _DELETED
+        self._len -= 1
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _merged(self) -> dict:
+        """Newest value per key, in first-insertion order (deleted keys dropped)."""
+        if not self._own and len(self._layers) == 1:
+            return self._layers[0]
+        merged: dict = {}
+        for layer in self._layers:
+            merged.update(layer)
+        merged.update(self._own)
+        if self._len != len(merged):
+            merged = {key: value for key, value in merged.items() if value is not _DELETED}
+        return merged
+
+    def __iter__(self) -> Iterator[object]:
+        return iter(self._merged())
+
+    def items(self) -> Iterator[tuple[object, object]]:  # type: ignore[override]
+        merged = self._merged()
+        return zip(merged, self.values()) if self._rows else iter(merged.items())
+
+    def values(self) -> Iterator[object]:  # type: ignore[override]
+        merged = self._merged()
+        return map(MappingProxyType, merged.values()) if self._rows else iter(merged.values())
+
+    def fork(self) -> CowMap:
+        if self._own:
+            layers = (*self._layers, self._own)
+            if len(layers) > MAX_LAYERS:
+                layers = (self._merged(),)
+            self._layers = layers
+            self._own = {}
+        child = CowMap.__new__(CowMap)
+        child._layers = self._layers
+        child._own = {}
+        child._len = self._len
+        child._rows = self._rows
+        return child
+
+    def thaw(self) -> dict:
+        return {key: dict(value) if type(value) is dict else value for key, value in self._merged().items()}
+
+
+def cow_state(state: dict) -> dict:
+    """Wrap a plain GameState for forking; do not edit `state` itself afterwards."""
+    cow = dict(state)
+    for key in COW_TABLES:
+        cow[key] = CowMap(state[key], rows=key in ROW_TABLES)
+    return cow
+
+
+def fork_state(state: dict) -> dict:
+    """O(1) in the table sizes; copies the top-level scalars and the short lists."""
+    child = state.copy()
+    for key in COW_TABLES:
+        child[key] = state[key].fork()
+    for key in COPIED_LISTS:
+        child[key] = state[key][:]
+    return child
+
+
+def thaw_state(state: dict) -> dict:
+    """Plain-dict GameState (e.g. for json.dumps or a save)."""
+    plain = dict(state)
+    for key in COW_TABLES:
+        plain[key] = state[key].thaw() if isinstance(state[key], CowMap) else copy.deepcopy(state[key])
+    for key in COPIED_LISTS:
+        plain[key] = copy.deepcopy(state[key])
+    return plain
+
+
+def mutate(state: dict, rng: random.Random, dc_ids: list[str]) -> None:
+    """A typical branch step: a few globals, one datacenter, one inventory row, one seen event."""
+    state["heat"] += 1
+    state["funds"] -= 5
+    row = state["datacenters"][rng.choice(dc_ids)]
+    row["health"] = max(0.0, row["health"] - 10)
+    state["inventory"].setdefault("inv:bench", {"id": "inv:bench", "count": 0})["count"] += 1
+    state["seenEvents"][f"ev:bench-{rng.randrange(1000)}"] = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark copy-on-write forks against copy.deepcopy.")
+    parser.add_argument("--forks", type=int, default=200000, help="Forks to time (default 200000).")
+    parser.add_argument("--depth", type=int, default=10, help="Fork chain length before restarting from the root (default 10).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.forks <= 0 or args.depth <= 0:
+        print("ERROR: --forks and --depth must be positive.")
+        sys.exit(1)
+
+    content = load_content()
+    rng = random.Random(args.seed)
+    dc_ids = list(content.datacenters)
+    root = new_game(content, args.seed)
+    for dc_id in dc_ids:
+        root["seenEvents"][f"ev:seen-{dc_id}"] = True
+
+    deep_forks = max(1, args.forks // 100)
+    started = time.perf_counter()
+    state = root
+    for idx in range(deep_forks):
+        state = copy.deepcopy(root if idx % args.depth == 0 else state)
+        mutate(state, rng, dc_ids)
+    deep_time = (time.perf_counter() - started) / deep_forks
+
+    cow_root = cow_state(copy.deepcopy(root))
+    started = time.perf_counter()
+    state = cow_root
+    for idx in range(args.forks):
+        state = fork_state(cow_root if idx % args.depth == 0 else state)
+    fork_time = (time.perf_counter() - started) / args.forks
+
+    started = time.perf_counter()
+    state = cow_root
+    for idx in range(args.forks):
+        state = fork_state(cow_root if idx % args.depth == 0 else state)
+        mutate(state, rng, dc_ids)
+    step_time = (time.perf_counter() - started) / args.forks
+
+    # Sibling isolation: branches from one parent must not see each other's writes.
+    left, right = fork_state(cow_root), fork_state(cow_root)
+    mutate(left, rng, dc_ids)
+    if thaw_state(right) != thaw_state(cow_root) or thaw_state(left) == thaw_state(right):
+        print("ERROR: forks share a write.")
+        sys.exit(1)
+    print(f"copy.deepcopy + step  {deep_time * 1e6:9.2f} us")
+    print(f"fork only             {fork_time * 1e6:9.2f} us  ({1 / fork_time:,.0f} forks/s)")
+    print(f"fork + step           {step_time * 1e6:9.2f} us  ({deep_time / step_time:.0f}x faster than deepcopy)")
+    print(f"OK: {args.forks} forks of a {len(dc_ids)}-datacenter state; siblings stayed isolated.")
+
+
+if __name__ == "__main__":
+    main()
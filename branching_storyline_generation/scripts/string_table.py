@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Pack all content into one file with a shared string table, load it lazily.
+
+Every string (values and object keys alike) is stored once in `strings`,
+most frequent first so common references stay short; every distinct key
+order is stored once in `shapes`. Nodes encode as:
+
+    string          -> its index in `strings` (a bare number)
+    number          -> [-2, number]
+    array           -> [-1, item, ...]
+    object          -> [shape index, value, ...]   (values in shape key order)
+    true/false/null -> themselves
+
+A bare number is always a string index and a list's first element says what
+it is, so decoding never depends on telling `5` from `5.0`: a JavaScript
+client (one number type) reads the file as well as Python does, and content
+numbers are copied through as written, so large integers stay exact.
+
+`PackedContent` parses that (mostly integers) once and hands out read-only
+`LazyObject`/`LazyList` views that decode a field the first time it is read.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+
+from build_output import BUILD_DIR, write_compressed
+from content_loader import AGENTS_PATH, CONSTANTS_PATH, DATACENTERS_PATH, EVENTS_PATH, WEAPONS_PATH, load_json
+
+PACKED_PATH = BUILD_DIR / "content.strings.json"
+SOURCES = {
+    "constants": CONSTANTS_PATH,
+    "weapons": WEAPONS_PATH,
+    "agents": AGENTS_PATH,
+    "events": EVENTS_PATH,
+    "datacenters": DATACENTERS_PATH,
+}
+ARRAY = -1
+NUMBER = -2
+FORMAT = "string-table/2"
+ROOT = object()  # materialize() default; None is a real node (JSON null)
+
+
+def pack(docs: dict[str, object]) -> dict:
+    counts: Counter = Counter()
+    key_orders: Counter = Counter()
+
+    def count(node: object) -> None:
+        if isinstance(node, str):
+            counts[node] += 1
+        elif isinstance(node, dict):
+            counts.update(node.keys())
+            key_orders[tuple(node)] += 1
+            for value in node.values():
+                count(value)
+        elif isinstance(node, list):
+            for item in node:
+                count(item)
+
+    count(docs)
+    strings = [text for text, _ in counts.most_common()]
+    index = {text: position for position, text in enumerate(strings)}
+    shapes = [keys for keys, _ in key_orders.most_common()]
+    shape_index = {keys: position for position, keys in enumerate(shapes)}
+
+    def encode(node: object) -> object:
+        if isinstance(node, str):
+            return index[node]
+        if isinstance(node, bool) or node is None:
+            return node
+        if isinstance(node, (int, float)):
+            return [NUMBER, node]
+        if isinstance(node, list):
+            return [ARRAY, *(encode(item) for item in node)]
+        return [shape_index[tuple(node)], *(encode(value) for value in node.values())]
+
+    return {
+        "format": FORMAT,
+        "strings": strings,
+        "shapes": [[index[key] for key in keys] for keys in shapes],
+        "root": encode(docs),
+    }
+
+
+class LazyObject(Mapping):
+    __slots__ = ("_table", "_node", "_shape", "_keys", "_cache")
+
+    def __init__(self, table: "PackedContent", node: list) -> None:
+        self._table = table
+        self._node = node
+        self._shape = int(node[0])
+        self._keys = table.shape_keys[self._shape]
+        self._cache: dict[str, object] = {}
+
+    def __getitem__(self, key: str) -> object:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        position = self._table.shape_positions[self._shape][key]
+        value = self._cache[key] = self._table.view(self._node[position + 1])
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"LazyObject({list(self._keys)!r})"
+
+
+class LazyList(Sequence):
+    __slots__ = ("_table", "_node", "_cache")
+
+    def __init__(self, table: "PackedContent", node: list) -> None:
+        self._table = table
+        self._node = node
+        self._cache: dict[int, object] = {}
+
+    def __getitem__(self, position):  # type: ignore[override]
+        if isinstance(position, slice):
+            return [self[item] for item in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        if position not in self._cache:
+            self._cache[position] = self._table.view(self._node[position + 1])
+        return self._cache[position]
+
+    def __len__(self) -> int:
+        return len(self._node) - 1
+
+
+class PackedContent(Mapping):
+    """Top-level view of a packed file: name -> lazily decoded document."""
+
+    def __init__(self, packed: dict) -> None:
+        if packed.get("format") != FORMAT:
+            raise ValueError(f"unsupported packed format {packed.get('format')}")
+        self.strings: list[str] = packed["strings"]
+        self.shape_keys = [tuple(self.strings[int(key)] for key in shape) for shape in packed["shapes"]]
+        self.shape_positions = [{key: position for position, key in enumerate(keys)} for keys in self.shape_keys]
+        self.root = LazyObject(self, packed["root"])
+
+    @classmethod
+    def load(cls, path: Path = PACKED_PATH) -> "PackedContent":
+        return cls(load_json(path))
+
+    def view(self, node: object) -> object:
+        if type(node) is int:
+            return self.strings[node]
+        if type(node) is list:
+            if node[0] == NUMBER:
+                return node[1]
+            if node[0] == ARRAY:
+                return LazyList(self, node)
+            return LazyObject(self, node)
+        if type(node) is float:
+            return self.strings[int(node)]  # parsed by a reader that makes every number a float
+        return node
+
+    def materialize(self, node: object = ROOT) -> object:
+        """Decode eagerly into plain dicts and lists."""
+        node = self.root._node if node is ROOT else node
+        if type(node) is int:
+            return self.strings[node]
+        if type(node) is list:
+            if node[0] == NUMBER:
+                return node[1]
+            if node[0] == ARRAY:
+                return [self.materialize(item) for item in node[1:]]
+            return {key: self.materialize(value) for key, value in zip(self.shape_keys[int(node[0])], node[1:])}
+        if type(node) is float:
+            return self.strings[int(node)]
+        return node
+
+    def __getitem__(self, name: str) -> object:
+        return self.root[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.root)
+
+    def __len__(self) -> int:
+        return len(self.root)
+
+
+def measure(load) -> tuple[float, int, object]:
+    """Best-of-5 load time in ms and bytes still allocated by the result."""
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        load()
+        timings.append((time.perf_counter() - started) * 1000)
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return min(timings), retained, result
+
+
+def touch_events(docs) -> int:
+    """What startup reads: every event's triggers, no bodies or choices."""
+    return sum(len(event["triggers"]) for event in docs["events"]["events"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pack content into a shared string table and report savings.")
+    parser.add_argument("--output", "-o", type=Path, default=PACKED_PATH)
+    parser.add_argument("--report", action="store_true", help="Compare load time and memory with the JSON files.")
+    args = parser.parse_args()
+
+    docs = {name: load_json(path) for name, path in SOURCES.items()}
+    packed = pack(docs)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(packed, separators=(",", ":"), ensure_ascii=False) + "\n", encoding="utf-8")
+    write_compressed(args.output)
+    if PackedContent.load(args.output).materialize() != docs:
+        print("ERROR: Packed content does not round-trip.")
+        sys.exit(1)
+
+    if args.report:
+        source_bytes = sum(path.stat().st_size for path in SOURCES.values())
+        json_ms, json_mem, json_docs = measure(lambda: {name: json.loads(path.read_bytes()) for name, path in SOURCES.items()})
+        packed_ms, packed_mem, packed_docs = measure(lambda: PackedContent(json.loads(args.output.read_bytes())))
+        assert touch_events(json_docs) == touch_events(packed_docs)
+        print(f"{'':22s} {'bytes':>10s} {'load ms':>9s} {'retained':>11s}")
+        print(f"{'JSON files':22s} {source_bytes:10,d} {json_ms:9.2f} {json_mem:11,d}")
+        print(f"{'string table':22s} {args.output.stat().st_size:10,d} {packed_ms:9.2f} {packed_mem:11,d}")
+    print(f"OK: Wrote {args.output} ({len(packed['strings'])} strings, {len(packed['shapes'])} shapes).")
+
+
+if __name__ == "__main__":
+    main()
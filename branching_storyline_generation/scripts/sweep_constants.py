@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Sweep constants.json values and map win rate / time-to-AGI response surfaces.
+
+Each `--param NAME=LOW:HIGH` adds an axis. Cells are sampled with a Latin
+hypercube (`--samples`) or a full grid (`--grid` points per axis), and every
+cell plays seeded autoplay.py games in rounds of `--batch`. All cells use the
+same seeds (common random numbers), so differences between cells come from
+the constants rather than the dice. A cell stops early once the 95% Wilson
+interval on its win rate and the 95% interval on its mean game length are
+both narrower than the targets; otherwise it runs up to `--max-games`.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from autoplay import MAX_TICKS, play, with_constants
+from build_output import BUILD_DIR
+from engine import Content, load_content
+
+SWEEP_PATH = BUILD_DIR / "sweep.csv"
+Z95 = 1.959964
+_content: Content | None = None
+
+
+@dataclass
+class Cell:
+    params: dict[str, float]
+    games: int = 0
+    wins: int = 0
+    ticks: list[int] = field(default_factory=list)
+    agi_ticks: list[int] = field(default_factory=list)  # game length of lost games
+    event_gaps: list[int] = field(default_factory=list)
+
+    def add(self, results: list[tuple[str, int, int]]) -> None:
+        for result, ticks, gap in results:
+            self.games += 1
+            self.wins += result == "won"
+            self.ticks.append(ticks)
+            self.event_gaps.append(gap)
+            if result == "lost":
+                self.agi_ticks.append(ticks)
+
+    def win_interval(self) -> tuple[float, float]:
+        return wilson(self.wins, self.games)
+
+    def ticks_half_width(self) -> float:
+        if self.games < 2:
+            return math.inf
+        return Z95 * statistics.stdev(self.ticks) / math.sqrt(self.games)
+
+    def converged(self, win_ci: float, ticks_ci: float) -> bool:
+        low, high = self.win_interval()
+        mean = statistics.fmean(self.ticks) if self.ticks else 0.0
+        return (high - low) / 2 <= win_ci and self.ticks_half_width() <= ticks_ci * max(mean, 1.0)
+
+    def row(self) -> dict[str, object]:
+        low, high = self.win_interval()
+        return {
+            **{name: f"{value:g}" for name, value in self.params.items()},
+            "games": self.games,
+            "winRate": round(self.wins / self.games, 4),
+            "winRateLow": round(low, 4),
+            "winRateHigh": round(high, 4),
+            "meanTicks": round(statistics.fmean(self.ticks), 2),
+            "medianTicks": statistics.median(self.ticks),
+            "medianTicksToAgi": statistics.median(self.agi_ticks) if self.agi_ticks else "",
+            "medianEventGap": statistics.median(self.event_gaps),
+        }
+
+
+def wilson(successes: int, trials: int) -> tuple[float, float]:
+    if trials == 0:
+        return 0.0, 1.0
+    share = successes / trials
+    denominator = 1 + Z95 ** 2 / trials
+    center = (share + Z95 ** 2 / (2 * trials)) / denominator
+    spread = Z95 * math.sqrt(share * (1 - share) / trials + Z95 ** 2 / (4 * trials ** 2)) / denominator
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+def parse_param(text: str, constants: dict) -> tuple[str, float, float]:
+    name, _, bounds = text.partition("=")
+    low, _, high = bounds.partition(":")
+    if not isinstance(constants.get(name), (int, float)):
+        raise ValueError(f"{name!r} is not a numeric constant")
+    try:
+        low_value, high_value = float(low), float(high)
+    except ValueError:
+        raise ValueError(f"expected NAME=LOW:HIGH, got {text!r}") from None
+    if not low_value < high_value:
+        raise ValueError(f"expected LOW < HIGH, got {text!r}")
+    return name, low_value, high_value
+
+
+def latin_hypercube(axes: list[tuple[str, float, float]], samples: int, rng: random.Random) -> list[dict[str, float]]:
+    """One sample per stratum on every axis, strata paired at random."""
+    columns = []
+    for _, low, high in axes:
+        strata = [(index + rng.random()) / samples for index in range(samples)]
+        rng.shuffle(strata)
+        columns.append([low + (high - low) * value for value in strata])
+    return [{axis[0]: column[row] for axis, column in zip(axes, columns)} for row in range(samples)]
+
+
+def full_grid(axes: list[tuple[str, float, float]], points: int) -> list[dict[str, float]]:
+    ticks = [
+        [low + (high - low) * index / (points - 1) for index in range(points)] if points > 1 else [low]
+        for _, low, high in axes
+    ]
+    return [dict(zip((axis[0] for axis in axes), values)) for values in itertools.product(*ticks)]
+
+
+def init_worker() -> None:
+    global _content
+    _content = load_content()
+
+
+def play_batch(params: dict[str, float], seeds: range, max_ticks: int) -> list[tuple[str, int, int]]:
+    assert _content is not None, "init_worker() was not called"
+    content = with_constants(_content, params)
+    results = [play(content, seed, max_ticks) for seed in seeds]
+    return [(result.outcome, result.ticks, result.max_event_gap) for result in results]
+
+
+def run_sweep(
+    cells: list[Cell], seed: int, batch: int, min_games: int, max_games: int,
+    win_ci: float, ticks_ci: float, max_ticks: int, jobs: int,
+) -> None:
+    """Play rounds until every cell has converged or hit `max_games`."""
+
+    def finished(cell: Cell) -> bool:
+        if cell.games >= max_games:
+            return True
+        return cell.games >= min_games and cell.converged(win_ci, ticks_ci)
+
+    def seeds(cell: Cell) -> range:
+        return range(seed + cell.games, seed + min(cell.games + batch, max_games))
+
+    if jobs <= 1:
+        init_worker()
+        for cell in cells:
+            while not finished(cell):
+                cell.add(play_batch(cell.params, seeds(cell), max_ticks))
+        return
+
+    with ProcessPoolExecutor(jobs, initializer=init_worker) as pool:
+        pending = {}
+        queue = list(cells)
+        while queue or pending:
+            # Keep about two batches per worker in flight; a cell has at most one.
+            while queue and len(pending) < 2 * jobs:
+                cell = queue.pop(0)
+                pending[pool.submit(play_batch, cell.params, seeds(cell), max_ticks)] = cell
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                cell = pending.pop(future)
+                cell.add(future.result())
+                if not finished(cell):
+                    queue.append(cell)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep constants.json ranges with seeded bot games.")
+    parser.add_argument("--param", "-p", action="append", default=[], metavar="NAME=LOW:HIGH", help="Constant to vary (repeatable).")
+    sampling = parser.add_mutually_exclusive_group()
+    sampling.add_argument("--samples", type=int, default=32, help="Latin hypercube cells (default 32).")
+    sampling.add_argument("--grid", type=int, help="Full grid with this many points per axis instead.")
+    parser.add_argument("--seed", type=int, default=0, help="First game seed; also seeds the sampler.")
+    parser.add_argument("--batch", type=int, default=16, help="Games per cell per round (default 16).")
+    parser.add_argument("--min-games", type=int, default=32, help="Games before a cell may stop early (default 32).")
+    parser.add_argument("--max-games", type=int, default=512, help="Games per cell at most (default 512).")
+    parser.add_argument("--win-ci", type=float, default=0.05, help="Target half-width of the win-rate interval (default 0.05).")
+    parser.add_argument("--ticks-ci", type=float, default=0.05, help="Target half-width of mean game length, relative (default 0.05).")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS, help=f"Game length cap (default {MAX_TICKS}).")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--output", "-o", type=Path, default=SWEEP_PATH, help="Response surface CSV.")
+    args = parser.parse_args()
+
+    constants = load_content().constants
+    try:
+        axes = [parse_param(text, constants) for text in args.param]
+    except ValueError as exc:
+        print(f"ERROR: {exc}.")
+        sys.exit(1)
+    if not axes:
+        print("ERROR: Give at least one --param NAME=LOW:HIGH.")
+        sys.exit(1)
+    if args.batch <= 0 or args.max_games < 1 or args.min_games > args.max_games:
+        print("ERROR: --batch and --max-games must be positive and --min-games at most --max-games.")
+        sys.exit(1)
+    if args.samples < 1 or (args.grid is not None and args.grid < 1):
+        print("ERROR: --samples and --grid must be at least 1.")
+        sys.exit(1)
+
+    if args.grid is not None:
+        points = full_grid(axes, args.grid)
+    else:
+        points = latin_hypercube(axes, args.samples, random.Random(args.seed))
+    cells = [Cell(params) for params in points]
+    started = time.perf_counter()
+    run_sweep(
+        cells, args.seed, args.batch, args.min_games, args.max_games,
+        args.win_ci, args.ticks_ci, args.max_ticks, args.jobs,
+    )
+    elapsed = time.perf_counter() - started
+
+    rows = [cell.row() for cell in cells]
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w", newline="", encoding="utf-8") as fp:
+        writer = csv.DictWriter(fp, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    games = sum(cell.games for cell in cells)
+    early = sum(cell.games < args.max_games for cell in cells)
+    print(f"OK: {len(cells)} cells, {games} games ({early} cells stopped early) in {elapsed:.1f}s; wrote {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
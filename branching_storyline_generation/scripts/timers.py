@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Binary-heap storage for `GameState.activeTimers`.
+
+The saved shape stays spec.md's array of `{id, resumeTick, payload?}`; the
+array is simply kept in heap order by (resumeTick, id), so it is still plain
+JSON, the next due timer is always `activeTimers[0]`, and the engine pops due
+timers in O(log n) each instead of filtering the whole array every tick.
+Any array is put back in heap order with `heapify_timers` (saves written
+before this change, or code that edits the list directly).
+
+Ids are not unique: every onTimer trigger of an event sits on the heap under
+the event id with payload `{"trigger": <index>}`, next to any plain timer
+for that id. A timer is therefore named by its `timer_key`, (id, trigger
+index or None). `TimerQueue` wraps such a list with a key -> position index
+for O(log n) cancellation; while one wraps a state's list, change the timers
+only through it. The module-level helpers need no index: `cancel_timer`
+finds the key with a linear search and then repairs the heap in O(log n).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+
+def _key(timer: dict) -> tuple:
+    return (timer["resumeTick"], timer["id"])
+
+
+def timer_key(timer: dict) -> tuple[str, int | None]:
+    """(id, onTimer trigger index or None): unique among pending timers."""
+    payload = timer.get("payload")
+    trigger = payload.get("trigger") if isinstance(payload, dict) else None
+    return (timer["id"], trigger)
+
+
+def _sift_up(timers: list[dict], pos: int, index: dict[tuple, int] | None = None) -> int:
+    timer = timers[pos]
+    key = _key(timer)
+    while pos > 0:
+        parent = (pos - 1) >> 1
+        if _key(timers[parent]) <= key:
+            break
+        timers[pos] = timers[parent]
+        if index is not None:
+            index[timer_key(timers[pos])] = pos
+        pos = parent
+    timers[pos] = timer
+    if index is not None:
+        index[timer_key(timer)] = pos
+    return pos
+
+
+def _sift_down(timers: list[dict], pos: int, index: dict[tuple, int] | None = None) -> int:
+    size = len(timers)
+    timer = timers[pos]
+    key = _key(timer)
+    while True:
+        child = 2 * pos + 1
+        if child >= size:
+            break
+        if child + 1 < size and _key(timers[child + 1]) < _key(timers[child]):
+            child += 1
+        if key <= _key(timers[child]):
+            break
+        timers[pos] = timers[child]
+        if index is not None:
+            index[timer_key(timers[pos])] = pos
+        pos = child
+    timers[pos] = timer
+    if index is not None:
+        index[timer_key(timer)] = pos
+    return pos
+
+
+def _remove_at(timers: list[dict], pos: int, index: dict[tuple, int] | None = None) -> dict:
+    removed = timers[pos]
+    last = timers.pop()
+    if index is not None:
+        index.pop(timer_key(removed), None)
+    if pos < len(timers):
+        timers[pos] = last
+        if _sift_up(timers, pos, index) == pos:
+            _sift_down(timers, pos, index)
+    return removed
+
+
+def heapify_timers(timers: list[dict]) -> list[dict]:
+    for pos in reversed(range(len(timers) // 2)):
+        _sift_down(timers, pos)
+    return timers
+
+
+def make_timer(timer_id: str, resume_tick: int, payload: object = None) -> dict:
+    timer = {"id": timer_id, "resumeTick": int(resume_tick)}
+    if payload is not None:
+        timer["payload"] = payload
+    return timer
+
+
+def push_timer(timers: list[dict], timer: dict) -> None:
+    timers.append(timer)
+    _sift_up(timers, len(timers) - 1)
+
+
+def pop_due(timers: list[dict], tick: int) -> list[dict]:
+    """Remove and return every timer with resumeTick <= tick, earliest first."""
+    due = []
+    while timers and timers[0]["resumeTick"] <= tick:
+        due.append(_remove_at(timers, 0))
+    return due
+
+
+def cancel_timer(timers: list[dict], timer_id: str, trigger: int | None = None) -> bool:
+    """Remove the timer keyed (timer_id, trigger); False if none is pending."""
+    for pos, timer in enumerate(timers):
+        if timer_key(timer) == (timer_id, trigger):
+            _remove_at(timers, pos)
+            return True
+    return False
+
+
+class TimerQueue:
+    """Indexed heap over a timers list: schedule/cancel O(log n), peek O(1).
+
+    Timers are keyed by `timer_key`, so the onTimer triggers of one event
+    are separate entries; scheduling a key that is already pending
+    reschedules it. `in` takes a key tuple or a bare id (any timer for it).
+    """
+
+    def __init__(self, timers: list[dict] | None = None) -> None:
+        self.timers = heapify_timers(timers if timers is not None else [])
+        self.index = {timer_key(timer): pos for pos, timer in enumerate(self.timers)}
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, tuple):
+            return key in self.index
+        return any(timer_id == key for timer_id, _ in self.index)
+
+    def peek(self) -> int | None:
+        """Tick of the next due timer, or None when nothing is pending."""
+        return self.timers[0]["resumeTick"] if self.timers else None
+
+    def schedule(self, timer_id: str, resume_tick: int, payload: object = None) -> None:
+        timer = make_timer(timer_id, resume_tick, payload)
+        self.cancel(*timer_key(timer))
+        self.timers.append(timer)
+        _sift_up(self.timers, len(self.timers) - 1, self.index)
+
+    def cancel(self, timer_id: str, trigger: int | None = None) -> bool:
+        pos = self.index.get((timer_id, trigger))
+        if pos is None:
+            return False
+        _remove_at(self.timers, pos, self.index)
+        return True
+
+    def pop_due(self, tick: int) -> list[dict]:
+        due = []
+        while self.timers and self.timers[0]["resumeTick"] <= tick:
+            due.append(_remove_at(self.timers, 0, self.index))
+        return due
+
+    def to_json(self) -> list[dict]:
+        """The heap array itself; it already is the save format."""
+        return self.timers
+
+
+def benchmark(count: int, ticks: int, seed: int) -> tuple[float, float, int]:
+    rng = random.Random(seed)
+    timers = [make_timer(f"ev:timer-{idx}", rng.randrange(1, ticks + 1)) for idx in range(count)]
+
+    # The previous engine loop: filter the whole array every tick.
+    scan = [dict(timer) for timer in timers]
+    started = time.perf_counter()
+    fired_scan = 0
+    for tick in range(1, ticks + 1):
+        due = [timer for timer in scan if timer["resumeTick"] <= tick]
+        if due:
+            scan = [timer for timer in scan if timer["resumeTick"] > tick]
+            fired_scan += len(due)
+    scan_time = time.perf_counter() - started
+
+    heap = heapify_timers([dict(timer) for timer in timers])
+    started = time.perf_counter()
+    fired_heap = 0
+    for tick in range(1, ticks + 1):
+        fired_heap += len(pop_due(heap, tick))
+    heap_time = time.perf_counter() - started
+    assert fired_scan == fired_heap == count
+    return scan_time, heap_time, fired_heap
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark heap-ordered activeTimers against the linear scan.")
+    parser.add_argument("--timers", type=int, default=10000, help="Pending timers (default 10000).")
+    parser.add_argument("--ticks", type=int, default=1000, help="Ticks the timers are spread over (default 1000).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.timers <= 0 or args.ticks <= 0:
+        print("ERROR: --timers and --ticks must be positive.")
+        sys.exit(1)
+
+    scan_time, heap_time, fired = benchmark(args.timers, args.ticks, args.seed)
+    print(f"linear scan  {scan_time * 1000:9.1f} ms  ({scan_time / args.ticks * 1e6:8.1f} us/tick)")
+    print(f"binary heap  {heap_time * 1000:9.1f} ms  ({heap_time / args.ticks * 1e6:8.1f} us/tick)")
+    print(f"OK: {fired} timers fired over {args.ticks} ticks; heap {scan_time / max(heap_time, 1e-9):.0f}x faster.")
+
+
+if __name__ == "__main__":
+    main()
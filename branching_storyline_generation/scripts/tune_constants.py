@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Search constants.json values that hit balance targets with CMA-ES.
+
+Targets are a win rate, a median game length and a ceiling on event downtime
+(the median over games of the longest run of ticks with no new event), all
+measured with autoplay.py games. The optimizer is a plain CMA-ES over the
+chosen constants scaled to [0, 1] inside their `--param` bounds; candidates
+outside the box are clipped before they are played.
+
+Every evaluated point is appended to `build/tune-cache.jsonl`, keyed by a
+hash of the content files, the simulation sources (engine.py, autoplay.py
+and the modules they play through), the full constants dict and the game
+settings. The optimizer is seeded, so a rerun or a restart after an
+interruption proposes the same points and replays them from the cache
+instead of re-simulating; only content, code or setting changes cause
+fresh games.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from autoplay import MAX_TICKS
+from build_output import BUILD_DIR
+from content_loader import (
+    AGENTS_PATH,
+    CONSTANTS_PATH,
+    DATACENTERS_PATH,
+    EVENTS_PATH,
+    ROOT,
+    WEAPONS_PATH,
+    digest,
+    load_json,
+)
+from sweep_constants import init_worker, parse_param, play_batch
+
+CACHE_PATH = BUILD_DIR / "tune-cache.jsonl"
+TUNED_PATH = BUILD_DIR / "tuned-constants.json"
+SCRIPTS_DIR = ROOT / "scripts"
+# The game rules, the bot, and the modules they play through (timers, inventory index, event chunks).
+SIM_SOURCES = ("engine.py", "autoplay.py", "timers.py", "inventory_index.py", "event_chunks.py")
+BATCH = 16
+
+
+@dataclass
+class Targets:
+    win_rate: float | None
+    median_ticks: float | None
+    max_event_gap: float | None
+
+    def loss(self, metrics: dict[str, float]) -> float:
+        """Squared misses in natural units: 5 points of win rate, 10% of the
+        tick target and one tick of downtime each cost 1."""
+        total = 0.0
+        if self.win_rate is not None:
+            total += ((metrics["winRate"] - self.win_rate) / 0.05) ** 2
+        if self.median_ticks is not None:
+            total += ((metrics["medianTicks"] - self.median_ticks) / (0.1 * self.median_ticks)) ** 2
+        if self.max_event_gap is not None:
+            total += max(0.0, metrics["medianEventGap"] - self.max_event_gap) ** 2
+        return total
+
+
+class EvaluationCache:
+    """Append-only JSONL of {key, params, metrics}; the key covers everything
+    a game result depends on."""
+
+    def __init__(self, path: Path, content_hash: str, sources_hash: str) -> None:
+        self.path = path
+        self.content_hash = content_hash
+        self.sources_hash = sources_hash
+        self.entries: dict[str, dict] = {}
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries[entry["key"]] = entry["metrics"]
+        self.hits = 0
+
+    def key(self, constants: dict, games: int, seed: int, max_ticks: int) -> str:
+        settings = {"games": games, "seed": seed, "maxTicks": max_ticks}
+        return digest({
+            "content": self.content_hash, "sources": self.sources_hash, "constants": constants, "settings": settings,
+        })
+
+    def get(self, key: str) -> dict | None:
+        metrics = self.entries.get(key)
+        self.hits += metrics is not None
+        return metrics
+
+    def put(self, key: str, params: dict[str, float], metrics: dict) -> None:
+        self.entries[key] = metrics
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as fp:
+            fp.write(json.dumps({"key": key, "params": params, "metrics": metrics}) + "\n")
+
+
+def content_hash() -> str:
+    """Hash of every content file except constants (those are hashed per point)."""
+    return digest({path.name: load_json(path) for path in (WEAPONS_PATH, AGENTS_PATH, EVENTS_PATH, DATACENTERS_PATH)})
+
+
+def sources_hash() -> str:
+    """Hash of the scripts a game result comes from, so rule or bot changes miss the cache."""
+    return digest({name: (SCRIPTS_DIR / name).read_text(encoding="utf-8") for name in SIM_SOURCES})
+
+
+def summarize(results: list[tuple[str, int, int]]) -> dict[str, float]:
+    return {
+        "games": len(results),
+        "winRate": sum(outcome == "won" for outcome, _, _ in results) / len(results),
+        "medianTicks": statistics.median(ticks for _, ticks, _ in results),
+        "medianEventGap": statistics.median(gap for _, _, gap in results),
+    }
+
+
+def symmetric_eigen(matrix: list[list[float]], sweeps: int = 50) -> tuple[list[float], list[list[float]]]:
+    """Cyclic Jacobi rotations; returns eigenvalues and eigenvectors as columns."""
+    n = len(matrix)
+    a = [row[:] for row in matrix]
+    vectors = [[float(i == j) for j in range(n)] for i in range(n)]
+    for _ in range(sweeps):
+        off = sum(a[i][j] ** 2 for i in range(n) for j in range(n) if i != j)
+        if off < 1e-22:
+            break
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                if abs(a[p][q]) < 1e-30:
+                    continue
+                theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+                t = math.copysign(1.0, theta) / (abs(theta) + math.sqrt(theta * theta + 1))
+                c = 1 / math.sqrt(t * t + 1)
+                s = t * c
+                for k in range(n):
+                    akp, akq = a[k][p], a[k][q]
+                    a[k][p], a[k][q] = c * akp - s * akq, s * akp + c * akq
+                for k in range(n):
+                    apk, aqk = a[p][k], a[q][k]
+                    a[p][k], a[q][k] = c * apk - s * aqk, s * apk + c * aqk
+                for k in range(n):
+                    vkp, vkq = vectors[k][p], vectors[k][q]
+                    vectors[k][p], vectors[k][q] = c * vkp - s * vkq, s * vkp + c * vkq
+    return [a[i][i] for i in range(n)], vectors
+
+
+class CMAES:
+    """Textbook (mu/mu_w, lambda)-CMA-ES (Hansen's tutorial defaults)."""
+
+    def __init__(self, mean: list[float], sigma: float, rng: random.Random, population: int | None = None) -> None:
+        n = self.n = len(mean)
+        self.mean = list(mean)
+        self.sigma = sigma
+        self.rng = rng
+        self.lam = population or 4 + int(3 * math.log(n))
+        self.mu = self.lam // 2
+        raw = [math.log(self.mu + 0.5) - math.log(i + 1) for i in range(self.mu)]
+        self.weights = [w / sum(raw) for w in raw]
+        self.mueff = 1 / sum(w * w for w in self.weights)
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+        self.pc = [0.0] * n
+        self.ps = [0.0] * n
+        self.C = [[float(i == j) for j in range(n)] for i in range(n)]
+        self.generation = 0
+        self._decompose()
+
+    def _decompose(self) -> None:
+        values, self.B = symmetric_eigen(self.C)
+        self.D = [math.sqrt(max(value, 1e-20)) for value in values]
+
+    def ask(self) -> list[list[float]]:
+        samples = []
+        for _ in range(self.lam):
+            z = [self.rng.gauss(0.0, 1.0) for _ in range(self.n)]
+            y = [sum(self.B[i][j] * self.D[j] * z[j] for j in range(self.n)) for i in range(self.n)]
+            samples.append([m + self.sigma * yi for m, yi in zip(self.mean, y)])
+        return samples
+
+    def tell(self, samples: list[list[float]], losses: list[float]) -> None:
+        n = self.n
+        ranked = [samples[idx] for idx in sorted(range(len(samples)), key=lambda idx: losses[idx])[: self.mu]]
+        old = self.mean
+        self.mean = [sum(w * x[i] for w, x in zip(self.weights, ranked)) for i in range(n)]
+        step = [(new - prev) / self.sigma for new, prev in zip(self.mean, old)]
+        # C^-1/2 * step = B * D^-1 * B^T * step
+        projected = [sum(self.B[k][i] * step[k] for k in range(n)) / self.D[i] for i in range(n)]
+        whitened = [sum(self.B[i][k] * projected[k] for k in range(n)) for i in range(n)]
+        self.ps = [
+            (1 - self.cs) * p + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * w
+            for p, w in zip(self.ps, whitened)
+        ]
+        self.generation += 1
+        ps_norm = math.sqrt(sum(p * p for p in self.ps))
+        hsig = ps_norm / math.sqrt(1 - (1 - self.cs) ** (2 * self.generation)) / self.chi_n < 1.4 + 2 / (n + 1)
+        self.pc = [
+            (1 - self.cc) * p + (math.sqrt(self.cc * (2 - self.cc) * self.mueff) * s if hsig else 0.0)
+            for p, s in zip(self.pc, step)
+        ]
+        deviations = [[(x[i] - prev) / self.sigma for i, prev in enumerate(old)] for x in ranked]
+        for i in range(n):
+            for j in range(n):
+                rank_mu = sum(w * d[i] * d[j] for w, d in zip(self.weights, deviations))
+                correction = 0.0 if hsig else self.cc * (2 - self.cc) * self.C[i][j]
+                self.C[i][j] = (
+                    (1 - self.c1 - self.cmu) * self.C[i][j]
+                    + self.c1 * (self.pc[i] * self.pc[j] + correction)
+                    + self.cmu * rank_mu
+                )
+        self.sigma *= math.exp((self.cs / self.damps) * (ps_norm / self.chi_n - 1))
+        self._decompose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tune constants.json toward balance targets with CMA-ES.")
+    parser.add_argument("--param", "-p", action="append", default=[], metavar="NAME=LOW:HIGH", help="Constant to tune (repeatable).")
+    parser.add_argument("--win-rate", type=float, help="Target win rate, e.g. 0.45.")
+    parser.add_argument("--median-ticks", type=float, help="Target median game length in ticks.")
+    parser.add_argument("--max-event-gap", type=float, help="Ceiling on the median longest stretch without a new event.")
+    parser.add_argument("--games", type=int, default=64, help="Seeded games per evaluated point (default 64).")
+    parser.add_argument("--generations", type=int, default=20, help="CMA-ES generations (default 20).")
+    parser.add_argument("--population", type=int, help="Candidates per generation (default 4 + 3 ln n).")
+    parser.add_argument("--sigma", type=float, default=0.25, help="Initial step size as a share of each range (default 0.25).")
+    parser.add_argument("--seed", type=int, default=0, help="Seeds both the optimizer and the games.")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS, help=f"Game length cap (default {MAX_TICKS}).")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH, help="Evaluation cache (JSONL).")
+    parser.add_argument("--output", "-o", type=Path, default=TUNED_PATH, help="Where to write the best constants.")
+    args = parser.parse_args()
+
+    constants = load_json(CONSTANTS_PATH)
+    try:
+        axes = [parse_param(text, constants) for text in args.param]
+    except ValueError as exc:
+        print(f"ERROR: {exc}.")
+        sys.exit(1)
+    targets = Targets(args.win_rate, args.median_ticks, args.max_event_gap)
+    if not axes or targets == Targets(None, None, None):
+        print("ERROR: Give at least one --param NAME=LOW:HIGH and one target.")
+        sys.exit(1)
+
+    cache = EvaluationCache(args.cache, content_hash(), sources_hash())
+    pool = ProcessPoolExecutor(args.jobs, initializer=init_worker) if args.jobs > 1 else None
+    if pool is None:
+        init_worker()
+
+    def to_params(point: list[float]) -> dict[str, float]:
+        # Round so the cache key does not depend on float noise below display precision.
+        return {
+            name: float(f"{low + (high - low) * min(1.0, max(0.0, value)):.6g}")
+            for (name, low, high), value in zip(axes, point)
+        }
+
+    def evaluate(generation: list[dict[str, float]]) -> list[dict]:
+        keys = [cache.key({**constants, **params}, args.games, args.seed, args.max_ticks) for params in generation]
+        metrics: list[dict | None] = [cache.get(key) for key in keys]
+        jobs = [
+            (idx, range(start, min(start + BATCH, args.seed + args.games)))
+            for idx, found in enumerate(metrics) if found is None
+            for start in range(args.seed, args.seed + args.games, BATCH)
+        ]
+        calls = [(generation[idx], seeds, args.max_ticks) for idx, seeds in jobs]
+        batches = pool.map(play_batch, *zip(*calls)) if pool and calls else [play_batch(*call) for call in calls]
+        results: dict[int, list] = {}
+        for (idx, _), batch in zip(jobs, batches):
+            results.setdefault(idx, []).extend(batch)
+        for idx, batch in results.items():
+            metrics[idx] = summarize(batch)
+            cache.put(keys[idx], generation[idx], metrics[idx])
+        return metrics  # type: ignore[return-value]
+
+    started = time.perf_counter()
+    start_point = [(float(constants[name]) - low) / (high - low) for name, low, high in axes]
+    optimizer = CMAES([min(1.0, max(0.0, value)) for value in start_point], args.sigma, random.Random(args.seed), args.population)
+    best: tuple[float, dict, dict] | None = None
+    evaluated = 0
+    for generation in range(args.generations):
+        points = optimizer.ask()
+        params = [to_params(point) for point in points]
+        metrics = evaluate(params)
+        losses = [targets.loss(item) for item in metrics]
+        evaluated += len(points)
+        optimizer.tell(points, losses)
+        for loss, point_params, item in zip(losses, params, metrics):
+            if best is None or loss < best[0]:
+                best = (loss, point_params, item)
+        assert best is not None
+        print(
+            f"gen {generation + 1:3d}  best loss {best[0]:8.3f}  win {best[2]['winRate']:.2f}"
+            f"  median {best[2]['medianTicks']:g}  gap {best[2]['medianEventGap']:g}  sigma {optimizer.sigma:.3f}"
+        )
+        if best[0] < 1e-3:
+            break
+    if pool is not None:
+        pool.shutdown()
+    elapsed = time.perf_counter() - started
+
+    assert best is not None
+    loss, params, metrics = best
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({**constants, **params}, indent=2) + "\n", encoding="utf-8")
+    for name, value in params.items():
+        print(f"{name:22s} {constants[name]:>10g} -> {value:g}")
+    print(
+        f"OK: loss {loss:.3f} after {evaluated} points ({cache.hits} from cache) in {elapsed:.1f}s; "
+        f"wrote {args.output}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Watch the content files and rerun only the validators a save affects.
+
+The process stays warm: every content file is parsed once up front and kept
+in memory, a save re-parses just that file, and the affected validators run
+in-process against the cached data (their `load_*` readers are pointed at
+the cache for the duration of the call). Changes are picked up through
+inotify where libc provides it, otherwise by polling mtimes.
+"""
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import io
+import json
+import os
+import select
+import struct
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterator
+
+import validate_agents
+import validate_datacenters
+import validate_events
+import validate_weapons
+from check_references import check_references
+from content_loader import AGENTS_PATH, DATACENTERS_PATH, EVENTS_PATH, REGISTRY_PATH, WEAPONS_PATH
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+EVENT_HEADER = struct.Struct("iIII")
+DEBOUNCE_SECONDS = 0.02
+
+
+class ContentCache:
+    """Parsed JSON per path; `None` marks a file that failed to parse."""
+
+    def __init__(self, paths: list[Path]) -> None:
+        self.data: dict[Path, object] = {}
+        self.errors: dict[Path, str] = {}
+        for path in paths:
+            self.reload(path)
+
+    def reload(self, path: Path) -> bool:
+        try:
+            self.data[path] = json.loads(path.read_text(encoding="utf-8"))
+            self.errors.pop(path, None)
+            return True
+        except (OSError, json.JSONDecodeError) as exc:
+            self.data[path] = None
+            self.errors[path] = str(exc)
+            return False
+
+
+def run_validator(module: ModuleType, readers: dict[str, Path], cache: ContentCache) -> tuple[bool, str]:
+    """Run a validator's main() with its file readers served from the cache."""
+    originals = {name: getattr(module, name) for name in readers}
+    for name, path in readers.items():
+        setattr(module, name, lambda path=path: cache.data[path])
+    buffer = io.StringIO()
+    ok = True
+    try:
+        with redirect_stdout(buffer):
+            module.main()
+    except SystemExit as exc:
+        ok = exc.code in (0, None)
+    finally:
+        for name, reader in originals.items():
+            setattr(module, name, reader)
+    lines = buffer.getvalue().strip().splitlines()
+    return ok, lines[-1] if lines else ""
+
+
+def validator_check(module: ModuleType, readers: dict[str, Path]) -> Callable[[ContentCache], tuple[bool, str]]:
+    return lambda cache: run_validator(module, readers, cache)
+
+
+CHECKS: dict[str, tuple[list[Path], Callable[[ContentCache], tuple[bool, str]]]] = {
+    "events": ([EVENTS_PATH], validator_check(validate_events, {"load_events": EVENTS_PATH})),
+    "weapons": ([WEAPONS_PATH], validator_check(validate_weapons, {"load_weapons": WEAPONS_PATH})),
+    "agents": ([AGENTS_PATH], validator_check(validate_agents, {"load_agents": AGENTS_PATH})),
+    "datacenters": (
+        [DATACENTERS_PATH, REGISTRY_PATH],
+        validator_check(validate_datacenters, {"load_geojson": DATACENTERS_PATH, "load_registry": REGISTRY_PATH}),
+    ),
+}
+
+
+def reference_check(cache: ContentCache) -> tuple[bool, str]:
+    report = check_references(*(cache.data[path] for path in CHECKS["references"][0]))
+    if report.dangling:
+        where, value, reason = report.dangling[0]
+        return False, f"ERROR: {len(report.dangling)} dangling ids; first {where} -> {value} ({reason})."
+    if report.duplicates:
+        return False, f"ERROR: {len(report.duplicates)} duplicate ids; first {next(iter(report.duplicates))}."
+    return True, f"OK: {len(report.references)} references resolve across {report.interned} interned ids."
+
+
+CHECKS["references"] = ([WEAPONS_PATH, AGENTS_PATH, EVENTS_PATH, DATACENTERS_PATH, REGISTRY_PATH], reference_check)
+
+
+def watched_paths() -> list[Path]:
+    return list(dict.fromkeys(path for paths, _ in CHECKS.values() for path in paths))
+
+
+def affected_checks(changed: set[Path]) -> list[str]:
+    return [name for name, (paths, _) in CHECKS.items() if changed.intersection(paths)]
+
+
+def run_checks(cache: ContentCache, names: list[str]) -> None:
+    for name in names:
+        paths, check = CHECKS[name]
+        broken = [path for path in paths if path in cache.errors]
+        started = time.perf_counter()
+        if broken:
+            ok, message = False, f"ERROR: Failed to parse {broken[0]}: {cache.errors[broken[0]]}"
+        else:
+            ok, message = check(cache)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"[{time.strftime('%H:%M:%S')}] {name:12s} {elapsed:6.1f} ms  {message}", flush=True)
+
+
+class InotifyWatcher:
+    """Directory watches via libc inotify, filtered to the files we care about."""
+
+    def __init__(self, paths: list[Path]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, Path] = {}
+        self.files = set(paths)
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        for directory in {path.parent for path in paths}:
+            wd = libc.inotify_add_watch(self.fd, str(directory).encode(), mask)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.dirs[wd] = directory
+
+    def _drain(self) -> set[Path]:
+        changed: set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                raw_name = buffer[offset + EVENT_HEADER.size: offset + EVENT_HEADER.size + length]
+                offset += EVENT_HEADER.size + length
+                path = self.dirs[wd] / raw_name.rstrip(b"\0").decode()
+                if path in self.files:
+                    changed.add(path)
+
+    def changes(self) -> Iterator[set[Path]]:
+        while True:
+            select.select([self.fd], [], [])
+            changed = self._drain()
+            # Editors often write in several syscalls; let the burst settle.
+            while select.select([self.fd], [], [], DEBOUNCE_SECONDS)[0]:
+                changed |= self._drain()
+            if changed:
+                yield changed
+
+
+class PollingWatcher:
+    def __init__(self, paths: list[Path], interval: float) -> None:
+        self.interval = interval
+        self.stamps = {path: self._stamp(path) for path in paths}
+
+    @staticmethod
+    def _stamp(path: Path) -> tuple[int, int] | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changes(self) -> Iterator[set[Path]]:
+        while True:
+            time.sleep(self.interval)
+            changed = set()
+            for path, stamp in self.stamps.items():
+                current = self._stamp(path)
+                if current != stamp:
+                    self.stamps[path] = current
+                    changed.add(path)
+            if changed:
+                yield changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Revalidate content files on save from a warm process.")
+    parser.add_argument("--poll", action="store_true", help="Force mtime polling instead of inotify.")
+    parser.add_argument("--interval", type=float, default=0.05, help="Polling interval in seconds (default 0.05).")
+    parser.add_argument("--once", action="store_true", help="Run every check once and exit.")
+    args = parser.parse_args()
+
+    paths = watched_paths()
+    cache = ContentCache(paths)
+    run_checks(cache, list(CHECKS))
+    if args.once:
+        return
+
+    watcher: InotifyWatcher | PollingWatcher
+    if args.poll:
+        watcher = PollingWatcher(paths, args.interval)
+    else:
+        try:
+            watcher = InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            watcher = PollingWatcher(paths, args.interval)
+    print(f"Watching {len(paths)} files via {'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'}; Ctrl-C to stop.", flush=True)
+    try:
+        for changed in watcher.changes():
+            for path in changed:
+                cache.reload(path)
+            run_checks(cache, affected_checks(changed))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Report the Pareto frontier of weapons.json and the weapons it dominates.
+
+A weapon is dominated when another is at least as good on every objective
+(damage, cost, stealth, heat per use, cooldown) and strictly better on one.
+The skyline pass sorts once and only compares each weapon with the frontier
+found so far; two objectives use an exact O(n log n) sweep.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Callable
+
+from content_loader import WEAPONS_PATH, load_weapons
+
+
+def heat_per_use(weapon: dict) -> float:
+    return sum(
+        float(effect.get("value", 0))
+        for effect in weapon.get("effects") or []
+        if (effect.get("target") or {}).get("type") == "global"
+        and (effect.get("target") or {}).get("key") == "heat"
+        and effect.get("op", "add") == "add"
+    )
+
+
+# name -> (extractor, maximize?)
+OBJECTIVES: dict[str, tuple[Callable[[dict], float], bool]] = {
+    "damage": (lambda weapon: float(weapon.get("damage") or 0), True),
+    "cost": (lambda weapon: float(weapon.get("cost") or 0), False),
+    "stealth": (lambda weapon: float(weapon.get("stealth") or 0), True),
+    "heat": (heat_per_use, False),
+    "cooldown": (lambda weapon: float(weapon.get("cooldownTicks") or 0), False),
+}
+
+
+def oriented_vectors(weapons: list[dict], objectives: list[str]) -> list[tuple[float, ...]]:
+    """Objective values flipped where needed so that larger is always better."""
+    vectors = []
+    for weapon in weapons:
+        values = []
+        for name in objectives:
+            extract, maximize = OBJECTIVES[name]
+            value = extract(weapon)
+            values.append(value if maximize else -value)
+        vectors.append(tuple(values))
+    return vectors
+
+
+def dominates(a: tuple[float, ...], b: tuple[float, ...]) -> bool:
+    return all(x >= y for x, y in zip(a, b)) and a != b
+
+
+def skyline(points: list[tuple[float, ...]]) -> list[int]:
+    """Indices of non-dominated points.
+
+    Points are visited in descending lexicographic order, so any dominator is
+    visited before the points it dominates and each point only has to be
+    checked against the skyline collected so far.
+    """
+    order = sorted(range(len(points)), key=lambda idx: points[idx], reverse=True)
+    frontier: list[int] = []
+    if points and len(points[0]) == 2:
+        best_second = float("-inf")
+        for idx in order:
+            first, second = points[idx]
+            if second > best_second or (frontier and points[frontier[-1]] == points[idx]):
+                frontier.append(idx)
+                best_second = max(best_second, second)
+        return frontier
+    for idx in order:
+        point = points[idx]
+        if not any(dominates(points[kept], point) for kept in frontier):
+            frontier.append(idx)
+    return frontier
+
+
+def domination_report(
+    weapons: list[dict], objectives: list[str]
+) -> tuple[list[int], list[dict]]:
+    """Return frontier indices and, per dominated weapon, its strongest dominator.
+
+    Gaps are range-normalized per objective. `margin` is the mean gap to the
+    dominator that leads by the most; `epsilon` is the additive epsilon
+    indicator, i.e. the uniform improvement on every objective the weapon would
+    need before no frontier weapon dominates it (0 when it only ties on one).
+    """
+    points = oriented_vectors(weapons, objectives)
+    frontier = skyline(points)
+    frontier_set = set(frontier)
+    spans = []
+    for axis in range(len(objectives)):
+        values = [point[axis] for point in points]
+        spans.append((max(values) - min(values)) or 1.0)
+
+    dominated = []
+    for idx, point in enumerate(points):
+        if idx in frontier_set:
+            continue
+        best_margin, best_by, epsilon = -1.0, None, 0.0
+        for kept in frontier:
+            if not dominates(points[kept], point):
+                continue
+            gaps = [(points[kept][axis] - point[axis]) / spans[axis] for axis in range(len(objectives))]
+            epsilon = max(epsilon, min(gaps))
+            margin = sum(gaps) / len(gaps)
+            if margin > best_margin:
+                best_margin, best_by = margin, kept
+        assert best_by is not None
+        dominated.append({
+            "id": weapons[idx]["id"],
+            "dominatedBy": weapons[best_by]["id"],
+            "margin": round(best_margin, 4),
+            "epsilon": round(epsilon, 4),
+            "gaps": {
+                name: round(abs(points[best_by][axis] - point[axis]), 4)
+                for axis, name in enumerate(objectives)
+                if points[best_by][axis] != point[axis]
+            },
+        })
+    dominated.sort(key=lambda entry: -entry["margin"])
+    return frontier, dominated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Find dominated weapons via a Pareto skyline.")
+    parser.add_argument("--input", "-i", type=Path, default=WEAPONS_PATH, help="weapons.json-shaped file to analyze.")
+    parser.add_argument(
+        "--objectives",
+        default=",".join(OBJECTIVES),
+        help=f"Comma-separated objectives (default {','.join(OBJECTIVES)}).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    objectives = [name.strip() for name in args.objectives.split(",") if name.strip()]
+    unknown = [name for name in objectives if name not in OBJECTIVES]
+    if unknown or not objectives:
+        print(f"ERROR: Unknown objectives {', '.join(unknown) or '(none)'}; choose from {', '.join(OBJECTIVES)}.")
+        sys.exit(1)
+
+    weapons = load_weapons(args.input)
+    frontier, dominated = domination_report(weapons, objectives)
+    if args.json:
+        print(json.dumps({
+            "objectives": objectives,
+            "frontier": [weapons[idx]["id"] for idx in frontier],
+            "dominated": dominated,
+        }, indent=2))
+        return
+
+    for entry in dominated:
+        gaps = ", ".join(f"{name} {gap:g}" for name, gap in entry["gaps"].items())
+        print(f"DOMINATED: {entry['id']} by {entry['dominatedBy']} (margin {entry['margin']:.3f}, epsilon {entry['epsilon']:.3f}; {gaps})")
+    print(f"OK: {len(frontier)} of {len(weapons)} weapons on the frontier over {', '.join(objectives)}.")
+
+
+if __name__ == "__main__":
+    main()
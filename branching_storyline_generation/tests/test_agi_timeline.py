@@ -0,0 +1,41 @@
+"""Closed form vs tick-by-tick checks for scripts/agi_timeline.py."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from agi_timeline import AXES, build_pieces, grid, parse_range, simulate, time_to_agi  # noqa: E402
+from engine import load_content  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def content():
+    return load_content()
+
+
+def test_negative_rate_is_clamped_like_the_engine(content):
+    # 1 + 20 * -0.1 < 0: the engine adds nothing until heat drops after tick 10.
+    heat = [(0, 20.0), (10, 0.0)]
+    pieces = build_pieces(content, heat, [])
+    params = (1.0, -0.1, 10.0, 2.5)
+    assert simulate(content, heat, [], *params) == time_to_agi(pieces, *params) == 101
+    row = grid(pieces, content.constants, "baseAgiRatePerTick", [0.5, 1.0], "heatAffectsAgiRate", [-0.1])[0]
+    assert list(row) == [simulate(content, heat, [], 0.5, -0.1, 10.0, 2.5), 101]
+
+
+def test_float_sum_ties_match_the_engine(content):
+    # Cells whose exact losing tick is whole; the engine's float sum lands just under 100.
+    xs, ys = parse_range("0.1:2:50"), parse_range("-0.1:0.0:50")
+    pieces = build_pieces(content, [], [])
+    rows = grid(pieces, content.constants, "baseAgiRatePerTick", xs, "heatAffectsAgiRate", ys)
+    defaults = {name: float(content.constants[name]) for name in AXES}
+    for yi in (21, 49):
+        for xi, x in enumerate(xs):
+            params = dict(defaults, baseAgiRatePerTick=x, heatAffectsAgiRate=ys[yi])
+            args = [params[name] for name in AXES]
+            assert rows[yi][xi] == time_to_agi(pieces, *args) == simulate(content, [], [], *args)
+    assert rows[21][0] == 1261
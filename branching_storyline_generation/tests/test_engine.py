@@ -0,0 +1,68 @@
+"""Regression tests for the headless engine rules in scripts/engine.py."""
+from __future__ import annotations
+
+import copy
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from engine import (  # noqa: E402
+    ActionError,
+    attack_datacenter,
+    choose_event_option,
+    load_content,
+    new_game,
+    resolve_tick,
+    schedule_timer,
+)
+
+
+@pytest.fixture(scope="module")
+def content():
+    return load_content()
+
+
+def test_rejected_attack_leaves_state_untouched(content):
+    state = new_game(content, 0)
+    weapon_id = min(content.weapons, key=lambda weapon_id: float(content.weapons[weapon_id].get("cost") or 0))
+    dc_id = next(iter(content.datacenters))
+    before = copy.deepcopy(state)
+    payload = {"datacenterId": dc_id, "weaponId": weapon_id, "agentId": "ag:not-recruited"}
+    with pytest.raises(ActionError, match="not in the inventory"):
+        attack_datacenter(state, content, payload, random.Random(0))
+    assert state == before
+
+
+def test_on_timer_trigger_is_a_heap_entry(content):
+    content = copy.copy(content)
+    event_id = next(iter(content.event_headers))
+    header = dict(content.event_headers[event_id], oneTime=False, triggers=[{"when": "onTimer", "afterTicks": 3}])
+    content.event_headers = {event_id: header}
+    state = new_game(content, 0)
+    assert [timer["resumeTick"] for timer in state["activeTimers"]] == [3]
+    rng = random.Random(0)
+    fired = [state["tick"] for _ in range(8) if event_id in resolve_tick(state, content, rng)]
+    assert fired == [3]  # still pending, so the re-armed entry keeps waiting
+    state["pendingEvents"].remove(event_id)
+    assert resolve_tick(state, content, rng) == [event_id]
+    assert [timer["resumeTick"] for timer in state["activeTimers"]] == [state["tick"] + 3]
+
+
+def test_choosing_a_one_time_event_cancels_its_timers(content):
+    content = copy.copy(content)
+    event_id = next(event_id for event_id, event in content.events.items() if event.get("choices"))
+    triggers = [{"when": "onTimer", "afterTicks": 5}, {"when": "onTimer", "afterTicks": 9}]
+    content.event_headers = {event_id: dict(content.event_headers[event_id], oneTime=True, triggers=triggers)}
+    state = new_game(content, 0)
+    schedule_timer(state, event_id, 2)
+    assert len(state["activeTimers"]) == 3
+    rng = random.Random(0)
+    assert resolve_tick(state, content, rng) == []
+    assert resolve_tick(state, content, rng) == [event_id]
+    choice = next(c for c in content.events[event_id]["choices"] if not c.get("requires"))
+    choose_event_option(state, content, event_id, choice["id"])
+    assert state["activeTimers"] == []
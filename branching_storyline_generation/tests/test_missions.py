@@ -0,0 +1,59 @@
+"""Regression tests for MissionBoard.dispatch in scripts/missions.py."""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from engine import ActionError, load_content, new_game  # noqa: E402
+from missions import MissionBoard, synthetic_content  # noqa: E402
+
+ORIGIN = (-100.0, 40.0)
+
+
+@pytest.fixture
+def setup():
+    content = synthetic_content(load_content(), 1, 1, random.Random(0))
+    state = new_game(content, 0)
+    agent_id = "ag:bench-0"
+    weapon_id = next(iter(content.weapons))
+    state["inventory"][agent_id] = {"id": agent_id, "count": 1}
+    return content, state, agent_id, weapon_id, [next(iter(content.datacenters))]
+
+
+def test_dispatch_requires_the_weapon_in_inventory(setup):
+    content, state, agent_id, weapon_id, targets = setup
+    board = MissionBoard(content)
+    with pytest.raises(ActionError, match="not in the inventory"):
+        board.dispatch(state, agent_id, weapon_id, ORIGIN, targets)
+    assert not board.missions
+
+
+def test_dispatch_rejects_an_agent_already_on_a_mission(setup):
+    content, state, agent_id, weapon_id, targets = setup
+    state["inventory"][weapon_id] = {"id": weapon_id, "count": 1}
+    board = MissionBoard(content)
+    board.dispatch(state, agent_id, weapon_id, ORIGIN, targets)
+    with pytest.raises(ActionError, match="already on a mission"):
+        board.dispatch(state, agent_id, weapon_id, ORIGIN, targets)
+    assert len(board.missions) == 1
+
+
+def test_dispatch_reserves_the_weapon_until_the_mission_ends(setup):
+    content, state, agent_id, weapon_id, targets = setup
+    state["inventory"][weapon_id] = {"id": weapon_id, "count": 1}
+    state["inventory"]["ag:bench-1"] = {"id": "ag:bench-1", "count": 1}
+    content.agents["ag:bench-1"] = dict(content.agents[agent_id], id="ag:bench-1")
+    board = MissionBoard(content)
+    mission = board.dispatch(state, agent_id, weapon_id, ORIGIN, targets)
+    with pytest.raises(ActionError, match="out on a mission"):
+        board.dispatch(state, "ag:bench-1", weapon_id, ORIGIN, targets)
+    state["tick"] = mission.arrivals[-1]
+    board.resolve(state, random.Random(0))
+    assert mission.status in ("done", "captured")
+    board.dispatch(state, "ag:bench-1", weapon_id, ORIGIN, targets)
+    assert board.carried(weapon_id) == 1
@@ -0,0 +1,94 @@
+"""Tests for the creative_registry.json store in scripts/registry_store.py."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from registry_store import RegistryStore  # noqa: E402
+
+
+@pytest.fixture
+def registry(tmp_path):
+    path = tmp_path / "creative_registry.json"
+    items = [{"id": f"ev:{idx}", "status": "pending"} for idx in range(3)]
+    data = {
+        "statusOptions": ["pending", "in_progress", "done"],
+        "categories": {"events": {"targetCount": 3, "items": items}},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def on_disk(path: Path) -> dict[str, dict]:
+    items = json.loads(path.read_text(encoding="utf-8"))["categories"]["events"]["items"]
+    return {item["id"]: item for item in items}
+
+
+def test_claim_and_complete_are_on_disk_after_each_command(registry):
+    store = RegistryStore(registry)
+    with store.locked():
+        claimed = store.claim_next("events", "writer")
+    assert claimed["id"] == "ev:0"
+    assert on_disk(registry)["ev:0"] == {"id": "ev:0", "status": "in_progress", "claimedBy": "writer"}
+    with store.locked():
+        store.complete("events", "ev:0")
+        store.upsert_item("events", {"id": "ev:new", "status": "pending"})
+    items = on_disk(registry)
+    assert items["ev:0"]["status"] == "done"
+    assert "ev:new" in items
+    assert not store.journal_path.exists()
+
+
+def test_other_stores_see_each_change(registry):
+    first, second = RegistryStore(registry), RegistryStore(registry)
+    with first.locked():
+        first.claim_next("events")
+    with second.locked():
+        assert second.claim_next("events")["id"] == "ev:1"
+    with first.locked():
+        assert first.progress("events")["inProgress"] == 2
+
+
+def test_leftover_journal_is_replayed_and_folded_in(registry):
+    journal = registry.with_suffix(".journal")
+    done = {"op": "patch", "category": "events", "id": "ev:1", "fields": {"status": "done"}}
+    added = {"op": "upsert", "category": "events", "item": {"id": "ev:late", "status": "pending"}}
+    # A torn append with a later line glued on, then a clean line, then a torn tail.
+    journal.write_text(
+        '{"op":"patch","categ' + json.dumps(done) + "\n" + json.dumps(added) + "\n" + '{"op":"remo',
+        encoding="utf-8",
+    )
+    store = RegistryStore(registry)
+    with store.locked():
+        assert store.get_item("events", "ev:late") is not None
+        assert store.progress("events")["done"] == 0  # the glued line is skipped
+    assert store.compact()
+    assert not journal.exists()
+    items = on_disk(registry)
+    assert "ev:late" in items and items["ev:1"]["status"] == "pending"
+
+
+def test_claims_follow_registry_order_after_status_round_trips(registry):
+    store = RegistryStore(registry)
+    with store.locked():
+        store.set_status("events", "ev:0", "done")
+        store.set_status("events", "ev:0", "pending")  # queued once, at its own place
+        store.set_status("events", "ev:2", "in_progress")
+        store.release("events", "ev:2")
+        claims = [store.claim_next("events")["id"] for _ in range(3)]
+        assert claims == ["ev:0", "ev:1", "ev:2"]
+        assert store.claim_next("events") is None
+        assert len(store._pending["events"]) == 0
+
+
+def test_release_deletes_the_claim(registry):
+    store = RegistryStore(registry)
+    with store.locked():
+        store.claim_next("events", "writer")
+        assert store.release("events", "ev:0")
+    assert on_disk(registry)["ev:0"] == {"id": "ev:0", "status": "pending"}
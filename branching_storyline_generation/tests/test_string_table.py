@@ -0,0 +1,30 @@
+"""Round-trip tests for the packed string-table format in scripts/string_table.py."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from string_table import PackedContent, pack  # noqa: E402
+
+DOCS = {
+    "constants": {"startingFunds": 5, "tickMs": 1000.0, "ratio": 0.25, "big": 2**60 + 1},
+    "events": [{"id": "ev:a", "chance": 5, "tags": ["5", "x", 0, -1, -2.5]}, {"id": "ev:b", "chance": None, "ok": True}],
+}
+
+
+def test_round_trip_with_one_number_type():
+    # Parse every number as a float, as JSON.parse does in JavaScript.
+    docs = {**DOCS, "constants": {key: value for key, value in DOCS["constants"].items() if key != "big"}}
+    packed = PackedContent(json.loads(json.dumps(pack(docs)), parse_int=float))
+    assert packed.materialize() == docs
+    assert packed["events"][0]["tags"][:3] == ["5", "x", 0]
+    assert packed["events"][0]["chance"] == 5 and packed["events"][1]["ok"] is True
+
+
+def test_round_trip_keeps_large_integers_exact():
+    packed = PackedContent(json.loads(json.dumps(pack(DOCS))))
+    assert packed.materialize() == DOCS
+    assert packed["constants"]["big"] == 2**60 + 1
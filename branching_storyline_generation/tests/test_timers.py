@@ -0,0 +1,44 @@
+"""Tests for the activeTimers heap helpers in scripts/timers.py."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from timers import TimerQueue, cancel_timer, make_timer, pop_due  # noqa: E402
+
+
+def shared_id_timers() -> list[dict]:
+    return [
+        make_timer("ev:a", 5, {"trigger": 0}),
+        make_timer("ev:a", 3, {"trigger": 1}),
+        make_timer("ev:b", 4),
+    ]
+
+
+def test_queue_keys_triggers_of_one_event_apart():
+    queue = TimerQueue(shared_id_timers())
+    assert ("ev:a", 0) in queue and ("ev:a", 1) in queue and "ev:a" in queue
+    assert not queue.cancel("ev:a")  # no plain timer for ev:a
+    assert queue.cancel("ev:a", 0)
+    assert queue.index == {("ev:a", 1): 0, ("ev:b", None): 1}
+    assert queue.cancel("ev:a", 1)
+    assert "ev:a" not in queue
+    assert [timer["id"] for timer in queue.pop_due(10)] == ["ev:b"]
+
+
+def test_queue_reschedule_moves_only_that_trigger():
+    queue = TimerQueue(shared_id_timers())
+    queue.schedule("ev:a", 1, {"trigger": 0})
+    assert len(queue) == 3
+    due = queue.pop_due(3)
+    assert [(timer["resumeTick"], timer["payload"]) for timer in due] == [(1, {"trigger": 0}), (3, {"trigger": 1})]
+    assert queue.index == {("ev:b", None): 0}
+
+
+def test_cancel_timer_matches_the_trigger():
+    timers = shared_id_timers()
+    assert cancel_timer(timers, "ev:a", 1)
+    assert not cancel_timer(timers, "ev:a", 1)
+    assert [(timer["id"], timer["resumeTick"]) for timer in pop_due(timers, 10)] == [("ev:b", 4), ("ev:a", 5)]
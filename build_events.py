@@ -1,6 +1,11 @@
 import json
+import sys
 from pathlib import Path
 
+OUTPUT_PATH = Path(__file__).resolve().parent / "branching_storyline_generation" / "content" / "events.json"
+CHANCES_PATH = OUTPUT_PATH.with_name("trigger_chances.json")
+IMAGE_PROMPT_TEMPLATE = "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, {subject}, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire"
+
 phase_variations = [
     {
         "phase": "early",
@@ -54,6 +59,20 @@ phase_variations = [
     },
 ]
 
+
+def calibrated_chances() -> list[float]:
+    """Trigger chance per phase variation, from trigger_chances.json when
+    scripts/calibrate_triggers.py has written one, else the table above."""
+    if not CHANCES_PATH.exists():
+        return [variation["chance"] for variation in phase_variations]
+    calibrated = json.loads(CHANCES_PATH.read_text(encoding="utf-8"))["variations"]
+    expected = [(variation["phase"], variation.get("requires")) for variation in phase_variations]
+    if [(entry["phase"], entry.get("requires")) for entry in calibrated] != expected:
+        print(f"ERROR: {CHANCES_PATH.name} does not match phase_variations; rerun calibrate_triggers.py.")
+        sys.exit(1)
+    return [entry["chance"] for entry in calibrated]
+
+
 logistics_type = {
     0: "inventory",
     1: "funds",
@@ -499,10 +518,7 @@ def build_body(context: dict, location: dict) -> str:
 
 def build_image_prompt(context: dict, location: dict) -> str:
     subject = context["subject_template"].format(location=location["name"])
-    return (
-        "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, "
-        f"{subject}, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire"
-    )
+    return IMAGE_PROMPT_TEMPLATE.format(subject=subject)
 
 
 def build_choice(event_id: str, kind: str, context: dict, location: dict, phase: str):
@@ -590,6 +606,7 @@ def primary_stats_for(kind: str) -> list[str]:
 
 
 def main() -> None:
+    chances = calibrated_chances()
     events = []
     for context in contexts:
         for idx, location in enumerate(context["locations"]):
@@ -601,7 +618,7 @@ def main() -> None:
             body = build_body(context, location)
             trigger = {
                 "when": "onTick",
-                "chance": variation["chance"],
+                "chance": chances[idx],
             }
             requires = variation.get("requires")
             if requires:
@@ -627,7 +644,7 @@ def main() -> None:
         "version": "2025.0",
         "style": {
             "year": 2025,
-            "imagePromptTemplate": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, {subject}, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+            "imagePromptTemplate": IMAGE_PROMPT_TEMPLATE,
             "languageNotes": "Keep every blurb understandable by an average tech worker; reference real 2024-2025 happenings before leaning into satire.",
         },
         "targets": {
@@ -658,13 +675,12 @@ def main() -> None:
                 "triggers": [],
                 "oneTime": True,
                 "choices": [],
-                "imagePrompt": "retro futurist protest poster, screenprint texture, light cyan and persimmon palette, laid-off engineers debating drone strike ethics, dynamic perspective, simple shapes, minimal text, 2025 dystopian satire",
+                "imagePrompt": IMAGE_PROMPT_TEMPLATE.format(subject="laid-off engineers debating drone strike ethics"),
             }
         ],
         "events": events,
     }
-    output_path = Path("branching_storyline_generation/content/events.json")
-    output_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    OUTPUT_PATH.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
 
 
 if __name__ == "__main__":